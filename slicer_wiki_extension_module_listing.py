@@ -1,42 +1,205 @@
 #!/usr/bin/env python
 
+import BaseHTTPServer
 import codecs
+import collections
 import ConfigParser
+import contextlib
+import cProfile
+import datetime
+import errno
 import fnmatch
 import glob
 import git
+import gzip
+import hashlib
 import io
 import itertools
 import json
+import math
 import os
 import platform
+import Queue
 import re
+import shutil
+import signal
 import subprocess
 import sys
 import tempfile
+import threading
+import time
+import traceback
 import urllib
 import urllib2
 
+#===========================================================================
+class CacheNamespace(object):
+    """Dictionnary-like in-process cache optionally bounded to ``maxEntries``
+    entries.
+
+    When bounded, the least recently used entries are evicted first. Hits,
+    misses and evictions are counted, see :meth:`stats`.
+    """
+
+    def __init__(self, name, maxEntries=None):
+        self.name = name
+        self.maxEntries = None
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.clearStats()
+        self.setMaxEntries(maxEntries)
+
+    def get(self, key):
+        """Return the value associated with ``key`` or raise :class:`KeyError`.
+        """
+        with self._lock:
+            try:
+                value = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                raise
+            self.hits += 1
+            if self.maxEntries is not None:
+                # Mark as most recently used
+                del self._entries[key]
+                self._entries[key] = value
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            if self.maxEntries is not None:
+                self._entries.pop(key, None)
+            self._entries[key] = value
+            self._evict()
+        return value
+
+    def remove(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def setMaxEntries(self, maxEntries):
+        """Bound the cache to ``maxEntries`` entries. ``None`` means unbounded.
+        """
+        with self._lock:
+            if maxEntries is not None and self.maxEntries is None:
+                self._entries = collections.OrderedDict(self._entries)
+            elif maxEntries is None and self.maxEntries is not None:
+                self._entries = dict(self._entries)
+            self.maxEntries = maxEntries
+            self._evict()
+
+    def _evict(self):
+        if self.maxEntries is None:
+            return
+        while len(self._entries) > self.maxEntries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def clearStats(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'maxEntries': self.maxEntries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hitRate': float(self.hits) / lookups if lookups else None
+                }
+
+#---------------------------------------------------------------------------
+# In-process cache namespaces:
+#  config      : command line settings and credentials
+#  connections : wiki backends
+#  datasets    : dictionnaries shared by the link renderers (extensionLinks, moduleTypes, ...)
+#  fragments   : rendered wiki list items, see renderedListItem()
+#  names       : prettified names, sort keys and anchors, see normalizedName()
+#  descriptions: parsed extension description files, see getExtensionDescription()
+#                and updateExtensionDescriptionRecords()
+#  existence   : wiki pages existing below a prefix, see prefetchWikiPageExistence()
+#  published   : SHA-1 of the pages published by update-wiki --watch
+#  contributors: parsed contributor strings and contributor indexes, see parseContributors()
+#                and ContributorIndex
+CACHE_NAMESPACES = ['config', 'connections', 'datasets', 'fragments', 'names',
+                    'descriptions', 'existence', 'published', 'contributors']
+
+# Namespaces whose entries are recomputed when missing. Other namespaces
+# hold state that is not recreated once evicted, they can not be bounded.
+BOUNDED_CACHE_NAMESPACES = ['fragments', 'names', 'descriptions', 'existence', 'contributors']
+
 #---------------------------------------------------------------------------
 # Module global variables
 class ModuleGlobals(object): pass
 __m = ModuleGlobals()
 __m.persistent_cache_enabled = False
 __m.persistent_cache = {}
-__m.cache = {}
+__m.persistent_cache_modified = False
+__m.caches = dict((name, CacheNamespace(name)) for name in CACHE_NAMESPACES)
+__m.lock = threading.RLock()
+__m.wiki_lock = threading.RLock()
+__m.profile_timers = {}
+__m.profile_counters = {}
+__m.profile_stages = {}
+__m.profile_thread_state = threading.local()
+__m.rendering_profiler = None
+__m.subprocess_log = None
+__m.slicer_versions = None
+__m.fetched_repositories = set()
+__m.synced_repositories = set()
+__m.pending_repository_syncs = {}
 
 #---------------------------------------------------------------------------
-def setCacheEntry(key, value):
-    __m.cache[key] = value
-    return value
+def cacheNamespace(namespace):
+    """Return the :class:`CacheNamespace` named ``namespace``.
+
+    See :data:`CACHE_NAMESPACES`
+    """
+    return __m.caches[namespace]
+
+#---------------------------------------------------------------------------
+def setCacheEntry(key, value, namespace='config'):
+    return __m.caches[namespace].set(key, value)
+
+#---------------------------------------------------------------------------
+def cacheEntry(key, namespace='config'):
+    return __m.caches[namespace].get(key)
 
 #---------------------------------------------------------------------------
-def cacheEntry(key):
-    return __m.cache[key]
+def clearCache(namespace=None):
+    """Remove all entries of ``namespace``, or of all namespaces if ``None``.
+    """
+    for name in [namespace] if namespace is not None else CACHE_NAMESPACES:
+        __m.caches[name].clear()
 
 #---------------------------------------------------------------------------
-def clearCache():
-    __m.cache = {}
+def setCacheMaxEntries(namespace, maxEntries):
+    """Keep at most ``maxEntries`` entries in ``namespace``.
+
+    See :data:`BOUNDED_CACHE_NAMESPACES`
+    """
+    if maxEntries is not None and namespace not in BOUNDED_CACHE_NAMESPACES:
+        raise RuntimeError, "Cache namespace '{0}' can not be bounded. Namespaces: {1}".format(
+            namespace, ', '.join(BOUNDED_CACHE_NAMESPACES))
+    __m.caches[namespace].setMaxEntries(maxEntries)
+
+#---------------------------------------------------------------------------
+def getCacheStats():
+    """Return a dictionnary with the size, hits, misses and evictions of
+    each cache namespace.
+    """
+    return dict((name, cache.stats()) for (name, cache) in __m.caches.iteritems())
 
 #---------------------------------------------------------------------------
 def persistentCacheEnabled():
@@ -54,14 +217,21 @@ def persistentCacheEntry(key):
         raise KeyError
 
 #---------------------------------------------------------------------------
-def setPersistentCacheEntry(key, value):
-    __m.persistent_cache[key] = value
-    savePersistentCache()
+def setPersistentCacheEntry(key, value, save=True):
+    """Set ``key`` in the persistent cache. If ``save`` is False, the cache
+    file is only written by the next :func:`savePersistentCache` or
+    :func:`flushPersistentCache` call.
+    """
+    with __m.lock:
+        __m.persistent_cache[key] = value
+        __m.persistent_cache_modified = True
+        if save:
+            savePersistentCache()
     return value
 
 #---------------------------------------------------------------------------
 def clearPersistentCache():
-    __m.cache = {}
+    clearCache()
 
 #---------------------------------------------------------------------------
 def getPersistentCacheFilePath():
@@ -69,8 +239,18 @@ def getPersistentCacheFilePath():
 
 #---------------------------------------------------------------------------
 def savePersistentCache():
-    with open(getPersistentCacheFilePath(), 'w') as fileContents:
-        fileContents.write(json.dumps(__m.persistent_cache, sort_keys=True, indent=4))
+    with __m.lock:
+        with open(getPersistentCacheFilePath(), 'w') as fileContents:
+            fileContents.write(json.dumps(__m.persistent_cache, sort_keys=True, indent=4))
+        __m.persistent_cache_modified = False
+
+#---------------------------------------------------------------------------
+def flushPersistentCache():
+    """Save the persistent cache if entries were set without saving it.
+    """
+    with __m.lock:
+        if persistentCacheEnabled() and __m.persistent_cache_modified:
+            savePersistentCache()
 
 #---------------------------------------------------------------------------
 def loadPersistentCache():
@@ -80,6 +260,205 @@ def loadPersistentCache():
     with open(getPersistentCacheFilePath()) as fileContents:
         __m.persistent_cache = json.load(fileContents)
 
+#---------------------------------------------------------------------------
+def getPersistentCacheValidationFilePath():
+    return getPersistentCacheFilePath() + "-validated"
+
+#---------------------------------------------------------------------------
+def persistentCacheValidationTimestamp():
+    """Return the wiki time at which the persistent cache was last validated
+    or None. See :func:`validatePersistentCache`
+    """
+    if not os.path.exists(getPersistentCacheValidationFilePath()):
+        return None
+    with open(getPersistentCacheValidationFilePath()) as fileContents:
+        return json.load(fileContents).get('timestamp')
+
+#---------------------------------------------------------------------------
+def validatePersistentCache(wikiName, prefixes=['Documentation/']):
+    """Remove the cached existence of pages starting with one of ``prefixes``
+    created, deleted or moved on the wiki since the cache was last validated.
+
+    The cache is emptied if it was never validated or if the changes can not
+    be listed. The wiki time is then recorded as validation timestamp.
+    """
+    if not persistentCacheEnabled():
+        return
+    result = getRecentWikiChanges(wikiName, persistentCacheValidationTimestamp(), prefixes)
+    if result is None:
+        return
+    (titles, timestamp) = result
+    with __m.lock:
+        if titles is None:
+            invalidated = list(__m.persistent_cache)
+        else:
+            titles = set(titles)
+            invalidated = [page for page in __m.persistent_cache if _normalizeWikiTitle(page) in titles]
+        for page in invalidated:
+            del __m.persistent_cache[page]
+        savePersistentCache()
+    incrementProfileCounter('wiki-page-exists-cache-invalidations', len(invalidated))
+    print("\nInvalidated {0} cached page existence entries ({1})".format(
+        len(invalidated), "changed since {0}".format(persistentCacheValidationTimestamp())
+        if titles is not None else "no validation timestamp or too many changes"))
+    with open(getPersistentCacheValidationFilePath(), 'w') as fileContents:
+        fileContents.write(json.dumps({'timestamp': timestamp}))
+
+#---------------------------------------------------------------------------
+def incrementProfileCounter(name, value=1):
+    """Increment the profiling counter ``name`` by ``value``.
+
+    See :func:`getProfileReport`
+    """
+    with __m.lock:
+        __m.profile_counters[name] = __m.profile_counters.get(name, 0) + value
+
+#---------------------------------------------------------------------------
+@contextlib.contextmanager
+def profileTimer(name, calls=1):
+    """Context manager accumulating the time spent in the block into the
+    profiling timer ``name``. The number of calls of the timer is incremented
+    by ``calls``.
+
+    Nested blocks associated with the same timer (e.g recursive calls) are
+    only accounted once.
+    """
+    depths = __m.profile_thread_state.__dict__.setdefault('depths', {})
+    depths[name] = depths.get(name, 0) + 1
+    start = time.time()
+    try:
+        yield
+    finally:
+        depths[name] -= 1
+        if depths[name] == 0:
+            elapsed = time.time() - start
+            with __m.lock:
+                timer = __m.profile_timers.setdefault(name, {'calls': 0, 'seconds': 0.0})
+                timer['calls'] += calls
+                timer['seconds'] += elapsed
+
+#---------------------------------------------------------------------------
+def profiled(name, rendering=False):
+    """Decorator accumulating the time spent in the decorated function into
+    the profiling timer ``name``.
+
+    If ``rendering`` is True, :mod:`cProfile` statistics are also collected.
+    See :func:`renderingProfiler`
+    """
+    def _decorator(function):
+        def _wrapper(*args, **kwargs):
+            with profileTimer(name):
+                if not rendering:
+                    return function(*args, **kwargs)
+                with renderingProfiler():
+                    return function(*args, **kwargs)
+        _wrapper.__name__ = function.__name__
+        _wrapper.__doc__ = function.__doc__
+        return _wrapper
+    return _decorator
+
+#---------------------------------------------------------------------------
+def profiledLines(name, lines, rendering=False):
+    """Generator yielding ``lines`` and accumulating the time spent producing
+    them into the profiling timer ``name``. The whole iteration is accounted
+    as one call.
+
+    This allows to time content rendered lazily. See :func:`profiled`
+    """
+    iterator = iter(lines)
+    calls = 1
+    while True:
+        with profileTimer(name, calls=calls):
+            calls = 0
+            if rendering:
+                with renderingProfiler():
+                    line = next(iterator, None)
+            else:
+                line = next(iterator, None)
+        if line is None:
+            return
+        yield line
+
+#---------------------------------------------------------------------------
+def recordProfileStageTimings(timings, prefix=''):
+    """Record stage timings returned by :func:`runStages`. Stage names
+    are prepended with ``prefix``.
+    """
+    with __m.lock:
+        for name, (start, duration) in timings.iteritems():
+            __m.profile_stages[prefix + name] = {'start': start, 'seconds': duration}
+
+#---------------------------------------------------------------------------
+@contextlib.contextmanager
+def renderingProfiler():
+    """Context manager collecting :mod:`cProfile` statistics for the
+    block if rendering profiling is enabled.
+
+    See :func:`setRenderingProfilingEnabled`
+    """
+    profiler = __m.rendering_profiler
+    if profiler is None:
+        yield
+        return
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+
+#---------------------------------------------------------------------------
+def setRenderingProfilingEnabled(value):
+    __m.rendering_profiler = cProfile.Profile() if value else None
+
+#---------------------------------------------------------------------------
+def saveRenderingProfile(filePath):
+    """Save :mod:`cProfile` statistics collected using :func:`renderingProfiler`.
+    The resulting file can be inspected using :mod:`pstats`.
+    """
+    if __m.rendering_profiler is None:
+        return
+    __m.rendering_profiler.dump_stats(filePath)
+    print("\nSaved rendering profile '{0}'".format(filePath))
+
+#---------------------------------------------------------------------------
+def clearProfile():
+    with __m.lock:
+        __m.profile_timers = {}
+        __m.profile_counters = {}
+        __m.profile_stages = {}
+    for cache in __m.caches.itervalues():
+        cache.clearStats()
+
+#---------------------------------------------------------------------------
+def getProfileReport():
+    """Return a dictionnary with all timers, counters, stage timings and
+    cache statistics collected so far.
+
+    See :func:`getCacheStats`
+    """
+    with __m.lock:
+        return {
+            'timers': json.loads(json.dumps(__m.profile_timers)),
+            'counters': dict(__m.profile_counters),
+            'stages': json.loads(json.dumps(__m.profile_stages)),
+            'caches': getCacheStats()
+            }
+
+#---------------------------------------------------------------------------
+def saveProfile(filePath, command, wallTime):
+    """Save the profiling report as a json file.
+
+    See :func:`getProfileReport`
+    """
+    report = getProfileReport()
+    report['command'] = command
+    report['date'] = datetime.datetime.utcnow().isoformat()
+    report['platform'] = platform.system()
+    report['seconds'] = wallTime
+    with codecs.open(filePath, 'w', 'utf-8') as fileContents:
+        fileContents.write(json.dumps(report, sort_keys=True, indent=4))
+    print("\nSaved profile '{0}'".format(filePath))
+
 #---------------------------------------------------------------------------
 def connectToSlicerWiki(username='UpdateBot', password=None):
     """
@@ -97,35 +476,463 @@ def connectToSlicerWiki(username='UpdateBot', password=None):
     """
     return connectToWiki(username, password, 'www.slicer.org', '/w/')
 
+#---------------------------------------------------------------------------
+WIKI_TEXT_BUFFER_SIZE = 64 * 1024
+
+#===========================================================================
+class WikiTextWriter(object):
+    """Buffered writer joining wikitext lines with newlines.
+
+    Chunks of about ``bufferSize`` characters are passed to ``sink``, a
+    callable like the ``write`` method of a file or the ``append`` method
+    of a list. Content written using :meth:`writeLines` is consumed
+    incrementally, only the buffer is kept in memory.
+    """
+    #-----------------------------------------------------------------------
+    def __init__(self, sink, bufferSize=WIKI_TEXT_BUFFER_SIZE):
+        self.sink = sink
+        self.bufferSize = bufferSize
+        self._buffer = []
+        self._bufferLength = 0
+        self._empty = True
+
+    #-----------------------------------------------------------------------
+    def writeLine(self, line):
+        if not self._empty:
+            self._buffer.append("\n")
+        self._empty = False
+        self._buffer.append(line)
+        self._bufferLength += len(line) + 1
+        if self._bufferLength >= self.bufferSize:
+            self.flush()
+
+    #-----------------------------------------------------------------------
+    def writeLines(self, lines):
+        for line in lines:
+            self.writeLine(line)
+
+    #-----------------------------------------------------------------------
+    def flush(self):
+        if self._buffer:
+            self.sink("".join(self._buffer))
+        self._buffer = []
+        self._bufferLength = 0
+
+#---------------------------------------------------------------------------
+def renderWikiText(lines):
+    """Return ``lines`` joined with newlines. Equivalent to ``"\\n".join(lines)``
+    without creating an intermediate list when ``lines`` is a generator.
+    """
+    chunks = []
+    writer = WikiTextWriter(chunks.append)
+    writer.writeLines(lines)
+    writer.flush()
+    return "".join(chunks)
+
+#===========================================================================
+class MwclientWikiBackend(object):
+    """Wiki backend interacting with a MediaWiki site using :mod:`mwclient`.
+
+    This backend can be used with www.slicer.org or with the local stand-in
+    implemented in ``slicer_wiki_local_server.py``.
+
+    Login parameters are read from the cache entries ``wiki-<wikiName>-username``,
+    ``wiki-<wikiName>-password``, ``wiki-<wikiName>-host`` and ``wiki-<wikiName>-path``.
+    The session is persisted if the cache entry ``wiki-<wikiName>-session`` is True.
+    """
+    #-----------------------------------------------------------------------
+    def __init__(self, wikiName):
+        username = cacheEntry("wiki-{0}-username".format(wikiName))
+        password = cacheEntry("wiki-{0}-password".format(wikiName))
+        host = cacheEntry("wiki-{0}-host".format(wikiName))
+        path = cacheEntry("wiki-{0}-path".format(wikiName))
+        sessionFilePath = None
+        if cacheEntry("wiki-{0}-session".format(wikiName)):
+            sessionFilePath = getWikiSessionFilePath(username, host, path)
+        self.site = connectToWiki(username, password, host, path, sessionFilePath=sessionFilePath)
+
+    #-----------------------------------------------------------------------
+    def pageExists(self, page):
+        return self.site.Pages[page].exists
+
+    #-----------------------------------------------------------------------
+    def listPages(self, prefix):
+        """Return the titles of all pages starting with ``prefix``."""
+        return [page.name for page in self.site.allpages(prefix=prefix)]
+
+    #-----------------------------------------------------------------------
+    def changedPages(self, since):
+        """Return ``(titles, timestamp)`` where ``titles`` lists the pages
+        created, deleted or moved (source and target) since ``since`` and
+        ``timestamp`` is the current wiki time.
+
+        Timestamps are formatted as ``YYYY-MM-DDTHH:MM:SSZ``. Recent changes,
+        log events and the wiki time are retrieved using a single request.
+        ``titles`` is None if ``since`` is None or if the changes could not
+        be listed in one request.
+        """
+        params = {'meta': 'siteinfo', 'siprop': 'general'}
+        if since is not None:
+            params.update({
+                'list': 'recentchanges|logevents',
+                'rcstart': since, 'rcdir': 'newer', 'rcnamespace': 0,
+                'rcprop': 'title|timestamp', 'rctype': 'new|log', 'rclimit': 'max',
+                'lestart': since, 'ledir': 'newer',
+                'leprop': 'title|type|details|timestamp', 'lelimit': 'max'})
+        result = self.site.api('query', **params)
+        query = result['query']
+        if since is None or 'query-continue' in result or 'continue' in result:
+            return (None, query['general']['time'])
+        titles = [change['title'] for change in query.get('recentchanges', [])]
+        for event in query.get('logevents', []):
+            if event.get('type') not in ['create', 'delete', 'move']:
+                continue
+            titles.append(event['title'])
+            # Target of moved pages ('move' key is used by MediaWiki < 1.25)
+            target = event.get('params', {}).get('target_title', event.get('move', {}).get('new_title'))
+            if target:
+                titles.append(target)
+        return (titles, query['general']['time'])
+
+    #-----------------------------------------------------------------------
+    def savePage(self, page, summary, content):
+        return self.site.Pages[page].save(content, summary=summary)
+
+#===========================================================================
+class DirectoryWikiBackend(object):
+    """Wiki backend writing pages as files into a directory instead of
+    publishing them. The wiki is never contacted.
+
+    Page existence is looked up in a snapshot of the existence index (see
+    :func:`getPersistentCacheFilePath`). Pages missing from the snapshot are
+    considered as non existent.
+
+    Each saved page is recorded along with the SHA-1 of its content. The
+    records are written into ``manifest.json`` by :meth:`flush`. See
+    :func:`publishRenderedPages`.
+
+    The directory and the snapshot are read from the cache entries
+    ``wiki-<wikiName>-output-dir`` and ``wiki-<wikiName>-existence-index``.
+    """
+    #-----------------------------------------------------------------------
+    def __init__(self, wikiName):
+        self.outputDir = cacheEntry("wiki-{0}-output-dir".format(wikiName))
+        existenceIndex = cacheEntry("wiki-{0}-existence-index".format(wikiName))
+        self.existence = {}
+        if os.path.exists(existenceIndex):
+            with open(existenceIndex) as fileContents:
+                self.existence = json.load(fileContents)
+        print("\nLoaded {0} page(s) from existence index '{1}'".format(
+            len(self.existence), existenceIndex))
+        self.manifest = {}
+        if not os.path.exists(self.outputDir):
+            os.makedirs(self.outputDir)
+
+    #-----------------------------------------------------------------------
+    def pageExists(self, page):
+        if page not in self.existence:
+            incrementProfileCounter('existence-index-misses')
+        return self.existence.get(page, False)
+
+    #-----------------------------------------------------------------------
+    def listPages(self, prefix):
+        return [page for (page, exists) in self.existence.iteritems()
+                if exists and page.startswith(prefix)]
+
+    #-----------------------------------------------------------------------
+    def savePage(self, page, summary, content):
+        return self.savePageLines(page, summary, [content])
+
+    #-----------------------------------------------------------------------
+    def savePageLines(self, page, summary, lines):
+        """Stream ``lines`` into the file associated with ``page``.
+        See :class:`WikiTextWriter`
+        """
+        fileName = getRenderedPageFileName(page)
+        filePath = os.path.join(self.outputDir, fileName)
+        try:
+            os.makedirs(os.path.dirname(filePath))
+        except OSError as e:
+            if e.errno != errno.EEXIST:
+                raise
+        sha1 = hashlib.sha1()
+        with open(filePath, 'wb') as fileContents:
+            def _write(chunk):
+                chunk = chunk.encode('utf-8') if isinstance(chunk, unicode) else chunk
+                fileContents.write(chunk)
+                sha1.update(chunk)
+            writer = WikiTextWriter(_write)
+            writer.writeLines(lines)
+            writer.flush()
+        self.manifest[page] = {'file': fileName, 'sha1': sha1.hexdigest()}
+        return "Saved '{0}'".format(filePath)
+
+    #-----------------------------------------------------------------------
+    def flush(self):
+        """Write ``manifest.json`` listing the pages saved so far."""
+        _writeFileAtomically(os.path.join(self.outputDir, 'manifest.json'),
+                             json.dumps(self.manifest, sort_keys=True, indent=4))
+
+#---------------------------------------------------------------------------
+WIKI_BACKENDS = {'mwclient': MwclientWikiBackend, 'directory': DirectoryWikiBackend}
+
+#---------------------------------------------------------------------------
+def registerWikiBackend(name, backendClass):
+    """Register a wiki backend that can be selected setting the cache
+    entry ``wiki-<wikiName>-backend``.
+
+    ``backendClass`` is instantiated with the wiki name and is expected to
+    implement ``pageExists(page)`` and ``savePage(page, summary, content)``.
+    Backends able to stream pages may also implement
+    ``savePageLines(page, summary, lines)``.
+
+    See :class:`MwclientWikiBackend` and :class:`DirectoryWikiBackend`
+    """
+    WIKI_BACKENDS[name] = backendClass
+
 #---------------------------------------------------------------------------
 def connectToWikiByName(name):
-    try:
-        wiki = cacheEntry('wiki-{0}'.format(name))
-    except KeyError:
-        username = cacheEntry("wiki-{0}-username".format(name))
-        password = cacheEntry("wiki-{0}-password".format(name))
-        host = cacheEntry("wiki-{0}-host".format(name))
-        path = cacheEntry("wiki-{0}-path".format(name))
-        wiki = setCacheEntry('wiki-{0}'.format(name),
-            connectToWiki(username, password, host, path))
+    """Return the wiki backend associated with ``name``.
+
+    See :func:`registerWikiBackend`
+    """
+    with __m.wiki_lock:
+        try:
+            wiki = cacheEntry('wiki-{0}'.format(name), namespace='connections')
+        except KeyError:
+            backend = cacheEntry("wiki-{0}-backend".format(name))
+            if backend not in WIKI_BACKENDS:
+                raise RuntimeError, "Unknown wiki backend '{0}'. Available backends: {1}".format(
+                    backend, ", ".join(sorted(WIKI_BACKENDS)))
+            wiki = setCacheEntry('wiki-{0}'.format(name), WIKI_BACKENDS[backend](name),
+                namespace='connections')
     return wiki
 
 #---------------------------------------------------------------------------
-def connectToWiki(username, password, host, path):
+def getRenderedPageFileName(page):
+    """Return the path relative to the output directory of the file
+    associated with ``page``.
+
+    See :class:`DirectoryWikiBackend`
     """
+    return urllib.quote(_utf8(page), safe='/ ') + '.wiki'
+
+#---------------------------------------------------------------------------
+def connectToWiki(username, password, host, path, sessionFilePath=None):
+    """
+    If ``sessionFilePath`` is set, the session cookies and the site
+    information are saved into this file after login and reused by the next
+    calls until they expire. See :data:`WIKI_SESSION_MAX_AGE` and
+    :data:`WIKI_SITEINFO_MAX_AGE`. If the wiki does not recognize a restored
+    session, the user is transparently logged in again.
+
     :returns: Site object allowing to interact with the wiki.
     :rtype: :class:`mwclient.Site <mwclient:mwclient.client.Site>`
     """
     import mwclient
 
-    site = mwclient.Site(host, path=path)
-    site.login(username, password)
+    #=======================================================================
+    class _ProfiledSite(mwclient.Site):
+        sessionRestored = False
+
+        #-------------------------------------------------------------------
+        def raw_call(self, script, data):
+            incrementProfileCounter('wiki-api-calls')
+            incrementProfileCounter('wiki-bytes-sent', len(data))
+            return mwclient.Site.raw_call(self, script, data)
+
+        #-------------------------------------------------------------------
+        def api(self, action, *args, **kwargs):
+            try:
+                info = mwclient.Site.api(self, action, *args, **kwargs)
+            except mwclient.errors.APIError as e:
+                if not self.sessionRestored or e.code not in WIKI_AUTHENTICATION_ERRORS:
+                    raise
+                self.relogin()
+                return mwclient.Site.api(self, action, *args, **kwargs)
+            # Queries report an anonymous user if the session expired
+            if self.sessionRestored and not self.logged_in:
+                self.relogin()
+                info = mwclient.Site.api(self, action, *args, **kwargs)
+            return info
 
-    print("\nConnected to '{host}{path}' as user '{username}'".format(
-        host=site.host, path=site.path, username=username))
+        #-------------------------------------------------------------------
+        def relogin(self):
+            if self.credentials[1] is None:
+                raise RuntimeError, "Wiki session of '{0}' expired and no password was given".format(
+                    self.credentials[0])
+            print("\nWiki session expired, logging in again as '{0}'".format(self.credentials[0]))
+            self.sessionRestored = False
+            self.tokens = {}
+            getWikiCookies(self).clear()
+            with profileTimer('wiki-login'):
+                self.login(self.credentials[0], self.credentials[1])
+            incrementProfileCounter('wiki-logins')
+            if sessionFilePath:
+                saveWikiSession(self, sessionFilePath)
+
+    session = loadWikiSession(sessionFilePath, username, host, path) if sessionFilePath else None
+    now = time.time()
+    siteinfoValid = session is not None and now - session['saved'] < WIKI_SITEINFO_MAX_AGE
+    sessionValid = session is not None and now - session['saved'] < WIKI_SESSION_MAX_AGE
+
+    with profileTimer('wiki-login'):
+        site = _ProfiledSite(host, path=path, do_init=not siteinfoValid)
+        if siteinfoValid:
+            site.site = session['siteinfo']
+            site.namespaces = {int(id_): name for (id_, name) in session['namespaces'].iteritems()}
+            site.writeapi = 'writeapi' in site.site
+            site.version = tuple(session['version'])
+            site.initialized = True
+        if sessionValid:
+            site.credentials = (username, password, None)
+            getWikiCookies(site).update(session['cookies'])
+            site.username = session['username']
+            site.groups = session['groups']
+            site.rights = session['rights']
+            site.logged_in = True
+            site.sessionRestored = True
+            incrementProfileCounter('wiki-session-reuses')
+        else:
+            # mwclient silently falls back to an anonymous session
+            if password is None:
+                raise RuntimeError, "A password is required to log in to '{0}{1}' as '{2}'".format(
+                    host, path, username)
+            site.login(username, password)
+            incrementProfileCounter('wiki-logins')
+            if sessionFilePath:
+                saveWikiSession(site, sessionFilePath)
+
+    print("\nConnected to '{host}{path}' as user '{username}'{restored}".format(
+        host=site.host, path=site.path, username=username,
+        restored=" (restored session)" if sessionValid else ""))
 
     return site
 
+#---------------------------------------------------------------------------
+# Error codes returned by the wiki API when the session is not valid anymore
+WIKI_AUTHENTICATION_ERRORS = ['notloggedin', 'permissiondenied', 'badtoken',
+                              'assertuserfailed', 'assertbotfailed']
+
+#---------------------------------------------------------------------------
+# Time in seconds during which saved session cookies and site information are reused
+WIKI_SESSION_MAX_AGE = 24 * 3600
+WIKI_SITEINFO_MAX_AGE = 7 * 24 * 3600
+
+#---------------------------------------------------------------------------
+def getWikiCookies(site):
+    """Return the cookie jar associated with the host of the
+    :class:`mwclient.Site` ``site``.
+    """
+    import mwclient
+    connection = site.connection.find_connection(site.host)
+    return connection.cookies.setdefault(site.host, mwclient.http.CookieJar())
+
+#---------------------------------------------------------------------------
+def getWikiSessionDirectory():
+    """Return the per-user directory where wiki sessions are saved.
+    """
+    if sys.platform == 'win32':
+        cacheDir = os.environ.get('LOCALAPPDATA', os.path.expanduser('~'))
+    else:
+        cacheDir = os.environ.get('XDG_CACHE_HOME', os.path.join(os.path.expanduser('~'), '.cache'))
+    return os.path.join(cacheDir, os.path.basename(os.path.splitext(__file__)[0]))
+
+#---------------------------------------------------------------------------
+def getWikiSessionFilePath(username, host, path):
+    key = hashlib.sha1("{0}@{1}{2}".format(username, host, path)).hexdigest()[:12]
+    return os.path.join(getWikiSessionDirectory(), "wiki-session-{0}.json".format(key))
+
+#---------------------------------------------------------------------------
+def _writeFileAtomically(filePath, content, mode=0644):
+    """Atomically replace ``filePath`` with ``content`` by writing a temporary
+    file in the same directory and renaming it.
+
+    The temporary file has a unique name, it can not collide with the one
+    of another process or user.
+    """
+    (fd, temporaryFilePath) = tempfile.mkstemp(
+        prefix=os.path.basename(filePath) + '.', suffix='.tmp', dir=os.path.dirname(os.path.abspath(filePath)))
+    try:
+        with os.fdopen(fd, 'wb') as fileContents:
+            fileContents.write(content)
+        os.chmod(temporaryFilePath, mode)
+        if sys.platform == 'win32' and os.path.exists(filePath):
+            os.remove(filePath)
+        os.rename(temporaryFilePath, filePath)
+    except:
+        if os.path.exists(temporaryFilePath):
+            os.remove(temporaryFilePath)
+        raise
+
+#---------------------------------------------------------------------------
+def _writePrivateFile(filePath, content):
+    """Atomically replace ``filePath`` with ``content``. The file is only
+    readable by the current user.
+    """
+    _writeFileAtomically(filePath, content, mode=0600)
+
+#---------------------------------------------------------------------------
+def saveWikiSession(site, filePath):
+    """Save cookies, user and site information of the :class:`mwclient.Site`
+    ``site`` into ``filePath``. The password is not saved.
+
+    Failing to save the session is reported but does not raise, the
+    following runs log in again.
+    """
+    session = {
+        'host': site.host, 'path': site.path, 'saved': time.time(),
+        'cookies': dict(getWikiCookies(site)),
+        'siteinfo': site.site,
+        'namespaces': site.namespaces,
+        'version': list(site.version),
+        'username': site.username, 'groups': site.groups, 'rights': site.rights
+        }
+    try:
+        if not os.path.isdir(os.path.dirname(filePath)):
+            os.makedirs(os.path.dirname(filePath), 0700)
+        _writePrivateFile(filePath, json.dumps(session, sort_keys=True, indent=4))
+    except (IOError, OSError) as e:
+        print("\nFailed to save wiki session '{0}': {1}".format(filePath, e))
+
+#---------------------------------------------------------------------------
+def loadWikiSession(filePath, username, host, path):
+    """Return the session saved using :func:`saveWikiSession` or None if
+    the file is missing, owned or readable by other users or associated
+    with another wiki or user.
+    """
+    if not os.path.exists(filePath):
+        return None
+    if os.name == 'posix':
+        stat = os.stat(filePath)
+        if stat.st_uid != os.getuid():
+            print("\nIgnoring wiki session '{0}': file is owned by another user".format(filePath))
+            return None
+        if stat.st_mode & 0077:
+            print("\nIgnoring wiki session '{0}': file is readable by other users".format(filePath))
+            return None
+    try:
+        with open(filePath) as fileContents:
+            session = json.load(fileContents)
+    except ValueError:
+        return None
+    if (session.get('host'), session.get('path'), session.get('username')) != (host, path, username):
+        return None
+    return session
+
+#---------------------------------------------------------------------------
+def hasValidWikiSession(username, host, path):
+    """Return True if a session saved by :func:`saveWikiSession` can be reused
+    to connect to ``host`` and ``path`` as ``username`` without password.
+    """
+    session = loadWikiSession(getWikiSessionFilePath(username, host, path), username, host, path)
+    return session is not None and time.time() - session['saved'] < WIKI_SESSION_MAX_AGE
+
+#---------------------------------------------------------------------------
+_ANCHOR_WHITESPACE_REGEX = re.compile(r'[ _]+')
+_ANCHOR_BIDI_REGEX = re.compile(r'\xE2\x80[\x8E\x8F\xAA-\xAE]')
+_ANCHOR_ESCAPE_REGEX = re.compile(r'[ \t\n\r\f_\'"&#%]')
+
 #---------------------------------------------------------------------------
 def convertTitleToWikiAnchor(title):
     """Convert section title into a identifier that can be used to reference
@@ -141,18 +948,18 @@ def convertTitleToWikiAnchor(title):
     """
     # Following snippet has been adapted from mediawiki code base
     # 1) normalize
-    title = re.sub(r'[ _]+', ' ', title)
+    title = _ANCHOR_WHITESPACE_REGEX.sub(' ', title)
     # 2) See Title::newFromText in mediawiki
     title = title.replace(' ', '_')
     #   * decodeCharReferencesAndNormalize: Convert things like &eacute; &#257; or &#x3017; into normalized text
     # XXX title = decodeCharReferencesAndNormalize(title)
     #   * Strip Unicode bidi override characters.
-    title = re.sub(r'\xE2\x80[\x8E\x8F\xAA-\xAE]', '', title)
+    title = _ANCHOR_BIDI_REGEX.sub('', title)
     #   * Clean up whitespace
     # XXX title = re.sub(r'[ _\xA0\x{1680}\x{180E}\x{2000}-\x{200A}\x{2028}\x{2029}\x{202F}\x{205F}\x{3000}]', '_', title)
     title = title.strip('_')
     # 2) See Title::getFragmentForURL -> Title::escapeFragmentForURL -> Sanitized::escapeId
-    title = re.sub(r'[ \t\n\r\f_\'"&#%]', '_', title)
+    title = _ANCHOR_ESCAPE_REGEX.sub('_', title)
     title = title.strip('_')
     title = urllib.quote_plus(title)
     #   * HTML4-style escaping
@@ -164,15 +971,49 @@ def convertTitleToWikiAnchor(title):
 def extractExtensionName(descriptionFile):
     return os.path.basename(os.path.splitext(descriptionFile)[0])
 
+#---------------------------------------------------------------------------
+_PRETTIFY_REGEX = re.compile(r'^Slicer(Extension)?[\-\_]')
+
 #---------------------------------------------------------------------------
 def prettify(name):
     """Source: http://stackoverflow.com/questions/5020906/python-convert-camel-case-to-space-delimited-using-regex-and-taking-acronyms-in
     """
-    name = re.sub(r'^Slicer(Extension)?[\-\_]', "", name)
+    name = _PRETTIFY_REGEX.sub("", name)
     #return re.sub("([a-z])([A-Z])","\g<1> \g<2>", name).replace('_', ' ')
     return name
 
 #---------------------------------------------------------------------------
+def normalizedName(name):
+    """Return a dictionnary with the prettified name, sort keys and wiki anchor
+    associated with ``name``.
+
+    Values are computed once per distinct name and stored in the ``names``
+    cache namespace.
+
+    See :func:`prettify` and :func:`convertTitleToWikiAnchor`
+    """
+    table = cacheNamespace('names')
+    try:
+        return table.get(name)
+    except KeyError:
+        lowerName = name.lower()
+        return table.set(name, {
+            'prettified': prettify(name),
+            'sortKey': lowerName,
+            'prettifiedSortKey': prettify(lowerName),
+            'anchor': convertTitleToWikiAnchor(name)
+            })
+
+#---------------------------------------------------------------------------
+def prettifiedName(name):
+    return normalizedName(name)['prettified']
+
+#---------------------------------------------------------------------------
+def wikiAnchor(title):
+    return normalizedName(title)['anchor']
+
+#---------------------------------------------------------------------------
+@profiled('directory-scan')
 def getDescriptionFiles(extensionsIndexDir, skip = []):
     s4extFiles = []
     files = os.listdir(extensionsIndexDir)
@@ -185,25 +1026,202 @@ def getDescriptionFiles(extensionsIndexDir, skip = []):
     return s4extFiles
 
 #---------------------------------------------------------------------------
-def getExtensionHomepages(files):
+def getExtensionDescription(filePath):
+    """Return the :class:`SlicerWizard.ExtensionDescription` associated with
+    ``filePath``.
+
+    Descriptions are parsed once per distinct file content and stored in the
+    ``descriptions`` cache namespace. This allows to share them between the
+    listings of several Slicer versions.
+    """
     import SlicerWizard as sw
+    with open(filePath, 'rb') as fileContents:
+        key = hashlib.sha1(fileContents.read()).hexdigest()
+    descriptions = cacheNamespace('descriptions')
+    try:
+        return descriptions.get(key)
+    except KeyError:
+        return descriptions.set(key, sw.ExtensionDescription(filepath=filePath))
+
+#---------------------------------------------------------------------------
+EXTENSION_DESCRIPTION_RECORDS_VERSION = 1
+
+#---------------------------------------------------------------------------
+def getExtensionDescriptionRecordsFilePath():
+    return os.path.join(tempfile.gettempdir(),
+        os.path.basename(os.path.splitext(__file__)[0]) + "-extension-descriptions.json")
+
+#---------------------------------------------------------------------------
+def _utf8(value):
+    if isinstance(value, unicode):
+        return value.encode('utf-8')
+    return value
+
+#---------------------------------------------------------------------------
+def _extensionDescriptionRecord(filePath):
+    """Return a dictionnary with the fields of the description ``filePath``
+    used to generate the listings.
+
+    ``category`` and ``contributors`` are None if the field is missing.
+    """
+    desc = getExtensionDescription(filePath)
+    return {
+        'homepage': desc.homepage,
+        'category': getattr(desc, 'category', None),
+        'contributors': getattr(desc, 'contributors', None)
+        }
+
+#---------------------------------------------------------------------------
+@profiled('description-parsing')
+def updateExtensionDescriptionRecords(extensionsIndexDir, branch):
+    """Update the records of the description files found in the clone
+    ``extensionsIndexDir`` of the ExtensionsIndex.
+
+    Records are saved with the commit they were extracted from, one set per
+    ``branch``. If records of an earlier commit are available, only the
+    description files reported by ``git diff --name-status`` as added or
+    modified are parsed again, and those deleted are dropped.
+
+    Records are then returned by :func:`getExtensionDescriptionRecord`
+    instead of parsing the description files.
+
+    :returns: Dictionnary mapping description file names to their record,
+      or None if ``extensionsIndexDir`` is not a git repository.
+    """
+    try:
+        repo = git.Repo(extensionsIndexDir)
+    except (git.InvalidGitRepositoryError, git.NoSuchPathError):
+        return None
+    head = repo.head.commit.hexsha
+
+    filePath = getExtensionDescriptionRecordsFilePath()
+    state = {}
+    if os.path.exists(filePath):
+        with open(filePath) as fileContents:
+            state = json.load(fileContents)
+        if state.get('version') != EXTENSION_DESCRIPTION_RECORDS_VERSION:
+            state = {}
+    state['version'] = EXTENSION_DESCRIPTION_RECORDS_VERSION
+    branches = state.setdefault('branches', {})
+
+    previous = branches.get(branch)
+    changed = None
+    deleted = []
+    if previous is not None and previous['commit'] == head:
+        changed = []
+    elif previous is not None:
+        try:
+            incrementProfileCounter('git-operations')
+            diff = repo.git.diff('--name-status', '--no-renames', previous['commit'], head)
+            changed = []
+            for line in diff.splitlines():
+                (status, fileName) = line.split('\t', 1)
+                if os.path.dirname(fileName) or not fnmatch.fnmatch(fileName, '*.s4ext'):
+                    continue
+                (deleted if status == 'D' else changed).append(fileName)
+        except git.GitCommandError:
+            print("\nCommit '{0}' of the previous ExtensionsIndex records is not available".format(
+                previous['commit']))
+    if changed is None:
+        records = {}
+        changed = [fileName for fileName in os.listdir(extensionsIndexDir)
+                   if fnmatch.fnmatch(fileName, '*.s4ext')]
+    else:
+        records = dict((_utf8(fileName), dict((key, _utf8(value)) for (key, value) in record.iteritems()))
+                       for (fileName, record) in previous['records'].iteritems())
+
+    for fileName in deleted:
+        records.pop(fileName, None)
+    for fileName in changed:
+        records[fileName] = _extensionDescriptionRecord(os.path.join(extensionsIndexDir, fileName))
+    incrementProfileCounter('extension-descriptions-parsed', len(changed))
+    incrementProfileCounter('extension-descriptions-reused', len(records) - len(changed))
+    print("\nUpdated ExtensionsIndex '{0}' records at {1}: {2} parsed, {3} removed, {4} reused".format(
+        branch, head[:7], len(changed), len(deleted), len(records) - len(changed)))
+
+    if changed or deleted or previous is None or previous['commit'] != head:
+        branches[branch] = {'commit': head, 'records': records}
+        _writeFileAtomically(filePath, json.dumps(state, sort_keys=True, indent=4))
+
+    return setCacheEntry(('records', os.path.abspath(extensionsIndexDir)), records,
+                         namespace='descriptions')
+
+#---------------------------------------------------------------------------
+def getExtensionDescriptionRecord(filePath):
+    """Return the record associated with the description ``filePath``.
+
+    See :func:`updateExtensionDescriptionRecords`
+    """
+    try:
+        records = cacheEntry(('records', os.path.abspath(os.path.dirname(filePath))),
+                             namespace='descriptions')
+        return records[os.path.basename(filePath)]
+    except KeyError:
+        return _extensionDescriptionRecord(filePath)
 
+#---------------------------------------------------------------------------
+@profiled('description-parsing')
+def getExtensionHomepages(files):
     print("\nCollecting extension homepage links")
 
     homepages = {}
     for file_ in files:
-        desc = sw.ExtensionDescription(filepath=file_)
+        record = getExtensionDescriptionRecord(file_)
         name = extractExtensionName(file_)
-        homepages[name] = desc.homepage
+        homepages[name] = record['homepage']
     return homepages
 
+#---------------------------------------------------------------------------
+def _normalizeWikiTitle(title):
+    return title.strip().replace('_', ' ')
+
+#---------------------------------------------------------------------------
+def _wikiTitlePrefix(page):
+    return page.rsplit('/', 1)[0] + '/'
+
+#---------------------------------------------------------------------------
+def prefetchWikiPageExistence(wikiName, prefixes):
+    """Query the wiki once for all pages starting with each of ``prefixes``.
+
+    Existence of pages directly below a prefetched prefix (e.g
+    ``Documentation/Nightly/Modules/``) is then looked up by
+    :func:`wikiPageExists` without contacting the wiki. Nothing is done if the
+    wiki backend does not implement ``listPages``.
+    """
+    wiki = connectToWikiByName(wikiName)
+    if not hasattr(wiki, 'listPages'):
+        return
+    existence = cacheNamespace('existence')
+    for prefix in prefixes:
+        if _normalizeWikiTitle(prefix) in existence:
+            continue
+        # mwclient connections can not be shared between threads
+        with __m.wiki_lock, profileTimer('wiki-page-listing'):
+            pages = wiki.listPages(prefix)
+        existence.set(_normalizeWikiTitle(prefix),
+                      set([_normalizeWikiTitle(page) for page in pages]))
+        print("\nFound {0} page(s) starting with '{1}'".format(len(pages), prefix))
+
 #---------------------------------------------------------------------------
 def wikiPageExists(wikiName, page):
     try:
         exist = persistentCacheEntry(page)
+        incrementProfileCounter('wiki-page-exists-cache-hits')
     except KeyError:
+        title = _normalizeWikiTitle(page)
+        try:
+            exist = title in cacheEntry(_wikiTitlePrefix(title), namespace='existence')
+            incrementProfileCounter('wiki-page-exists-index-hits')
+            if persistentCacheEnabled():
+                # Saved once by flushPersistentCache(), there is one hit per page
+                setPersistentCacheEntry(page, exist, save=False)
+            return exist
+        except KeyError:
+            pass
         wiki = connectToWikiByName(wikiName)
-        exist  = setPersistentCacheEntry(page, wiki.Pages[page].exists)
+        # mwclient connections can not be shared between threads
+        with __m.wiki_lock, profileTimer('wiki-page-exists'):
+            exist  = setPersistentCacheEntry(page, wiki.pageExists(page))
     return exist
 
 #---------------------------------------------------------------------------
@@ -259,24 +1277,48 @@ def generateItemWikiLinks(what, wikiName, homepages, slicerVersion=None):
         if idx % 5 == 0:
             print("  {:.0%}".format(float(idx) / len(homepages)))
 
-        item = _createLinkItem(WIKI_LINK_INTERNAL, what, name, prettify(name), slicerVersion=slicerVersion)
+        item = _createLinkItem(WIKI_LINK_INTERNAL, what, name, prettifiedName(name), slicerVersion=slicerVersion)
 
         # If wiki page does NOT exist use the homepage link provided in the description file
         if not wikiPageExists(wikiName, "Documentation/{0}/{1}/{2}".format(releaseIdentifier, what, name)):
             if homepage:
-                item = _createLinkItem(WIKI_LINK_EXTERNAL, what, name, prettify(name), url=homepage)
+                item = _createLinkItem(WIKI_LINK_EXTERNAL, what, name, prettifiedName(name), url=homepage)
             else:
-                item = _createLinkItem(WIKI_LINK_OFF, what, name, prettify(name))
+                item = _createLinkItem(WIKI_LINK_OFF, what, name, prettifiedName(name))
 
         wikiLinks[name] = item
 
     return wikiLinks
 
 #---------------------------------------------------------------------------
+@profiled('publishing')
 def saveWikiPage(wikiName, name, summary, content):
     wiki = connectToWikiByName(wikiName)
-    page = wiki.Pages[name]
-    return page.save(content, summary=summary)
+    with __m.wiki_lock:
+        return wiki.savePage(name, summary, content)
+
+#---------------------------------------------------------------------------
+@profiled('publishing')
+def saveWikiPageLines(wikiName, name, summary, lines):
+    """Save page ``name`` consuming ``lines`` incrementally if the backend
+    supports it. Otherwise, the content is joined and saved using
+    :func:`saveWikiPage`.
+    """
+    wiki = connectToWikiByName(wikiName)
+    if not hasattr(wiki, 'savePageLines'):
+        return saveWikiPage(wikiName, name, summary, renderWikiText(lines))
+    with __m.wiki_lock:
+        return wiki.savePageLines(name, summary, lines)
+
+#---------------------------------------------------------------------------
+def flushWiki(wikiName):
+    """Complete the pending writes of the wiki backend, if it has any.
+    See :meth:`DirectoryWikiBackend.flush`
+    """
+    wiki = connectToWikiByName(wikiName)
+    if hasattr(wiki, 'flush'):
+        with __m.wiki_lock:
+            wiki.flush()
 
 #---------------------------------------------------------------------------
 def getCategoryItems(itemCategories):
@@ -314,18 +1356,17 @@ def getModuleCategories(modulesMetadata):
     return {name: modulesMetadata[name]['categories'] for name in modulesMetadata}
 
 #---------------------------------------------------------------------------
+@profiled('description-parsing')
 def getExtensionCategories(files):
-    import SlicerWizard as sw
-
     print("\nCollecting extension 'categories'")
     categories = {}
     for file_ in files:
-        desc = sw.ExtensionDescription(filepath=file_)
+        record = getExtensionDescriptionRecord(file_)
         name = extractExtensionName(file_)
 
         categories[name] = []
-        if hasattr(desc, 'category') and desc.category.strip():
-            categories[name] = [desc.category]
+        if record['category'] is not None and record['category'].strip():
+            categories[name] = [record['category']]
 
     return categories
 
@@ -340,7 +1381,10 @@ def _appendToDictValue(dict_, key, value, allowDuplicate=True):
         dict_[key].append(value)
 
 #---------------------------------------------------------------------------
-def parseContributors(name, contributors):
+def _splitContributors(contributors):
+    """Return a tuple of ``(organization, individuals)`` found in the
+    ``contributors`` string. Empty entries are represented by None.
+    """
     # XXX This has been copied from [1]
     #     [1] https://github.com/Slicer/Slicer/blob/a8a01aa29210f938eaf48bb5c991681c3c67632d/Modules/Scripted/ExtensionWizard/ExtensionWizardLib/EditExtensionMetadataDialog.py#L101
 
@@ -367,16 +1411,39 @@ def parseContributors(name, contributors):
             individuals = _parseIndividuals(organization)
             organization = ""
 
-        return (organization, individuals)
+        return (organization, tuple(individuals))
 
-    def _parseContributors(contributors):
-        orgs = re.split("(?<=[)])\s*,", contributors)
-        for c in orgs:
-            c = c.strip()
-            if not c:
+    entries = []
+    # Split by organization
+    for c in re.split("(?<=[)])\s*,", contributors):
+        c = c.strip()
+        entries.append(_parseOrganization(c) if c else None)
+    return tuple(entries)
+
+#---------------------------------------------------------------------------
+def parseContributors(name, contributors):
+    """Return ``(orgToIndividuals, individualToOrgs)`` dictionnaries associated
+    with ``contributors``, a string or a list of strings.
+
+    Each distinct string is split once, results are memoized in the
+    ``contributors`` cache namespace. See :func:`_splitContributors`
+    """
+    orgToIndividuals = {}
+    individualToOrgs = {}
+
+    memo = cacheNamespace('contributors')
+    if isinstance(contributors, basestring):
+        contributors = [contributors]
+    for contributor in contributors:
+        try:
+            entries = memo.get(contributor)
+        except KeyError:
+            entries = memo.set(contributor, _splitContributors(contributor))
+        for entry in entries:
+            if entry is None:
                 print("  {0}: no contributors".format(name))
                 continue
-            (organization, individuals) = _parseOrganization(c)
+            (organization, individuals) = entry
             for individual in individuals:
                 if individual == "":
                     print("  {0}: organization {1} has no individuals".format(name, organization))
@@ -384,29 +1451,20 @@ def parseContributors(name, contributors):
                 _appendToDictValue(orgToIndividuals, organization, individual)
                 _appendToDictValue(individualToOrgs, individual, organization)
 
-    orgToIndividuals = {}
-    individualToOrgs = {}
-
-    # Split by organization
-    if isinstance(contributors, basestring):
-        contributors = [contributors]
-    for contributor in contributors:
-        _parseContributors(contributor)
-
     return (orgToIndividuals, individualToOrgs)
 
 #---------------------------------------------------------------------------
+@profiled('description-parsing')
 def getExtensionContributors(files):
-    import SlicerWizard as sw
     print("\nCollecting extension 'contributors'")
     contributors = {}
     for file_ in files:
-        desc = sw.ExtensionDescription(filepath=file_)
+        record = getExtensionDescriptionRecord(file_)
         name = extractExtensionName(file_)
-        if not hasattr(desc, 'contributors'):
+        if record['contributors'] is None:
             print("  skipping %s: missing contributors field" % name)
             continue
-        contributors[name] = desc.contributors
+        contributors[name] = record['contributors']
     return contributors
 
 #---------------------------------------------------------------------------
@@ -414,41 +1472,130 @@ def getModuleContributors(modulesMetadata):
     print("\nCollecting module 'contributors'")
     return {name: modulesMetadata[name]['contributors'] for name in modulesMetadata}
 
-#---------------------------------------------------------------------------
-def getContributingOrganizationsAndIndividuals(itemContributors):
-
-    organizationItems = {}
-    individualItems = {}
-    itemOrganizations = {}
-    individualOrganizations = {}
-    for itemName, contributors in itemContributors.iteritems():
+#===========================================================================
+class ContributorIndex(object):
+    """Organizations, individuals and items maps returned by
+    :func:`getContributingOrganizationsAndIndividuals`, updated item by item.
 
-        (orgToIndividuals, individualToOrgs) = parseContributors(itemName, contributors)
+    :meth:`update` only parses the contributors of the items added or changed
+    since the previous update, and only recomputes the entries of the
+    organizations and individuals they reference or used to reference.
+    Recomputed entries list items in the iteration order of
+    ``itemContributors``, as if the maps were built from scratch.
+    """
+    def __init__(self):
+        self.contributors = {}
+        self.parsed = {}
+        self.organizationItems = {}
+        self.individualItems = {}
+        self.itemOrganizations = {}
+        self.individualOrganizations = {}
+
+    def update(self, itemContributors):
+        """Update the maps given ``itemContributors`` mapping item names to their
+        contributors. Items missing from ``itemContributors`` are removed.
+
+        :returns: Tuple ``(updated, removed)`` with the number of items parsed
+          and removed.
+        """
+        stale = [name for name in self.contributors
+                 if self.contributors[name] != itemContributors.get(name)]
+        added = [name for name in itemContributors
+                 if name not in self.contributors or self.contributors[name] != itemContributors[name]]
+        removed = len([name for name in stale if name not in itemContributors])
+
+        touchedOrganizations = set()
+        touchedIndividuals = set()
+        addedItems = ({}, {})
+        for name in stale:
+            (orgToIndividuals, individualToOrgs) = self.parsed.pop(name)
+            del self.contributors[name]
+            self.itemOrganizations.pop(name, None)
+            touchedOrganizations.update(orgToIndividuals)
+            touchedIndividuals.update(individualToOrgs)
+        for name in added:
+            (orgToIndividuals, individualToOrgs) = parseContributors(name, itemContributors[name])
+            self.contributors[name] = itemContributors[name]
+            self.parsed[name] = (orgToIndividuals, individualToOrgs)
+            if orgToIndividuals:
+                self.itemOrganizations[name] = orgToIndividuals
+            for organization in orgToIndividuals:
+                _appendToDictValue(addedItems[0], organization, name)
+            for individual in individualToOrgs:
+                _appendToDictValue(addedItems[1], individual, name)
+        touchedOrganizations.update(addedItems[0])
+        touchedIndividuals.update(addedItems[1])
+
+        if not touchedOrganizations and not touchedIndividuals:
+            return (len(added), removed)
+
+        position = dict((name, idx) for (idx, name) in enumerate(itemContributors))
+        changed = set(stale) | set(added)
 
-        for organization in orgToIndividuals.keys():
-            _appendToDictValue(organizationItems, organization, itemName)
+        #-------------------------------------------------------------------
+        def _updateItems(dict_, key, field):
+            names = [name for name in dict_.get(key, []) if name not in changed]
+            names.extend(addedItems[field].get(key, []))
+            if names:
+                dict_[key] = sorted(names, key=position.get)
+            else:
+                dict_.pop(key, None)
+
+        for organization in touchedOrganizations:
+            _updateItems(self.organizationItems, organization, 0)
+        for individual in touchedIndividuals:
+            _updateItems(self.individualItems, individual, 1)
+            organizations = []
+            for name in self.individualItems.get(individual, []):
+                for organization in self.parsed[name][1][individual]:
+                    if organization and organization not in organizations:
+                        organizations.append(organization)
+            if organizations:
+                self.individualOrganizations[individual] = organizations
+            else:
+                self.individualOrganizations.pop(individual, None)
 
-            itemOrganizations[itemName] = orgToIndividuals
+        return (len(added), removed)
 
-        for individual in individualToOrgs.keys():
-            _appendToDictValue(individualItems, individual, itemName)
-            orgs = individualToOrgs[individual]
-            for org in orgs:
-                if org:
-                    _appendToDictValue(individualOrganizations, individual, org, allowDuplicate=False)
+    def maps(self):
+        """Return copies of the maps, see :func:`getContributingOrganizationsAndIndividuals`.
+        """
+        return (dict((key, list(value)) for (key, value) in self.organizationItems.iteritems()),
+                dict((key, list(value)) for (key, value) in self.individualItems.iteritems()),
+                dict(self.itemOrganizations),
+                dict((key, list(value)) for (key, value) in self.individualOrganizations.iteritems()))
 
-    return (organizationItems, individualItems, itemOrganizations, individualOrganizations)
+#---------------------------------------------------------------------------
+def getContributingOrganizationsAndIndividuals(itemContributors, indexName=None):
+    """Return ``(organizationItems, individualItems, itemOrganizations,
+    individualOrganizations)`` given ``itemContributors`` mapping item names to
+    their contributors.
+
+    If ``indexName`` is specified, the associated :class:`ContributorIndex` is
+    kept in the ``contributors`` cache namespace and only the items that
+    changed since the previous call are processed.
+    """
+    if indexName is None:
+        index = ContributorIndex()
+    else:
+        try:
+            index = cacheEntry(('index', indexName), namespace='contributors')
+        except KeyError:
+            index = setCacheEntry(('index', indexName), ContributorIndex(), namespace='contributors')
+    (updated, removed) = index.update(itemContributors)
+    incrementProfileCounter('contributor-items-parsed', updated)
+    incrementProfileCounter('contributor-items-reused', len(itemContributors) - updated)
+    if indexName is not None:
+        print("\nUpdated contributor index '{0}': {1} item(s) parsed, {2} removed, {3} reused".format(
+            indexName, updated, removed, len(itemContributors) - updated))
+    return index.maps()
 
 #---------------------------------------------------------------------------
 def sortKeys(dict_, prettifyKey=False):
     """Return list of sorted dictionnary keys.
     """
-    def _updateKey(s):
-        s = s.lower()
-        if prettifyKey:
-            s = prettify(s)
-        return s
-    return sorted(dict_, key=_updateKey)
+    key = 'prettifiedSortKey' if prettifyKey else 'sortKey'
+    return sorted(dict_, key=lambda s: normalizedName(s)[key])
 
 #---------------------------------------------------------------------------
 def sortPrettifiedKeys(dict_):
@@ -466,13 +1613,13 @@ def generateContributorsWikiLinks(extensionName, organizations):
 #---------------------------------------------------------------------------
 def tocEntryAsWikiListItem(name, level=0, anchor=None, extras=[]):
     return linkAsWikiListItem(
-        wikiPageToWikiLink('#' + convertTitleToWikiAnchor(name if anchor is None else anchor), prettify(name)),
+        wikiPageToWikiLink('#' + wikiAnchor(name if anchor is None else anchor), prettifiedName(name)),
         level, extras)
 
 #---------------------------------------------------------------------------
 def individualEntryAsWikiListItem(name, level=0):
     extras = []
-    individualOrganizations = cacheEntry("individualOrganizations")
+    individualOrganizations = cacheEntry("individualOrganizations", namespace='datasets')
     if name in individualOrganizations:
         if individualOrganizations[name]:
             extras.append(individualOrganizations[name][0])
@@ -481,7 +1628,11 @@ def individualEntryAsWikiListItem(name, level=0):
 #---------------------------------------------------------------------------
 def headerForWikiList(title, teaser):
     lines = []
-    lines.append(u"= {} =".format(title))
+    if isinstance(title, str):
+        # Shard titles may include UTF-8 encoded names, like the group lines
+        lines.append("= {} =".format(title))
+    else:
+        lines.append(u"= {} =".format(title))
     lines.extend(teaser)
     return lines
 
@@ -501,11 +1652,11 @@ def footerForWikiList(title, teaser):
 def moduleLinkAsListItem(link, level=0):
     name = link['name']
     extras = []
-    moduleTypes = cacheEntry("moduleTypes")
-    moduleExtensions = cacheEntry("moduleExtensions")
+    moduleTypes = cacheEntry("moduleTypes", namespace='datasets')
+    moduleExtensions = cacheEntry("moduleExtensions", namespace='datasets')
     if name in moduleExtensions:
         extensionName = moduleExtensions[name]
-        extensionLinks = cacheEntry("extensionLinks")
+        extensionLinks = cacheEntry("extensionLinks", namespace='datasets')
         # type (cli, loadable, scripted)
         extras.append(moduleTypes[name])
         # provenance (built-in or extension)
@@ -515,6 +1666,39 @@ def moduleLinkAsListItem(link, level=0):
             extras.append("built-in")
     return linkAsWikiListItem(link, level, extras)
 
+#---------------------------------------------------------------------------
+def renderedListItem(renderer, link, level=0):
+    """Return ``renderer(link, level)`` reusing the fragment previously rendered
+    for the same link, renderer and level.
+
+    Fragments are stored in the ``fragments`` cache namespace.
+    See :func:`prerenderListItems`
+    """
+    fragments = cacheNamespace('fragments')
+    key = (renderer, link['name'], link['wikilink'], level)
+    try:
+        return fragments.get(key)
+    except KeyError:
+        return fragments.set(key, renderer(link, level))
+
+#---------------------------------------------------------------------------
+def cachedListItemRenderer(renderer):
+    """Return a list item renderer equivalent to ``renderer`` returning
+    cached fragments.
+
+    See :func:`renderedListItem`
+    """
+    return lambda link, level=0: renderedListItem(renderer, link, level)
+
+#---------------------------------------------------------------------------
+@profiled('rendering', rendering=True)
+def prerenderListItems(links, renderer, level=0):
+    """Render all ``links`` once using ``renderer`` so that section builders
+    only have to concatenate prebuilt fragments.
+    """
+    for link in links.itervalues():
+        renderedListItem(renderer, link, level)
+
 #---------------------------------------------------------------------------
 linksAsWikiList = (headerForWikiList, linkAsWikiListItem, footerForWikiList)
 
@@ -533,65 +1717,108 @@ linksAsWikiList = (headerForWikiList, linkAsWikiListItem, footerForWikiList)
 #---------------------------------------------------------------------------
 # linksAsWikiTable = (headerForWikiTable, linkAsWikiTableEntry, headerForWikiTable)
 
+#===========================================================================
+class WikiSectionGroups(object):
+    """Content of a section made of a header, groups of lines and a footer.
+
+    Iterating over the object yields all the lines of the section. Groups
+    are ``(bucket, name, anchor, lines)`` tuples, consecutive groups sharing
+    the same bucket are always kept on the same page when the section is
+    split using :func:`splitWikiSection`.
+    """
+    #-----------------------------------------------------------------------
+    def __init__(self, title, summary, header, groups, footer):
+        self.title = title
+        self.summary = summary
+        self.header = header
+        self.groups = groups
+        self.footer = footer
+
+    #-----------------------------------------------------------------------
+    def __iter__(self):
+        for line in self.header:
+            yield line
+        for (bucket, name, anchor, lines) in self.groups:
+            for line in lines:
+                yield line
+        for line in self.footer:
+            yield line
+
 #---------------------------------------------------------------------------
+@profiled('rendering', rendering=True)
 def itemByCategoryToWiki(what, links, categories, linksRenderer=linksAsWikiList,
                          tocEntryRenderer=tocEntryAsWikiListItem, withToc=False):
 
-    def _traverse(categories, lines, categoryCallback,
+    def _traverse(categories, categoryCallback,
                   itemCallback=None,
                   category=None, completeCategory=None,
                   level=-1,
                   lookup=lambda item:item):
         if category:
-            categoryAnchor = sectionAnchor + '_' + convertTitleToWikiAnchor(completeCategory)
-            lines.append(categoryCallback(category, level, categoryAnchor))
+            categoryAnchor = sectionAnchor + '_' + wikiAnchor(completeCategory)
+            yield categoryCallback(category, level, categoryAnchor)
         if itemCallback and '_ITEMS_' in categories:
             for item in categories['_ITEMS_']:
-                lines.append(itemCallback(lookup(item)))
+                yield itemCallback(lookup(item))
         for subcategory in sortKeys(categories):
             if subcategory == '_ITEMS_':
                 continue
             level = level + 1
-            _traverse(categories[subcategory], lines, categoryCallback,
-                      itemCallback=itemCallback,
-                      category=subcategory,
-                      completeCategory=subcategory if category is None else category + '_' + subcategory,
-                      level=level, lookup=lookup)
+            for line in _traverse(categories[subcategory], categoryCallback,
+                                  itemCallback=itemCallback,
+                                  category=subcategory,
+                                  completeCategory=subcategory if category is None else category + '_' + subcategory,
+                                  level=level, lookup=lookup):
+                yield line
             level = level - 1
 
+    def _groups():
+        # One group per top-level category
+        for category in sortKeys(categories):
+            if category == '_ITEMS_':
+                continue
+            lines = list(_traverse(categories[category],
+                                   lambda category, level, anchor:
+                                     u"<span id='{}'></span>\n".format(anchor) +
+                                     u"{0} {1} {0}".format("="*(level+2), category),
+                                   itemCallback=linksRenderer[1],
+                                   category=category, completeCategory=category,
+                                   level=0, lookup=lambda item:links[item]))
+            yield (category, category, sectionAnchor + '_' + wikiAnchor(category), lines)
+
     title = "{0} by category".format(what)
     print("\nGenerating '%s' section" % title)
-    sectionAnchor = convertTitleToWikiAnchor(title)
+    sectionAnchor = wikiAnchor(title)
     teaser = []
     if withToc:
         teaser.append("{} categories:".format(len(categories)))
-        _traverse(categories, teaser, tocEntryRenderer)
+        teaser.extend(_traverse(categories, tocEntryRenderer))
     else:
         teaser.append("{} categories".format(len(categories)))
-    lines = []
-    lines.extend(headerForWikiList(title, teaser))
-    # content
-    _traverse(categories, lines,
-              lambda category, level, anchor:
-                u"<span id='{}'></span>\n".format(anchor) +
-                u"{0} {1} {0}".format("="*(level+2), category),
-              itemCallback=linksRenderer[1], lookup=lambda item:links[item])
 
-    return (title, '#' + sectionAnchor, lines)
+    content = WikiSectionGroups(title, teaser[0], headerForWikiList(title, teaser),
+        profiledLines('rendering', _groups(), rendering=True), [])
+    return (title, '#' + sectionAnchor, content)
 
 #---------------------------------------------------------------------------
+@profiled('rendering', rendering=True)
 def itemByNameToWiki(what, links, linksRenderer=linksAsWikiList):
     title = "{0} by name".format(what)
     print("\nGenerating '{0}' section".format(title))
     teaser = ["{0} {1}:".format(len(links), what.lower())]
-    lines = []
-    lines.extend(linksRenderer[0](title, teaser))
-    for name in sortPrettifiedKeys(links):
-        lines.append(linksRenderer[1](links[name]))
-    lines.extend(linksRenderer[2](title, teaser))
-    return (title, '#' + convertTitleToWikiAnchor(title), lines)
+
+    def _lines():
+        for line in linksRenderer[0](title, teaser):
+            yield line
+        for name in sortPrettifiedKeys(links):
+            yield linksRenderer[1](links[name])
+        for line in linksRenderer[2](title, teaser):
+            yield line
+
+    return (title, '#' + wikiAnchor(title), profiledLines('rendering', _lines(), rendering=True))
 
 #---------------------------------------------------------------------------
+@profiled('rendering', rendering=True)
 def itemByPropertyToWiki(what, links, description, items,
                          linksRenderer=linksAsWikiList,
                          tocEntryRenderer=tocEntryAsWikiListItem, withToc=False):
@@ -606,20 +1833,29 @@ def itemByPropertyToWiki(what, links, description, items,
             teaser.append(tocEntryRenderer(name))
     else:
         teaser.append("{0} {1}s".format(len(items), description))
-    lines = []
-    lines.extend(linksRenderer[0](title, teaser))
-    for item in sortKeys(items):
-        if item != "" and len(items[item]) > 0:
-            lines.append("== {} ==".format(item))
-        for name in sortPrettifiedKeys(items[item]):
-            if item == "":
-                print(u"  skipping {0}: missing '{1}'".format(name, description))
-                continue
-            lines.append(linksRenderer[1](links[name]))
-    lines.extend(linksRenderer[2](title, teaser))
-    return (title, '#' + convertTitleToWikiAnchor(title), lines)
+
+    def _groups():
+        # One group per property value, bucketed by initial
+        for item in sortKeys(items):
+            lines = []
+            if item != "" and len(items[item]) > 0:
+                lines.append("== {} ==".format(item))
+            for name in sortPrettifiedKeys(items[item]):
+                if item == "":
+                    print(u"  skipping {0}: missing '{1}'".format(name, description))
+                    continue
+                lines.append(linksRenderer[1](links[name]))
+            if lines:
+                # Names are UTF-8 encoded, the initial may span several bytes
+                initial = (item.decode('utf-8') if isinstance(item, str) else item)[0].upper()
+                yield (_utf8(initial), item, wikiAnchor(item), lines)
+
+    content = WikiSectionGroups(title, teaser[0], linksRenderer[0](title, teaser),
+        profiledLines('rendering', _groups(), rendering=True), linksRenderer[2](title, teaser))
+    return (title, '#' + wikiAnchor(title), content)
 
 #---------------------------------------------------------------------------
+@profiled('directory-scan')
 def getMetadataFiles(prefix):
     """Return a list of files associated with ``prefix``.
     """
@@ -651,31 +1887,124 @@ def _merge(a, b, path=None):
     return a
 
 #---------------------------------------------------------------------------
+@profiled('metadata-merge')
 def mergeMetadataFiles(prefix):
     """Return a merged dictonnary of all metadata files associated with ``prefix``.
+
+    The result is stored in the ``datasets`` cache namespace and reused until
+    one of the files is added, removed or modified.
     """
     #-----------------------------------------------------------------------
     def _readJson(filePath):
+        incrementProfileCounter('metadata-bytes-read', os.path.getsize(filePath))
         with codecs.open(filePath, 'r', 'utf-8') as fileContents:
             return json.load(fileContents)
-    return reduce(_merge, [_readJson(filePath) for filePath in getMetadataFiles(prefix)])
+    filePaths = getMetadataFiles(prefix)
+    state = [(filePath, os.path.getmtime(filePath), os.path.getsize(filePath)) for filePath in filePaths]
+    try:
+        (cachedState, merged) = cacheEntry(('metadata', prefix), namespace='datasets')
+        if cachedState == state:
+            incrementProfileCounter('metadata-merge-cache-hits')
+            return merged
+    except KeyError:
+        pass
+    merged = reduce(_merge, [_readJson(filePath) for filePath in filePaths])
+    setCacheEntry(('metadata', prefix), (state, merged), namespace='datasets')
+    return merged
 
 #---------------------------------------------------------------------------
 def cloneRepository(git_url, repo_dir, branch='master'):
     """Clone ``git_url`` into ``repo_dir`` and return a reference to it.
     If a clone already exists, local change are discarded and ``branch``
     is checked out. Then, a reference to the clone is returned.
+
+    Within a process, ``branch`` is synchronized only once and remote
+    changes are fetched only once per clone. See :func:`clearRepositorySyncs`
+
+    If the same synchronization was started by :func:`syncRepositoryInBackground`,
+    it is waited for instead.
+    """
+    with __m.lock:
+        task = __m.pending_repository_syncs.pop((os.path.abspath(repo_dir), branch), None)
+    if task is not None:
+        with profileTimer('git-sync-wait'):
+            return task.result()
+    return _syncRepository(git_url, repo_dir, branch)
+
+#---------------------------------------------------------------------------
+def syncRepositoryInBackground(git_url, repo_dir, branch='master'):
+    """Start :func:`cloneRepository` in a background thread and return the
+    associated :class:`BackgroundTask`.
+
+    The next :func:`cloneRepository` call with the same ``repo_dir`` and
+    ``branch`` waits for the task and returns its result, or raises its
+    error. A task still running for the same ``repo_dir`` and ``branch`` is
+    reused, a completed one is replaced.
     """
+    key = (os.path.abspath(repo_dir), branch)
+    with __m.lock:
+        task = __m.pending_repository_syncs.get(key)
+        if task is None or task.done():
+            task = BackgroundTask("sync of '{0}'".format(git_url),
+                lambda: _syncRepository(git_url, repo_dir, branch))
+            __m.pending_repository_syncs[key] = task
+    return task
+
+#---------------------------------------------------------------------------
+@profiled('git-sync')
+def _syncRepository(git_url, repo_dir, branch):
     if not os.path.isdir(repo_dir):
+        incrementProfileCounter('git-operations')
         git.Repo.clone_from(git_url, repo_dir)
         print("Cloned '{0}' into '{1}'".format(git_url, repo_dir))
 
     repo = git.Repo(repo_dir)
     print("\nFound '{0}' in '{1}'".format(git_url, repo.working_dir))
+    with __m.lock:
+        synced = (repo.working_dir, branch) in __m.synced_repositories
+    if synced and not repo.head.is_detached and repo.active_branch.name == branch:
+        print("\nReusing branch '{0}' synchronized earlier".format(branch))
+        incrementProfileCounter('git-sync-reuses')
+        return repo
     checkoutBranch(repo, branch)
+    with __m.lock:
+        __m.synced_repositories.add((repo.working_dir, branch))
     return repo
 
 #---------------------------------------------------------------------------
+def clearRepositorySyncs():
+    """Ensure the next :func:`cloneRepository` calls fetch remote changes.
+
+    Pending syncs started by :func:`syncRepositoryInBackground` are discarded.
+    """
+    discardRepositorySyncs()
+    with __m.lock:
+        __m.fetched_repositories.clear()
+        __m.synced_repositories.clear()
+
+#---------------------------------------------------------------------------
+def discardRepositorySyncs(tasks=None):
+    """Discard ``tasks`` started by :func:`syncRepositoryInBackground` and not
+    waited for by :func:`cloneRepository`, or all of them if ``None``.
+
+    Running tasks are waited for so that they do not race with the next
+    synchronization of the same clone. Their errors were already reported
+    and are ignored.
+    """
+    with __m.lock:
+        discarded = [task for task in __m.pending_repository_syncs.values()
+                     if tasks is None or task in tasks]
+        for (key, task) in __m.pending_repository_syncs.items():
+            if task in discarded:
+                del __m.pending_repository_syncs[key]
+    for task in discarded:
+        try:
+            task.result()
+        except Exception:
+            pass
+
+#---------------------------------------------------------------------------
+@profiled('git-sync')
 def checkoutBranch(repo, branch):
     """Discard local ``repo`` changes, fetch remote changes and checkout
     ``branch``.
@@ -686,14 +2015,22 @@ def checkoutBranch(repo, branch):
 
     # Fetch changes
     origin = repo.remotes.origin
-    print("\nFetching changes from '{}'".format(origin.url))
-    origin.fetch()
+    with __m.lock:
+        fetched = repo.working_dir in __m.fetched_repositories
+    if not fetched:
+        print("\nFetching changes from '{}'".format(origin.url))
+        origin.fetch()
+        incrementProfileCounter('git-operations')
+        with __m.lock:
+            __m.fetched_repositories.add(repo.working_dir)
 
     # Checkout branch and update branch
     repo.git.checkout(branch)
     print("\nApplying changes")
     repo.git.reset('--hard','origin/{}'.format(branch))
 
+    incrementProfileCounter('git-operations', 3)
+
 #---------------------------------------------------------------------------
 SLICER_PACKAGES_METADATA_GIT_URL = 'git@github.com:Slicer/slicer-packages-metadata'
 SLICER_EXTENSIONS_INDEX_GIT_URL = 'git://github.com/Slicer/ExtensionsIndex'
@@ -713,6 +2050,14 @@ def getPackagesMetadataDataDirectory():
 def getExtensionsIndexTopLevelDirectory():
     return os.path.join(tempfile.gettempdir(), 'slicer-extensions-index')
 
+#---------------------------------------------------------------------------
+def getExtensionsIndexBranch(slicerVersion):
+    """Return the ExtensionsIndex branch associated with ``slicerVersion``.
+    """
+    if isSlicerReleaseVersion(slicerVersion):
+        return getSlicerMajorMinorVersion(slicerVersion)
+    return 'master'
+
 #---------------------------------------------------------------------------
 def getModuleLinks(wikiName, modulesMetadata, slicerVersion=None):
     moduleLinks = \
@@ -721,6 +2066,7 @@ def getModuleLinks(wikiName, modulesMetadata, slicerVersion=None):
     return moduleLinks
 
 #---------------------------------------------------------------------------
+@profiled('directory-scan')
 def getExtensionLauncherAdditionalSettingsFromBuildDirs(slicerExtensionsIndexBuildDir):
     launcherSettingsFiles = []
     for dirname in os.listdir(slicerExtensionsIndexBuildDir):
@@ -779,21 +2125,84 @@ def writeLauncherAdditionalSettings(outputSettingsFile, configs):
             _writeSection()
             fileContents.write('\n')
 
+#---------------------------------------------------------------------------
+def dedupeLauncherSettings(configs):
+    """Return a copy of ``configs`` where paths are normalized, only the first
+    occurrence of each path is kept and directories that do not exist are
+    removed.
+
+    Paths using launcher placeholders (e.g ``<APPLAUNCHER_DIR>``) are only
+    deduplicated.
+
+    :returns: Tuple ``(configs, duplicateCount, missingCount)``.
+    """
+    deduped = {}
+    duplicateCount = 0
+    missingCount = 0
+    for section in configs:
+        deduped[section] = []
+        seen = set()
+        for path in configs[section]:
+            hasPlaceholder = '<' in path
+            if not hasPlaceholder:
+                path = os.path.normpath(path)
+            key = os.path.normcase(path)
+            if key in seen:
+                duplicateCount += 1
+                continue
+            seen.add(key)
+            if not hasPlaceholder and not os.path.isdir(path):
+                missingCount += 1
+                continue
+            deduped[section].append(path)
+    return (deduped, duplicateCount, missingCount)
+
+#---------------------------------------------------------------------------
+def _launcherSettingsFilesState(settingsFiles):
+    state = []
+    for settingsFile in sorted(settingsFiles):
+        stat = os.stat(settingsFile)
+        state.append([settingsFile, stat.st_mtime, stat.st_size])
+    return state
+
 #---------------------------------------------------------------------------
 def mergeExtensionsLauncherAdditionalSettings(slicerExtensionsIndexBuildDir):
+    """Merge the launcher additional settings of all extensions into a single
+    file and return its path. See :func:`dedupeLauncherSettings`
+
+    The merged file is only regenerated if one of the extension settings files
+    was added, removed or modified since it was last written.
+    """
 
     mergedSettingsFile = getPackagesMetadataTopLevelDirectory() + "AdditionalLauncherSettings.ini"
+    stateFile = mergedSettingsFile + ".inputs.json"
+
+    settingsFiles = getExtensionLauncherAdditionalSettingsFromBuildDirs(slicerExtensionsIndexBuildDir)
+    state = _launcherSettingsFilesState(settingsFiles)
+    if os.path.exists(mergedSettingsFile) and os.path.exists(stateFile):
+        with open(stateFile) as fileContents:
+            if json.load(fileContents) == state:
+                print("\nReusing {0}".format(mergedSettingsFile))
+                return mergedSettingsFile
+
     print("\nCreating {0}".format(mergedSettingsFile))
 
     # Read extension launcher additional settings
-    settingsFiles = getExtensionLauncherAdditionalSettingsFromBuildDirs(slicerExtensionsIndexBuildDir)
     configs = {}
     for settingsFile in settingsFiles:
         readAdditionalLauncherSettings(settingsFile, configs)
 
+    (configs, duplicateCount, missingCount) = dedupeLauncherSettings(configs)
+    incrementProfileCounter('launcher-settings-entries-removed', duplicateCount + missingCount)
+    print("\nRemoved {0} duplicated and {1} missing launcher settings entries".format(
+        duplicateCount, missingCount))
+
     # Write common launcher additional settings
     writeLauncherAdditionalSettings(mergedSettingsFile, configs)
 
+    with open(stateFile, 'w') as fileContents:
+        fileContents.write(json.dumps(state, indent=4))
+
     return mergedSettingsFile
 
 #---------------------------------------------------------------------------
@@ -839,29 +2248,303 @@ def runPip(args, slicerBuildDir=None):
         _runPip()
 
 #---------------------------------------------------------------------------
-def slicerLauncherPopen(launcher, args, stdout=subprocess.PIPE, stderr=subprocess.PIPE, **kwargs):
+SUBPROCESS_TAIL_LINES = 200
+SUBPROCESS_LOG_MAX_BYTES = 10 * 1024 * 1024
+SUBPROCESS_LOG_BACKUP_COUNT = 3
+
+#---------------------------------------------------------------------------
+def getSubprocessLogFilePath():
+    return os.path.join(tempfile.gettempdir(), os.path.basename(os.path.splitext(__file__)[0])+"-subprocess.log")
+
+#===========================================================================
+class RotatingLogFile(object):
+    """Thread-safe append-only log file. When the file grows larger than
+    ``maxBytes``, it is renamed with suffix ``.1`` (previous backups being
+    shifted up to ``backupCount``) and a new file is started.
+    """
+    #-----------------------------------------------------------------------
+    def __init__(self, filePath, maxBytes, backupCount):
+        self.filePath = filePath
+        self.maxBytes = maxBytes
+        self.backupCount = backupCount
+        self._lock = threading.Lock()
+        self._file = None
+        self._size = 0
+
+    #-----------------------------------------------------------------------
+    def write(self, text):
+        with self._lock:
+            if self._file is None:
+                self._open()
+            if self._size > 0 and self._size + len(text) > self.maxBytes:
+                self._rotate()
+            self._file.write(text)
+            self._size += len(text)
+
+    #-----------------------------------------------------------------------
+    def flush(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+
+    #-----------------------------------------------------------------------
+    def _open(self):
+        self._file = open(self.filePath, 'ab')
+        self._file.seek(0, os.SEEK_END)
+        self._size = self._file.tell()
+
+    #-----------------------------------------------------------------------
+    def _rotate(self):
+        self._file.close()
+        for idx in range(self.backupCount - 1, 0, -1):
+            backup = "{0}.{1}".format(self.filePath, idx)
+            if os.path.exists(backup):
+                os.rename(backup, "{0}.{1}".format(self.filePath, idx + 1))
+        if self.backupCount > 0:
+            os.rename(self.filePath, self.filePath + ".1")
+        else:
+            os.remove(self.filePath)
+        self._open()
+
+#---------------------------------------------------------------------------
+def _subprocessLog():
+    with __m.lock:
+        if __m.subprocess_log is None:
+            __m.subprocess_log = RotatingLogFile(getSubprocessLogFilePath(),
+                SUBPROCESS_LOG_MAX_BYTES, SUBPROCESS_LOG_BACKUP_COUNT)
+        return __m.subprocess_log
+
+#---------------------------------------------------------------------------
+def _logSubprocessOutput(pid, streamName, line):
+    if isinstance(line, unicode):
+        line = line.encode('utf-8')
+    if not line.endswith('\n'):
+        line += '\n'
+    _subprocessLog().write("[{0} {1}] {2}".format(pid, streamName, line))
+
+#---------------------------------------------------------------------------
+def _killProcessTree(process):
+    """Kill ``process`` and its children. On Unix, the process is expected
+    to lead its own process group. See :func:`runProcess`
+    """
+    if sys.platform == 'win32':
+        with open(os.devnull, 'w') as devnull:
+            subprocess.call(['taskkill', '/F', '/T', '/PID', str(process.pid)], stdout=devnull, stderr=devnull)
+        return
+    try:
+        os.killpg(process.pid, signal.SIGTERM)
+        deadline = time.time() + 5
+        while process.poll() is None and time.time() < deadline:
+            time.sleep(0.1)
+        os.killpg(process.pid, signal.SIGKILL)
+    except OSError as e:
+        if e.errno != errno.ESRCH:
+            raise
+
+#===========================================================================
+class ProcessResult(object):
+    """Result of :func:`runProcess`.
+
+    ``stdout`` and ``stderr`` only contain the last lines written by the
+    process, the complete output is available in the subprocess log file.
+    """
+    #-----------------------------------------------------------------------
+    def __init__(self, args, returncode, duration, stdout, stderr, timedOut):
+        self.args = args
+        self.returncode = returncode
+        self.duration = duration
+        self.stdout = stdout
+        self.stderr = stderr
+        self.timedOut = timedOut
+
+#---------------------------------------------------------------------------
+def runProcess(args, timeout=None, tailLines=SUBPROCESS_TAIL_LINES, **kwargs):
+    """Run ``args`` and return a :class:`ProcessResult`.
+
+    Standard output and error are drained as they arrive by dedicated threads.
+    Each line is appended to the rotating log file returned by
+    :func:`getSubprocessLogFilePath` and only the last ``tailLines`` lines
+    of each stream are kept in memory.
+
+    If the process does not complete within ``timeout`` seconds, the process
+    and its children are killed.
+    """
+    if sys.platform == 'win32':
+        kwargs.setdefault('creationflags', subprocess.CREATE_NEW_PROCESS_GROUP)
+    else:
+        kwargs.setdefault('preexec_fn', os.setsid)
+    start = time.time()
+    process = subprocess.Popen(args, bufsize=-1, stdout=subprocess.PIPE, stderr=subprocess.PIPE, **kwargs)
+    _logSubprocessOutput(process.pid, 'start', "{0} {1}".format(
+        datetime.datetime.now().isoformat(), " ".join(args)))
+
+    tails = {}
+    def _drain(streamName, stream):
+        tail = tails[streamName] = collections.deque(maxlen=tailLines)
+        # Read bounded chunks so that output without newline does not accumulate
+        for line in iter(lambda: stream.readline(8192), ''):
+            tail.append(line)
+            _logSubprocessOutput(process.pid, streamName, line)
+        stream.close()
+    threads = [threading.Thread(target=_drain, args=(streamName, getattr(process, streamName)))
+               for streamName in ['stdout', 'stderr']]
+    for thread in threads:
+        thread.daemon = True
+        thread.start()
+
+    state = {'timedOut': False}
+    def _timeout():
+        state['timedOut'] = True
+        _killProcessTree(process)
+    timer = None
+    if timeout is not None:
+        timer = threading.Timer(timeout, _timeout)
+        timer.daemon = True
+        timer.start()
+    returncode = process.wait()
+    if timer is not None:
+        timer.cancel()
+    for thread in threads:
+        thread.join()
+    duration = time.time() - start
+    _logSubprocessOutput(process.pid, 'exit', "code {0} after {1:.2f}s{2}".format(
+        returncode, duration, " (timed out)" if state['timedOut'] else ""))
+    _subprocessLog().flush()
+
+    return ProcessResult(args, returncode, duration,
+        "".join(tails['stdout']), "".join(tails['stderr']), state['timedOut'])
+
+#---------------------------------------------------------------------------
+def _printProcessOutputTail(result, lines=20):
+    for (streamName, output) in [('stdout', result.stdout), ('stderr', result.stderr)]:
+        tail = output.splitlines()[-lines:]
+        if tail:
+            print("\nLast {0} line(s) of {1}:\n  {2}".format(len(tail), streamName, "\n  ".join(tail)))
+    print("\nSee '{0}' for the complete output".format(getSubprocessLogFilePath()))
+
+#---------------------------------------------------------------------------
+@profiled('subprocess')
+def slicerLauncherPopen(launcher, args, timeout=None, **kwargs):
+    """Run ``launcher`` with ``args`` using :func:`runProcess` and return
+    the corresponding :class:`ProcessResult`.
+
+    If ``timeout`` is not specified, the cache entry ``slicer-launch-timeout``
+    is used. A :class:`RuntimeError` is raised if the process fails or
+    times out.
+    """
     if launcher is None:
         args.pop(0) # Ignore '--launch' argument
         print("\nStarting {0}".format(" \\\n  ".join(args)))
     else:
         print("\nStarting {0} {1}".format(launcher, " \\\n  ".join(args)))
-    p = subprocess.Popen([launcher] + args, stdout=stdout, stderr=stderr, **kwargs)
-    ec = p.wait()
-    if ec:
-        raise RuntimeError, "Calling {0} failed (exit code {1})".format(launcher, ec)
-    return p
+    if timeout is None:
+        timeout = cacheEntry("slicer-launch-timeout")
+    incrementProfileCounter('subprocess-launches')
+    result = runProcess([launcher] + args, timeout=timeout, **kwargs)
+    if result.timedOut:
+        _printProcessOutputTail(result)
+        raise RuntimeError, "Calling {0} timed out after {1}s".format(launcher, timeout)
+    if result.returncode:
+        _printProcessOutputTail(result)
+        raise RuntimeError, "Calling {0} failed (exit code {1})".format(launcher, result.returncode)
+    return result
+
+#---------------------------------------------------------------------------
+def getSlicerVersionsFilePath():
+    return os.path.join(tempfile.gettempdir(), os.path.basename(os.path.splitext(__file__)[0])+"-slicer-versions.json")
+
+#---------------------------------------------------------------------------
+def readSlicerVersionFromBuildDir(slicerBuildDir):
+    """Return the Slicer version read from the version header or the CMake
+    cache of ``slicerBuildDir``. Return None if it can not be found.
+    """
+    candidates = [
+        (os.path.join(slicerBuildDir, 'Base', 'QTCore', 'vtkSlicerVersionConfigure.h'),
+         r'^#define\s+Slicer_VERSION_FULL\s+"([^"]+)"'),
+        (os.path.join(slicerBuildDir, 'CMakeCache.txt'),
+         r'^Slicer_VERSION_FULL:\w+=(.+)$')
+        ]
+    for (filePath, pattern) in candidates:
+        if not os.path.exists(filePath):
+            continue
+        with open(filePath) as fileContents:
+            match = re.search(pattern, fileContents.read(), flags=re.MULTILINE)
+        if match:
+            return "Slicer {0}".format(match.group(1).strip())
+    return None
+
+#---------------------------------------------------------------------------
+def _slicerVersionKey(slicerBuildDir):
+    launcher = getSlicerLauncher(slicerBuildDir)
+    if launcher is None:
+        return None
+    key = []
+    for filePath in [launcher, os.path.join(slicerBuildDir, 'SlicerLauncherSettings.ini')]:
+        if os.path.exists(filePath):
+            stat = os.stat(filePath)
+            key.append("{0}:{1}:{2}".format(os.path.realpath(filePath), stat.st_mtime, stat.st_size))
+    return ";".join(key)
+
+#---------------------------------------------------------------------------
+def _slicerVersions():
+    with __m.lock:
+        if __m.slicer_versions is None:
+            __m.slicer_versions = {}
+            if os.path.exists(getSlicerVersionsFilePath()):
+                try:
+                    with open(getSlicerVersionsFilePath()) as fileContents:
+                        __m.slicer_versions = json.load(fileContents)
+                except (IOError, ValueError) as e:
+                    print("\nIgnoring '{0}': {1}".format(getSlicerVersionsFilePath(), e))
+        return __m.slicer_versions
 
 #---------------------------------------------------------------------------
 def getSlicerVersion(slicerBuildDir):
-    p = slicerLauncherPopen(getSlicerLauncher(slicerBuildDir), ['--version'])
-    if p is None:
-        return None
-    version = p.stdout.read().strip() # Slicer X.Y.Z[-YYYY-MM-DD]
+    """Return the version of Slicer built in ``slicerBuildDir``. For
+    example ``Slicer X.Y.Z[-YYYY-MM-DD]``.
+
+    The version is read from the build tree if possible, otherwise the Slicer
+    launcher is started with ``--version``. Versions reported by the launcher
+    are memoized and saved into :func:`getSlicerVersionsFilePath`, they are
+    associated with the path, modification time and size of the launcher
+    and of its settings file.
+    """
+    version = readSlicerVersionFromBuildDir(slicerBuildDir)
+    if version is None:
+        version = _getSlicerVersionFromLauncher(slicerBuildDir)
+        if version is None:
+            return None
 
     print("\nAuto-discovered version is '{0}' [major.minor:{1}, release:{2}]".format(
         version,
         getSlicerMajorMinorVersion(version),
         isSlicerReleaseVersion(version)))
+
+    return version
+
+#---------------------------------------------------------------------------
+def _getSlicerVersionFromLauncher(slicerBuildDir):
+    key = _slicerVersionKey(slicerBuildDir)
+    versions = _slicerVersions()
+    with __m.lock:
+        if key is not None and key in versions:
+            incrementProfileCounter('slicer-version-cache-hits')
+            return versions[key]
+
+    p = slicerLauncherPopen(getSlicerLauncher(slicerBuildDir), ['--version'])
+    if p is None:
+        return None
+    version = p.stdout.strip() # Slicer X.Y.Z[-YYYY-MM-DD]
+
+    if key is None:
+        return version
+    with __m.lock:
+        versions[key] = version
+        try:
+            _writeFileAtomically(getSlicerVersionsFilePath(),
+                json.dumps(versions, sort_keys=True, indent=4))
+        except (IOError, OSError) as e:
+            print("\nFailed to save '{0}': {1}".format(getSlicerVersionsFilePath(), e))
     return version
 
 #---------------------------------------------------------------------------
@@ -889,6 +2572,7 @@ def isSlicerReleaseVersion(slicerVersion):
     return re.match(r'^Slicer \d\.\d(\.\d(\-\d)?)?$', slicerVersion) is not None
 
 #---------------------------------------------------------------------------
+@profiled('directory-scan')
 def getModuleDirectories(basePath, slicerMajorMinorVersion):
     """Recursively walk ``basepath`` directory and return the list of directory expected
     to contain cli, scripted or loadable modules.
@@ -1005,6 +2689,7 @@ def getModuleNamesByType(modulePaths):
     return results
 
 #---------------------------------------------------------------------------
+@profiled('directory-scan')
 def getBuiltinModulesFromBuildDir(slicerBuildDir, slicerMajorMinorVersion=None):
     """Return list of Slicer built-in module.
     """
@@ -1013,6 +2698,7 @@ def getBuiltinModulesFromBuildDir(slicerBuildDir, slicerMajorMinorVersion=None):
     return getModuleNamesByType(getModuleDirectories(slicerBuildDir, slicerMajorMinorVersion))
 
 #---------------------------------------------------------------------------
+@profiled('directory-scan')
 def getExtensionModuleDirectoriesFromBuildDirs(slicerBuildDir, slicerExtensionsIndexBuildDir, slicerMajorMinorVersion=None):
     """Return a dictionnary of extension names with corresponding module directories.
     """
@@ -1028,6 +2714,7 @@ def getExtensionModuleDirectoriesFromBuildDirs(slicerBuildDir, slicerExtensionsI
     return data
 
 #---------------------------------------------------------------------------
+@profiled('directory-scan')
 def getExtensionModulesFromBuildDirs(slicerBuildDir, slicerExtensionsIndexBuildDir, slicerMajorMinorVersion=None):
     """Return a dictionnary of extension names with corresponding module names.
 
@@ -1079,13 +2766,81 @@ def outputFilePath(path, prefix, system=None, slicerVersion=None, withDate=False
     return os.path.join(path, fileName)
 
 #---------------------------------------------------------------------------
-def save(filePath, dictionnary):
-    """Save dictionnary as a json file`
+def canonicalMetadata(value, sortLists=False):
+    """Return a copy of ``value`` where lists of strings are sorted if
+    ``sortLists`` is True.
+
+    Lists whose order is meaningful (e.g module contributors) should be
+    saved with ``sortLists=False``.
     """
-    with codecs.open(filePath, 'w', 'utf-8') as fileContents:
-        fileContents.write(
-            json.dumps(dictionnary, sort_keys=True, indent=4))
+    if isinstance(value, dict):
+        return {key: canonicalMetadata(item, sortLists) for key, item in value.iteritems()}
+    if isinstance(value, (list, tuple)):
+        items = [canonicalMetadata(item, sortLists) for item in value]
+        if sortLists and all(isinstance(item, basestring) for item in items):
+            items.sort()
+        return items
+    return value
+
+#---------------------------------------------------------------------------
+def _updateGzipSidecar(filePath, content):
+    """Write ``content`` compressed into ``<filePath>.gz`` unless it already
+    contains the same data. If ``content`` is None, ``<filePath>.gz`` is
+    removed.
+
+    The timestamp and file name are omitted from the gzip header so that
+    identical contents give identical files.
+    """
+    gzipFilePath = filePath + '.gz'
+    if content is None:
+        if os.path.exists(gzipFilePath):
+            os.remove(gzipFilePath)
+            print("\nRemoved '{}'".format(gzipFilePath))
+        return
+    buffer_ = io.BytesIO()
+    gzipFile = gzip.GzipFile(filename='', mode='wb', fileobj=buffer_, mtime=0)
+    try:
+        gzipFile.write(content)
+    finally:
+        gzipFile.close()
+    if os.path.exists(gzipFilePath):
+        with open(gzipFilePath, 'rb') as fileContents:
+            if fileContents.read() == buffer_.getvalue():
+                return
+    _writeFileAtomically(gzipFilePath, buffer_.getvalue())
+    print("\nSaved '{}'".format(gzipFilePath))
+
+#---------------------------------------------------------------------------
+def save(filePath, dictionnary, sortLists=False):
+    """Save dictionnary as a json file.
+
+    The file is written atomically. If it already exists and contains
+    the same data, it is left untouched.
+
+    If the json content is larger than the ``metadata-gzip-threshold`` cache
+    entry, a compressed copy is also saved into ``<filePath>.gz``. Otherwise,
+    an existing compressed copy is removed.
+
+    See :func:`canonicalMetadata`
+    """
+    data = canonicalMetadata(dictionnary, sortLists)
+    content = json.dumps(data, sort_keys=True, indent=4).encode('utf-8')
+    gzipThreshold = cacheEntry("metadata-gzip-threshold")
+    withGzip = gzipThreshold is not None and len(content) >= gzipThreshold
+    if os.path.exists(filePath):
+        try:
+            with codecs.open(filePath, 'r', 'utf-8') as fileContents:
+                unchanged = json.load(fileContents) == json.loads(content)
+        except ValueError:
+            unchanged = False
+        if unchanged:
+            incrementProfileCounter('metadata-files-unchanged')
+            print("\nUnchanged '{}'".format(filePath))
+            _updateGzipSidecar(filePath, content if withGzip else None)
+            return filePath
+    _writeFileAtomically(filePath, content)
     print("\nSaved '{}'".format(filePath))
+    _updateGzipSidecar(filePath, content if withGzip else None)
     return filePath
 
 #---------------------------------------------------------------------------
@@ -1109,26 +2864,179 @@ def getLoadedModulesMetadata():
         metadata[moduleName] = getLoadedModuleMetadata(moduleManager.module(moduleName))
     return metadata
 
+#---------------------------------------------------------------------------
+def getResidentMemorySize():
+    """Return the current resident memory size of the current process in
+    bytes or None if it can not be determined.
+
+    On platforms without ``/proc`` other than Windows, ``psutil`` is used
+    if it is available.
+    """
+    try:
+        with open('/proc/self/statm') as fileContents:
+            return int(fileContents.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (IOError, OSError, ValueError):
+        pass
+    if sys.platform == 'win32':
+        import ctypes
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [('cb', ctypes.c_ulong),
+                        ('PageFaultCount', ctypes.c_ulong),
+                        ('PeakWorkingSetSize', ctypes.c_size_t),
+                        ('WorkingSetSize', ctypes.c_size_t),
+                        ('QuotaPeakPagedPoolUsage', ctypes.c_size_t),
+                        ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                        ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t),
+                        ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                        ('PagefileUsage', ctypes.c_size_t),
+                        ('PeakPagefileUsage', ctypes.c_size_t)]
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        if not ctypes.windll.psapi.GetProcessMemoryInfo(
+                ctypes.windll.kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb):
+            return None
+        return counters.WorkingSetSize
+    # ru_maxrss from the resource module is the peak resident memory size,
+    # it can not be used to compute deltas.
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.Process(os.getpid()).memory_info().rss
+
+#---------------------------------------------------------------------------
+def getModulesLoadPerformance(moduleDirectories):
+    """Load the modules found in ``moduleDirectories`` one at a time using the
+    module factory manager and return a dictionnary containing, for each of
+    them, the load time in seconds and the resident memory delta in bytes.
+
+    Dependencies not already loaded are loaded along with the first module
+    requiring them and are accounted to it.
+    """
+    import qt, slicer
+    factoryManager = slicer.app.moduleManager().factoryManager()
+    registeredModuleNames = set(factoryManager.registeredModuleNames())
+    for directory in moduleDirectories:
+        if not os.path.isdir(directory):
+            continue
+        for fileName in sorted(os.listdir(directory)):
+            filePath = os.path.join(directory, fileName)
+            if os.path.isfile(filePath):
+                factoryManager.registerModule(qt.QFileInfo(filePath))
+    factoryManager.instantiateModules()
+    modulesPerformance = {}
+    for moduleName in sorted(set(factoryManager.registeredModuleNames()) - registeredModuleNames):
+        if moduleName in factoryManager.loadedModuleNames():
+            continue
+        memoryBefore = getResidentMemorySize()
+        start = time.time()
+        if not factoryManager.loadModules([moduleName]):
+            print("Failed to load module {0}".format(moduleName))
+            continue
+        loadTime = time.time() - start
+        memoryAfter = getResidentMemorySize()
+        memoryDelta = None
+        if memoryBefore is not None and memoryAfter is not None:
+            memoryDelta = memoryAfter - memoryBefore
+        modulesPerformance[moduleName] = {'loadTime': loadTime, 'memoryDelta': memoryDelta}
+    return modulesPerformance
+
+#---------------------------------------------------------------------------
+def getModulesPerformance(moduleDirectories, launchTime=None):
+    """Return a dictionnary containing the load time and memory delta of the
+    modules found in ``moduleDirectories`` along with the startup wall time
+    and the resident memory size once they are loaded.
+
+    ``launchTime`` is the time at which Slicer was launched, it is required
+    to report the startup wall time.
+
+    See :func:`getModulesLoadPerformance`
+    """
+    performance = {}
+    performance['modules'] = getModulesLoadPerformance(moduleDirectories)
+    if launchTime is not None:
+        performance['startupTime'] = time.time() - launchTime
+    performance['residentMemory'] = getResidentMemorySize()
+    return performance
+
+#---------------------------------------------------------------------------
+def getExtensionsPerformance(modulesPerformance, extensionModules):
+    """Return a dictionnary containing the load time and memory delta of
+    each extension, computed by summing the values of its modules.
+
+    See :func:`getModulesPerformance` and :func:`getExtensionModulesFromBuildDirs`
+    """
+    extensionsPerformance = {}
+    for (moduleName, extensionName) in getModuleExtensions(extensionModules).iteritems():
+        if moduleName not in modulesPerformance:
+            continue
+        extension = extensionsPerformance.setdefault(extensionName,
+            {'loadTime': 0.0, 'memoryDelta': 0, 'modules': 0})
+        extension['loadTime'] += modulesPerformance[moduleName]['loadTime']
+        extension['memoryDelta'] += modulesPerformance[moduleName]['memoryDelta'] or 0
+        extension['modules'] += 1
+    return extensionsPerformance
+
 #---------------------------------------------------------------------------
 def getModulesMetadataFilePath(slicerVersion, system=None):
     return outputFilePath(getPackagesMetadataDataDirectory(),
         'slicer-modules-metadata', system=system, slicerVersion=slicerVersion)
 
 #---------------------------------------------------------------------------
-def saveLoadedModulesMetadata(slicerVersion):
+def getModulesPerformanceFilePath(slicerVersion, system=None):
+    return outputFilePath(getPackagesMetadataDataDirectory(),
+        'slicer-modules-performance', system=system, slicerVersion=slicerVersion)
+
+#---------------------------------------------------------------------------
+def saveLoadedModulesMetadata(slicerVersion, filePath=None):
     """Save metadata associated with modules loaded in Slicer.
+
+    If ``filePath`` is not specified, data are saved into the file returned
+    by :func:`getModulesMetadataFilePath`.
     """
 
     if not slicerVersion:
         raise RuntimeError, "slicerVersion parameter is required"
 
-    save(getModulesMetadataFilePath(slicerVersion), getLoadedModulesMetadata())
+    if filePath is None:
+        filePath = getModulesMetadataFilePath(slicerVersion)
+
+    save(filePath, getLoadedModulesMetadata())
 
     slicer.app.quit()
 
 #---------------------------------------------------------------------------
 def _saveLoadedModulesMetadata(args):
-    saveLoadedModulesMetadata(slicerVersion=args.slicer_version)
+    saveLoadedModulesMetadata(slicerVersion=args.slicer_version,
+        filePath=args.output_file)
+
+#---------------------------------------------------------------------------
+def saveModulesPerformance(slicerVersion, moduleDirectories, filePath=None, launchTime=None):
+    """Load the modules found in ``moduleDirectories`` and save their load
+    time and memory measurements.
+
+    If ``filePath`` is not specified, data are saved into the file returned
+    by :func:`getModulesPerformanceFilePath`.
+
+    See :func:`getModulesPerformance`
+    """
+
+    if not slicerVersion:
+        raise RuntimeError, "slicerVersion parameter is required"
+
+    if filePath is None:
+        filePath = getModulesPerformanceFilePath(slicerVersion)
+
+    save(filePath, getModulesPerformance(moduleDirectories, launchTime))
+
+    slicer.app.quit()
+
+#---------------------------------------------------------------------------
+def _saveModulesPerformance(args):
+    saveModulesPerformance(slicerVersion=args.slicer_version,
+        moduleDirectories=args.module_paths,
+        filePath=args.output_file,
+        launchTime=args.launch_time)
 
 #---------------------------------------------------------------------------
 def getExtensionModulesFilePath(slicerVersion, system=None):
@@ -1170,9 +3078,205 @@ def getModuleExtensions(extensionModules):
 #                                         'moduleType' : moduleType }
 #     return modules
 
+#---------------------------------------------------------------------------
+def _getSlicerScriptLauncherArgs(mergedSettingsFile, command, slicerVersion, outputFile):
+    launcherArgs = []
+    if mergedSettingsFile is not None:
+        launcherArgs.append('--launcher-additional-settings')
+        launcherArgs.append(mergedSettingsFile)
+
+    launcherArgs.append('--ignore-slicerrc')
+    # 2017-04-18 (Jc): Starting without mainwindow is not supported by some extensions
+    #                  and causes Slicer to crash.
+    # launcherArgs.append('--no-main-window')
+    launcherArgs.append('--python-script')
+    launcherArgs.append(os.path.realpath(__file__))
+    launcherArgs.append(command)
+    launcherArgs.append('--slicer-version')
+    launcherArgs.append(slicerVersion)
+    if outputFile is not None:
+        launcherArgs.append('--output-file')
+        launcherArgs.append(outputFile)
+
+    return launcherArgs
+
+#---------------------------------------------------------------------------
+def getSaveLoadedModulesMetadataLauncherArgs(mergedSettingsFile, slicerVersion,
+        moduleDirectories, outputFile=None):
+    """Return the launcher arguments allowing to start Slicer, load the modules
+    found in ``moduleDirectories`` and save the metadata of all loaded modules.
+
+    See :func:`saveLoadedModulesMetadata`
+    """
+    launcherArgs = _getSlicerScriptLauncherArgs(
+        mergedSettingsFile, 'save-loaded-modules-metadata', slicerVersion, outputFile)
+
+    if len(moduleDirectories) > 0:
+        launcherArgs.append('--additional-module-paths')
+        launcherArgs.extend(moduleDirectories)
+
+    return launcherArgs
+
+#---------------------------------------------------------------------------
+def getSaveModulesPerformanceLauncherArgs(mergedSettingsFile, slicerVersion,
+        moduleDirectories, outputFile=None, loadAtStartup=False):
+    """Return the launcher arguments allowing to start Slicer and save the
+    load time and memory measurements of the modules found in
+    ``moduleDirectories``.
+
+    If ``loadAtStartup`` is True, modules are loaded by Slicer at startup
+    and only the startup wall time and resident memory are reported.
+
+    If ``mergedSettingsFile`` is None, Slicer is started without additional
+    launcher settings.
+
+    The launch time passed to Slicer is the current time, arguments are
+    expected to be used right away.
+
+    See :func:`saveModulesPerformance`
+    """
+    launcherArgs = _getSlicerScriptLauncherArgs(
+        mergedSettingsFile, 'save-modules-performance', slicerVersion, outputFile)
+    launcherArgs.append('--launch-time')
+    launcherArgs.append(repr(time.time()))
+
+    if len(moduleDirectories) > 0 and not loadAtStartup:
+        launcherArgs.append('--module-paths')
+        launcherArgs.extend(moduleDirectories)
+
+    if len(moduleDirectories) > 0 and loadAtStartup:
+        launcherArgs.append('--additional-module-paths')
+        launcherArgs.extend(moduleDirectories)
+
+    return launcherArgs
+
+#---------------------------------------------------------------------------
+def measureModulesPerformance(launcher, mergedSettingsFile, slicerVersion, moduleDirectories):
+    """Start Slicer, load the modules found in ``moduleDirectories`` one at a
+    time and return their load time and memory measurements.
+
+    The measurement is best-effort: if Slicer fails or does not report
+    measurements, a message is printed and None is returned.
+
+    See :func:`getModulesPerformance`
+    """
+    workDir = tempfile.mkdtemp(prefix='slicer-modules-performance-')
+    try:
+        performanceFile = os.path.join(workDir, 'performance.json')
+        launcherArgs = getSaveModulesPerformanceLauncherArgs(
+            mergedSettingsFile, slicerVersion, moduleDirectories, outputFile=performanceFile)
+        with profileTimer('slicer-launch'):
+            slicerLauncherPopen(launcher, launcherArgs)
+        with codecs.open(performanceFile, 'r', 'utf-8') as fileContents:
+            return json.load(fileContents)
+    except (RuntimeError, IOError, ValueError) as e:
+        print("\nSkipping modules performance measurement: {0}".format(e))
+        return None
+    finally:
+        shutil.rmtree(workDir, ignore_errors=True)
+
+#---------------------------------------------------------------------------
+def saveLoadedModulesMetadataInShards(launcher, mergedSettingsFile, slicerVersion,
+        extensionModuleDirectories, shards=4):
+    """Start ``shards`` Slicer instances concurrently, each one loading the modules
+    of a subset of the extensions, and merge the metadata they saved.
+
+    ``extensionModuleDirectories`` maps extension names to their module
+    directories. If a Slicer instance fails, its extensions are bisected
+    until the extensions that can not be loaded are isolated. Metadata of
+    all other extensions are kept.
+
+    Slicer is first started once without extensions. If it fails, the
+    problem is not caused by an extension and a RuntimeError is raised
+    instead of bisecting.
+
+    :returns: Tuple ``(metadata, failedExtensions)``.
+    """
+    partialDir = tempfile.mkdtemp(prefix='slicer-modules-metadata-')
+    try:
+        return _saveLoadedModulesMetadataInShards(partialDir, launcher, mergedSettingsFile,
+            slicerVersion, extensionModuleDirectories, shards)
+    finally:
+        shutil.rmtree(partialDir, ignore_errors=True)
+
+#---------------------------------------------------------------------------
+def _saveLoadedModulesMetadataInShards(partialDir, launcher, mergedSettingsFile, slicerVersion,
+        extensionModuleDirectories, shards):
+    partialFileCount = itertools.count()
+
+    #-----------------------------------------------------------------------
+    def _load(extensionNames):
+        with __m.lock:
+            partialFile = os.path.join(partialDir, 'partial-{0:04d}.json'.format(next(partialFileCount)))
+        moduleDirectories = [directory for name in extensionNames
+                             for directory in extensionModuleDirectories[name]]
+        launcherArgs = getSaveLoadedModulesMetadataLauncherArgs(
+            mergedSettingsFile, slicerVersion, moduleDirectories, outputFile=partialFile)
+        try:
+            with profileTimer('slicer-launch'):
+                slicerLauncherPopen(launcher, launcherArgs)
+            if not os.path.exists(partialFile):
+                raise RuntimeError, "Slicer exited without saving '{0}'".format(partialFile)
+        except RuntimeError as e:
+            if not extensionNames:
+                raise
+            if len(extensionNames) == 1:
+                print("\nFailed to load extension '{0}': {1}".format(extensionNames[0], e))
+                return ([], list(extensionNames))
+            half = len(extensionNames) / 2
+            print("\nFailed to load {0} extensions, bisecting: {1}".format(len(extensionNames), e))
+            (firstFiles, firstFailures) = _load(extensionNames[:half])
+            (secondFiles, secondFailures) = _load(extensionNames[half:])
+            return (firstFiles + secondFiles, firstFailures + secondFailures)
+        return ([partialFile], [])
+
+    print("\nStarting Slicer without extensions")
+    try:
+        _load([])
+    except RuntimeError as e:
+        # Not caused by an extension, bisecting would start Slicer about
+        # twice per extension
+        raise RuntimeError, "Failed to start Slicer without extensions: {0}".format(e)
+
+    names = sorted(extensionModuleDirectories)
+    shards = max(1, min(shards, len(names)))
+    stages = [createStage('slicer-shard-{0}'.format(idx),
+                          lambda results, extensionNames=names[idx::shards]: _load(extensionNames))
+              for idx in range(shards)]
+    (results, timings) = runStages(stages, maxWorkers=shards)
+    recordProfileStageTimings(timings)
+
+    partialFiles = []
+    failedExtensions = []
+    for (name, (files, failures)) in sorted(results.iteritems()):
+        partialFiles.extend(files)
+        failedExtensions.extend(failures)
+
+    if not partialFiles:
+        raise RuntimeError, "Failed to save loaded modules metadata: no Slicer instance succeeded"
+
+    #-----------------------------------------------------------------------
+    def _readJson(filePath):
+        with codecs.open(filePath, 'r', 'utf-8') as fileContents:
+            return json.load(fileContents)
+
+    # Every instance reports the built-in modules. The entry of the first
+    # instance is kept as is, the order of the contributors and categories
+    # matters.
+    metadata = {}
+    for partialFile in partialFiles:
+        for (moduleName, moduleMetadata) in _readJson(partialFile).iteritems():
+            if moduleName not in metadata:
+                metadata[moduleName] = moduleMetadata
+            elif metadata[moduleName] != moduleMetadata:
+                raise RuntimeError, "Conflicting metadata for module '{0}' in '{1}'".format(
+                    moduleName, partialFile)
+
+    return (metadata, sorted(failedExtensions))
+
 #---------------------------------------------------------------------------
 def saveAllExtensionsModulesMetadata(slicerBuildDir, slicerExtensionsIndexBuildDir,
-        updateGithub=True, slicerVersion=None):
+        updateGithub=True, slicerVersion=None, shards=1):
 
     try:
         import ctk_cli
@@ -1180,68 +3284,459 @@ def saveAllExtensionsModulesMetadata(slicerBuildDir, slicerExtensionsIndexBuildD
         runPip(['install', 'ctk_cli'], slicerBuildDir=slicerBuildDir)
         import ctk_cli
 
-    if slicerVersion is None:
-        slicerVersion = getSlicerVersion(slicerBuildDir)
+    if slicerVersion is None:
+        slicerVersion = getSlicerVersion(slicerBuildDir)
+
+    slicerMajorMinorVersion = getSlicerMajorMinorVersion(slicerVersion)
+
+    # Clone repository
+    repo = cloneRepository(SLICER_PACKAGES_METADATA_GIT_URL, getPackagesMetadataTopLevelDirectory())
+
+    mergedSettingsFile = mergeExtensionsLauncherAdditionalSettings(slicerExtensionsIndexBuildDir)
+
+    extensionModuleDirectories = \
+        getExtensionModuleDirectoriesFromBuildDirs(slicerBuildDir, slicerExtensionsIndexBuildDir, slicerMajorMinorVersion)
+
+    launcher = getSlicerLauncher(slicerBuildDir)
+    if shards > 1 and len(extensionModuleDirectories) > 0:
+        (metadata, failedExtensions) = saveLoadedModulesMetadataInShards(
+            launcher, mergedSettingsFile, slicerVersion, extensionModuleDirectories, shards=shards)
+        save(getModulesMetadataFilePath(slicerVersion), metadata)
+        if failedExtensions:
+            print("\nExtensions that could not be loaded: {0}".format(", ".join(failedExtensions)))
+            for extensionName in failedExtensions:
+                del extensionModuleDirectories[extensionName]
+    else:
+        # Flatten list
+        moduleDirectories = [item for sublist in extensionModuleDirectories.values() for item in sublist]
+        launcherArgs = getSaveLoadedModulesMetadataLauncherArgs(
+            mergedSettingsFile, slicerVersion, moduleDirectories)
+        with profileTimer('slicer-launch'):
+            p = slicerLauncherPopen(launcher, launcherArgs)
+        if p is None:
+            return None
+    print("\nSaved '{0}'".format(getModulesMetadataFilePath(slicerVersion)))
+
+    data = getExtensionModulesFromBuildDirs(slicerBuildDir, slicerExtensionsIndexBuildDir, slicerMajorMinorVersion)
+    save(getExtensionModulesFilePath(slicerVersion), data, sortLists=True)
+
+    filePaths = [getModulesMetadataFilePath(slicerVersion), getExtensionModulesFilePath(slicerVersion)]
+
+    # Measure module performance in a separate Slicer instance so that
+    # metadata are published even if it fails
+    print("\nMeasuring modules performance")
+    performance = measureModulesPerformance(launcher, mergedSettingsFile, slicerVersion,
+        [item for sublist in extensionModuleDirectories.values() for item in sublist])
+    if performance is not None:
+        # Summarize module performance by extension
+        performance['extensions'] = getExtensionsPerformance(performance['modules'], data)
+        filePaths.append(save(getModulesPerformanceFilePath(slicerVersion), performance))
+
+    if updateGithub:
+        msg = ("Update modules-metadata, modules-performance and modules-by-extension listings"
+            " on {0} platform for {1}".format(platform.system(), slicerVersion))
+        publishMetadataFiles(repo, filePaths, msg)
+
+#---------------------------------------------------------------------------
+METADATA_FILE_PREFIXES = ['slicer-modules-metadata', 'slicer-modules-performance',
+                          'slicer-extension-modules', 'slicer-startup-benchmark']
+
+METADATA_PUSH_RETRIES = 3
+
+#---------------------------------------------------------------------------
+def getChangedFiles(repo, filePaths):
+    """Return the subset of ``filePaths`` that are modified or untracked in
+    the working tree of ``repo``.
+    """
+    if not filePaths:
+        return []
+    incrementProfileCounter('git-operations')
+    changed = set()
+    for line in repo.git.status('--porcelain', '--untracked-files=all', '--', *filePaths).splitlines():
+        changed.add(os.path.normcase(os.path.realpath(os.path.join(repo.working_dir, line[3:].strip('"')))))
+    return [filePath for filePath in filePaths
+            if os.path.normcase(os.path.realpath(filePath)) in changed]
+
+#---------------------------------------------------------------------------
+PUSH_FAILURE_FLAGS = (git.PushInfo.ERROR | git.PushInfo.REJECTED
+                      | git.PushInfo.REMOTE_REJECTED | git.PushInfo.REMOTE_FAILURE)
+
+@profiled('git-push')
+def pushRepository(repo, retries=METADATA_PUSH_RETRIES):
+    """Push the current branch of ``repo``. If the push is rejected because
+    the remote branch moved, local commits are rebased on top of it and the
+    push is attempted again, up to ``retries`` times.
+    """
+    origin = repo.remotes.origin
+    branch = repo.active_branch.name
+    for attempt in range(retries + 1):
+        incrementProfileCounter('git-operations')
+        try:
+            infos = origin.push(branch)
+            failures = [info.summary.strip() for info in infos if info.flags & PUSH_FAILURE_FLAGS]
+            error = "; ".join(failures) if infos else "no push information returned"
+        except git.GitCommandError as e:
+            error = str(e)
+        if not error:
+            return
+        if attempt == retries:
+            raise RuntimeError, "Failed to push '{0}' to '{1}': {2}".format(branch, origin.url, error)
+        print("\nPush of '{0}' rejected ({1}), rebasing on '{2}'".format(branch, error, origin.url))
+        incrementProfileCounter('git-push-retries')
+        incrementProfileCounter('git-operations')
+        try:
+            repo.git.pull('--rebase', 'origin', branch)
+        except git.GitCommandError:
+            excInfo = sys.exc_info()
+            # The pull may fail before the rebase starts, for example on network errors
+            if any(os.path.isdir(os.path.join(repo.git_dir, name))
+                   for name in ['rebase-merge', 'rebase-apply']):
+                repo.git.rebase('--abort')
+            raise excInfo[0], excInfo[1], excInfo[2]
+
+#---------------------------------------------------------------------------
+def publishMetadataFiles(repo, filePaths, msg):
+    """Commit ``filePaths`` into the packages metadata ``repo`` and push.
+
+    Only files that differ from the committed ones are added. If none
+    changed, no commit is created and nothing is pushed. Compressed copies
+    saved along the files are considered as well, removed ones are removed
+    from the repository.
+
+    :returns: List of committed files.
+
+    See :func:`pushRepository`
+    """
+    filePaths = getChangedFiles(repo, filePaths + [filePath + '.gz' for filePath in filePaths])
+    if not filePaths:
+        print("\nSkipping commit: metadata files are unchanged")
+        return []
+    removedFilePaths = [filePath for filePath in filePaths if not os.path.exists(filePath)]
+    if removedFilePaths:
+        repo.index.remove(removedFilePaths)
+    repo.index.add([filePath for filePath in filePaths if filePath not in removedFilePaths])
+    repo.index.commit(msg)
+    incrementProfileCounter('git-operations')
+    print("\nCommit: {0}".format(msg))
+    for filePath in filePaths:
+        print("  {0}".format(filePath))
+    pushRepository(repo)
+    print("\nPushed changed to '{0}'".format(repo.remotes.origin.url))
+    return filePaths
+
+#---------------------------------------------------------------------------
+def collectMetadataFiles(sourceDirs):
+    """Return a dictionnary mapping the names of the metadata files found in
+    ``sourceDirs`` to their path.
+
+    Directories are typically the ``metadata`` directories of the clones
+    used by each factory running ``publish-extension-module-metadata`` with
+    ``--no-github-update``. A file found in several directories must have
+    the same content.
+
+    See :data:`METADATA_FILE_PREFIXES`
+    """
+    collected = {}
+    for sourceDir in sourceDirs:
+        for prefix in METADATA_FILE_PREFIXES:
+            for filePath in sorted(glob.glob(os.path.join(sourceDir, '{0}_*.json'.format(prefix)))):
+                fileName = os.path.basename(filePath)
+                if fileName in collected:
+                    with open(collected[fileName], 'rb') as first, open(filePath, 'rb') as second:
+                        if json.load(first) != json.load(second):
+                            raise RuntimeError, "Conflicting metadata files '{0}' and '{1}'".format(
+                                collected[fileName], filePath)
+                    continue
+                collected[fileName] = filePath
+    return collected
+
+#---------------------------------------------------------------------------
+def publishCollectedMetadataFiles(sourceDirs, updateGithub=True):
+    """Copy the metadata files saved by each factory into the packages
+    metadata repository and publish them in a single commit.
+
+    See :func:`collectMetadataFiles`
+    """
+    repo = cloneRepository(SLICER_PACKAGES_METADATA_GIT_URL, getPackagesMetadataTopLevelDirectory())
+    collected = collectMetadataFiles(sourceDirs)
+    print("\nCollected {0} metadata file(s) from {1} director{2}".format(
+        len(collected), len(sourceDirs), 'y' if len(sourceDirs) == 1 else 'ies'))
+    filePaths = []
+    systems = set()
+    for fileName, sourcePath in sorted(collected.iteritems()):
+        with codecs.open(sourcePath, 'r', 'utf-8') as fileContents:
+            data = json.load(fileContents)
+        filePath = os.path.join(getPackagesMetadataDataDirectory(), fileName)
+        filePaths.append(save(filePath, data,
+            sortLists=fileName.startswith('slicer-extension-modules_')))
+        systems.update(re.findall(r'_(Linux|Darwin|Windows)(?=[_.])', fileName))
+    if not updateGithub:
+        return filePaths
+    msg = "Update metadata listings on {0} platform(s)".format(", ".join(sorted(systems)) or "unknown")
+    return publishMetadataFiles(repo, filePaths, msg)
+
+#---------------------------------------------------------------------------
+@contextlib.contextmanager
+def _profiledCommand(args, command):
+    """Context manager saving the profiling report if ``--profile`` was
+    specified, even if the command fails.
+    """
+    start = time.time()
+    try:
+        yield
+    finally:
+        if args.profile:
+            saveProfile(args.profile, command, time.time() - start)
+
+#---------------------------------------------------------------------------
+def _saveAllExtensionsModulesMetadata(args):
+
+    setCacheEntry("slicer-launch-timeout", args.timeout)
+    setCacheEntry("metadata-gzip-threshold", args.gzip_threshold)
+
+    with _profiledCommand(args, 'publish-extension-module-metadata'):
+
+        if args.slicer_version is None:
+            args.slicer_version = getSlicerVersion(args.slicer_build_dir)
+
+        saveAllExtensionsModulesMetadata(
+            args.slicer_build_dir,
+            args.slicer_extension_index_build_dir,
+            updateGithub=not args.no_github_update,
+            slicerVersion=args.slicer_version,
+            shards=args.shards)
+
+#---------------------------------------------------------------------------
+def _publishCollectedMetadataFiles(args):
+
+    setCacheEntry("metadata-gzip-threshold", args.gzip_threshold)
+
+    with _profiledCommand(args, 'publish-collected-metadata'):
+        publishCollectedMetadataFiles(
+            [os.path.expanduser(directory) for directory in args.directories],
+            updateGithub=not args.no_github_update)
+
+#---------------------------------------------------------------------------
+def _median(values):
+    values = sorted(values)
+    middle = len(values) / 2
+    if len(values) % 2:
+        return values[middle]
+    return (values[middle - 1] + values[middle]) / 2.0
+
+#---------------------------------------------------------------------------
+def _percentile(values, percent):
+    """Return the ``percent`` percentile of ``values`` using the nearest-rank method.
+    """
+    values = sorted(values)
+    rank = int(math.ceil(percent / 100.0 * len(values)))
+    return values[max(rank, 1) - 1]
+
+#---------------------------------------------------------------------------
+def measureSlicerStartup(launcher, mergedSettingsFile, slicerVersion, moduleDirectories, repeat=5):
+    """Launch Slicer ``repeat`` times loading the modules found in ``moduleDirectories``
+    and return a dictionnary summarizing the startup time distribution in seconds
+    and the resident memory in bytes.
+
+    Slicer instances are started one after the other so that they do not
+    compete for resources. If ``mergedSettingsFile`` is None, Slicer is
+    started without additional launcher settings.
+
+    See :func:`getModulesPerformance`
+    """
+    workDir = tempfile.mkdtemp(prefix='slicer-startup-benchmark-')
+    samples = []
+    residentMemory = []
+    try:
+        for idx in range(repeat):
+            performanceFile = os.path.join(workDir, 'performance-{0}.json'.format(idx))
+            launcherArgs = getSaveModulesPerformanceLauncherArgs(
+                mergedSettingsFile, slicerVersion, moduleDirectories,
+                outputFile=performanceFile, loadAtStartup=True)
+            with profileTimer('slicer-launch'):
+                slicerLauncherPopen(launcher, launcherArgs)
+            with codecs.open(performanceFile, 'r', 'utf-8') as fileContents:
+                performance = json.load(fileContents)
+            samples.append(performance['startupTime'])
+            if performance.get('residentMemory') is not None:
+                residentMemory.append(performance['residentMemory'])
+    finally:
+        shutil.rmtree(workDir)
+    summary = {
+        'samples': samples,
+        'median': _median(samples),
+        'p95': _percentile(samples, 95)
+        }
+    if residentMemory:
+        summary['residentMemory'] = _median(residentMemory)
+    return summary
+
+#---------------------------------------------------------------------------
+def getStartupBenchmarkFiles(slicerVersion, system=None):
+    """Return the startup benchmark files associated with ``slicerVersion``
+    and ``system`` sorted from the oldest to the most recent.
+
+    See :func:`benchmarkSlicerStartup`
+    """
+    if system is None:
+        system = platform.system()
+    pattern = 'slicer-startup-benchmark_{0}_{1}_*.json'.format(
+        getSlicerReleaseIdentifier(slicerVersion), system)
+    return sorted(glob.glob(os.path.join(getPackagesMetadataDataDirectory(), pattern)))
+
+#---------------------------------------------------------------------------
+def benchmarkSlicerStartup(slicerBuildDir, slicerExtensionsIndexBuildDir,
+        repeat=5, eachExtension=False, updateGithub=True, slicerVersion=None):
+    """Measure the Slicer startup time without extensions, with all extensions
+    and optionally with each extension alone.
+
+    Results are saved in the packages metadata repository as a dated and
+    per-platform file. See :func:`compareStartupBenchmarks`
+    """
+
+    if slicerVersion is None:
+        slicerVersion = getSlicerVersion(slicerBuildDir)
+
+    slicerMajorMinorVersion = getSlicerMajorMinorVersion(slicerVersion)
+
+    # Clone repository
+    repo = cloneRepository(SLICER_PACKAGES_METADATA_GIT_URL, getPackagesMetadataTopLevelDirectory())
+
+    mergedSettingsFile = mergeExtensionsLauncherAdditionalSettings(slicerExtensionsIndexBuildDir)
+
+    extensionModuleDirectories = \
+        getExtensionModuleDirectoriesFromBuildDirs(slicerBuildDir, slicerExtensionsIndexBuildDir, slicerMajorMinorVersion)
+
+    launcher = getSlicerLauncher(slicerBuildDir)
+
+    def _measure(description, moduleDirectories, settingsFile=mergedSettingsFile):
+        print("\nMeasuring startup time ({0}): {1} launch(es)".format(description, repeat))
+        return measureSlicerStartup(launcher, settingsFile, slicerVersion, moduleDirectories, repeat=repeat)
+
+    results = {
+        'date': datetime.date.today().isoformat(),
+        'platform': platform.system(),
+        'slicerVersion': slicerVersion,
+        'repeat': repeat,
+        # Extension launcher settings add library and python paths that
+        # slow down the startup, they are not used for the baseline
+        'baseline': _measure('no extensions', [], settingsFile=None),
+        'all': _measure('all extensions',
+            [item for sublist in extensionModuleDirectories.values() for item in sublist])
+        }
+
+    if eachExtension:
+        results['extensions'] = {}
+        for extensionName in sorted(extensionModuleDirectories):
+            try:
+                results['extensions'][extensionName] = _measure(
+                    "extension '{0}'".format(extensionName), extensionModuleDirectories[extensionName])
+            except RuntimeError as e:
+                print("\nFailed to measure startup time with extension '{0}': {1}".format(extensionName, e))
+                results['extensions'][extensionName] = {'error': str(e)}
+
+    filePath = save(outputFilePath(getPackagesMetadataDataDirectory(),
+        'slicer-startup-benchmark', slicerVersion=slicerVersion, withDate=True), results)
+
+    if updateGithub:
+        msg = ("Update startup benchmark on {0} platform for {1}".format(platform.system(), slicerVersion))
+        publishMetadataFiles(repo, [filePath], msg)
+
+    return results
+
+#---------------------------------------------------------------------------
+def getStartupCosts(results):
+    """Return a dictionnary mapping ``baseline`` to the median startup time
+    and ``all extensions`` as well as each extension name to the median
+    startup time increase relative to the baseline.
+
+    See :func:`benchmarkSlicerStartup`
+    """
+    baseline = results['baseline']['median']
+    costs = {'baseline': baseline}
+    if 'median' in results.get('all', {}):
+        costs['all extensions'] = results['all']['median'] - baseline
+    for (extensionName, summary) in results.get('extensions', {}).iteritems():
+        if 'median' in summary:
+            costs[extensionName] = summary['median'] - baseline
+    return costs
+
+#---------------------------------------------------------------------------
+def compareStartupBenchmarks(files, history=7, threshold=0.5, minimumIncrease=0.25):
+    """Compare the startup costs of the most recent file in ``files`` with the
+    median of the ``history`` previous ones.
+
+    A cost is flagged if it increased by more than ``minimumIncrease`` seconds
+    and by more than ``threshold`` times its previous value.
 
-    slicerMajorMinorVersion = getSlicerMajorMinorVersion(slicerVersion)
+    :returns: List of ``(name, previousCost, latestCost)`` tuples.
+    """
+    #-----------------------------------------------------------------------
+    def _readJson(filePath):
+        with codecs.open(filePath, 'r', 'utf-8') as fileContents:
+            return json.load(fileContents)
 
-    # Clone repository
-    repo = cloneRepository(SLICER_PACKAGES_METADATA_GIT_URL, getPackagesMetadataTopLevelDirectory())
+    if len(files) < 2:
+        print("\nAt least two startup benchmark files are required, found {0}".format(len(files)))
+        return []
 
-    mergedSettingsFile = mergeExtensionsLauncherAdditionalSettings(slicerExtensionsIndexBuildDir)
+    latestCosts = getStartupCosts(_readJson(files[-1]))
+    previousCosts = {}
+    for filePath in files[-1 - history:-1]:
+        for (name, cost) in getStartupCosts(_readJson(filePath)).iteritems():
+            previousCosts.setdefault(name, []).append(cost)
 
-    launcherArgs = ['--launcher-additional-settings', mergedSettingsFile]
+    print("\nComparing '{0}' with {1} previous file(s)".format(
+        os.path.basename(files[-1]), len(files[-1 - history:-1])))
 
-    extensionModuleDirectories = \
-        getExtensionModuleDirectoriesFromBuildDirs(slicerBuildDir, slicerExtensionsIndexBuildDir, slicerMajorMinorVersion).values()
-    # Flatten list
-    extensionModuleDirectories = [item for sublist in extensionModuleDirectories for item in sublist]
+    regressions = []
+    for name in sortKeys(latestCosts):
+        if name not in previousCosts:
+            continue
+        previousCost = _median(previousCosts[name])
+        increase = latestCosts[name] - previousCost
+        if increase > minimumIncrease and increase > threshold * max(previousCost, 0):
+            regressions.append((name, previousCost, latestCosts[name]))
+    return regressions
 
-    launcherArgs.append('--ignore-slicerrc')
-    # 2017-04-18 (Jc): Starting without mainwindow is not supported by some extensions
-    #                  and causes Slicer to crash.
-    # launcherArgs.append('--no-main-window')
-    launcherArgs.append('--python-script')
-    launcherArgs.append(os.path.realpath(__file__))
-    launcherArgs.append('save-loaded-modules-metadata')
-    launcherArgs.append('--slicer-version')
-    launcherArgs.append(slicerVersion)
+#---------------------------------------------------------------------------
+def _benchmarkSlicerStartup(args):
 
-    if len(extensionModuleDirectories) > 0:
-        launcherArgs.append('--additional-module-paths')
-        launcherArgs.extend(extensionModuleDirectories)
+    setCacheEntry("slicer-launch-timeout", args.timeout)
 
-    launcher = getSlicerLauncher(slicerBuildDir)
-    p = slicerLauncherPopen(launcher, launcherArgs)
-    if p is None:
-        return None
-    print("\nSaved '{0}'".format(getModulesMetadataFilePath(slicerVersion)))
+    with _profiledCommand(args, 'benchmark-startup'):
 
-    data = getExtensionModulesFromBuildDirs(slicerBuildDir, slicerExtensionsIndexBuildDir, slicerMajorMinorVersion)
-    save(getExtensionModulesFilePath(slicerVersion), data)
+        if args.slicer_version is None:
+            args.slicer_version = getSlicerVersion(args.slicer_build_dir)
 
-    if updateGithub:
-        index = repo.index
-        index.add([getModulesMetadataFilePath(slicerVersion)])
-        index.add([getExtensionModulesFilePath(slicerVersion)])
-        msg = ("Update modules-metadata and modules-by-extension listings"
-            " on {0} platform for {1}".format(platform.system(), slicerVersion))
-        index.commit(msg)
-        print("\nCommit: {0}".format(msg))
-        repo.remotes.origin.push(repo.head)
-        print("\nPushed changed to '{0}'".format(SLICER_PACKAGES_METADATA_GIT_URL))
+        benchmarkSlicerStartup(
+            args.slicer_build_dir,
+            args.slicer_extension_index_build_dir,
+            repeat=args.repeat,
+            eachExtension=args.each_extension,
+            updateGithub=not args.no_github_update,
+            slicerVersion=args.slicer_version)
 
 #---------------------------------------------------------------------------
-def _saveAllExtensionsModulesMetadata(args):
+def _compareStartupBenchmarks(args):
 
     if args.slicer_version is None:
-        args.slicer_version = getSlicerVersion(args.slicer_build_dir)
+        raise RuntimeError, "--slicer-version is required"
 
-    saveAllExtensionsModulesMetadata(
-        args.slicer_build_dir,
-        args.slicer_extension_index_build_dir,
-        updateGithub=not args.no_github_update,
-        slicerVersion=args.slicer_version)
+    if not args.no_github_update:
+        cloneRepository(SLICER_PACKAGES_METADATA_GIT_URL, getPackagesMetadataTopLevelDirectory())
+
+    regressions = compareStartupBenchmarks(
+        getStartupBenchmarkFiles(args.slicer_version, system=args.system),
+        history=args.history, threshold=args.threshold, minimumIncrease=args.minimum_increase)
+
+    if not regressions:
+        print("\nNo startup time regression")
+        return
+    print("\nStartup time regressions:")
+    for (name, previousCost, latestCost) in regressions:
+        print("  {0:<40} {1:8.2f}s -> {2:8.2f}s".format(name, previousCost, latestCost))
+    sys.exit(1)
 
 #-----------------------------------------------------------------------
 def _isRegularSection(title, anchor, content):
@@ -1264,6 +3759,7 @@ def createRawTocEntry(txt):
     return (txt, None, None)
 
 #-----------------------------------------------------------------------
+@profiled('rendering', rendering=True)
 def generateWikiToc(sections):
     lines = []
     lines.append('__NOTOC__')
@@ -1276,12 +3772,119 @@ def generateWikiToc(sections):
 
 #-----------------------------------------------------------------------
 def generateWikiSections(sections):
-    lines = []
+    """Generator yielding the content of all regular and raw ``sections``.
+
+    Section content returned by ``itemBy*ToWiki`` functions is rendered
+    while it is consumed.
+    """
     for (title, anchor, content) in sections:
         if _isRegularSection(title, anchor, content) or \
                 _isRawSection(title, anchor, content):
-            lines.extend(content)
-    return lines
+            for line in content:
+                yield line
+
+#-----------------------------------------------------------------------
+def generateWikiPage(sections, withToc=False):
+    """Generator yielding the lines of a page made of ``sections``, optionally
+    preceded by their table of content.
+    """
+    if withToc:
+        for line in generateWikiToc(sections):
+            yield line
+    for line in generateWikiSections(sections):
+        yield line
+
+#-----------------------------------------------------------------------
+WIKI_PAGE_SIZE_BUDGET = 256 * 1024
+
+#-----------------------------------------------------------------------
+def _wikiTextSize(lines):
+    """Return the size in bytes of ``lines`` joined with newlines."""
+    size = 0
+    for line in lines:
+        size += len(line.encode('utf-8') if isinstance(line, unicode) else line) + 1
+    return size
+
+#-----------------------------------------------------------------------
+def splitWikiSection(content, pageSizeBudget=WIKI_PAGE_SIZE_BUDGET):
+    """Generator splitting the groups of ``content`` into shards whose
+    wikitext is expected to fit within ``pageSizeBudget`` bytes.
+
+    ``content`` is a :class:`WikiSectionGroups`. Each shard is a list of
+    groups, groups sharing the same bucket are never split across shards.
+    A single shard is generated if the whole section fits within the
+    budget. Groups are consumed incrementally, at most one shard and one
+    bucket are kept in memory.
+    """
+    overhead = _wikiTextSize(content.header) + _wikiTextSize(content.footer)
+    shard = []
+    shardSize = overhead
+    bucket = []
+    bucketSize = 0
+    for group in itertools.chain(content.groups, [None]):
+        if bucket and (group is None or group[0] != bucket[0][0]):
+            if shard and shardSize + bucketSize > pageSizeBudget:
+                yield shard
+                shard = []
+                shardSize = overhead
+            shard.extend(bucket)
+            shardSize += bucketSize
+            bucket = []
+            bucketSize = 0
+        if group is None:
+            break
+        bucket.append(group)
+        bucketSize += _wikiTextSize(group[3])
+    if shard:
+        yield shard
+
+#-----------------------------------------------------------------------
+def getWikiSectionShardLabel(shard):
+    """Return the label of a shard generated by :func:`splitWikiSection`
+    given its first and last buckets. For example: ``A-F``.
+    """
+    (first, last) = (shard[0][0], shard[-1][0])
+    return first if first == last else "{0}-{1}".format(first, last)
+
+#-----------------------------------------------------------------------
+def generateWikiSectionShards(page, section, pageSizeBudget=WIKI_PAGE_SIZE_BUDGET):
+    """Generator yielding ``(page, sections)`` tuples for the pages needed to
+    publish ``section`` on ``page`` within ``pageSizeBudget``.
+
+    If the section is too large, one page is generated for each shard
+    returned by :func:`splitWikiSection`. Shard pages are named after the
+    range of buckets they contain (e.g ``<page>/A-F``) and ``page`` becomes
+    an index linking to every group of every shard. Group anchors do not
+    depend on the shards, only the shard pages change when groups move
+    from one shard to the other.
+    """
+    (title, anchor, content) = section
+    if not pageSizeBudget or not isinstance(content, WikiSectionGroups):
+        yield (page, [section])
+        return
+    shards = splitWikiSection(content, pageSizeBudget)
+    firstShard = next(shards, None)
+    secondShard = next(shards, None)
+    if secondShard is None:
+        content.groups = firstShard or []
+        yield (page, [section])
+        return
+    index = []
+    shardCount = 0
+    for shard in itertools.chain([firstShard, secondShard], shards):
+        shardCount += 1
+        label = getWikiSectionShardLabel(shard)
+        shardPage = "{0}/{1}".format(page, label)
+        shardTitle = "{0} ({1})".format(title, label)
+        shardContent = WikiSectionGroups(shardTitle, content.summary,
+            headerForWikiList(shardTitle, []), shard, content.footer)
+        yield (shardPage, [(shardTitle, '#' + wikiAnchor(shardTitle), shardContent)])
+        index.append(linkAsWikiListItem(wikiPageToWikiLink(shardPage, label)))
+        for (bucket, name, groupAnchor, lines) in shard:
+            index.append(linkAsWikiListItem(
+                wikiPageToWikiLink("{0}#{1}".format(shardPage, groupAnchor), prettifiedName(name)), level=1))
+    print("  split '{0}' into {1} pages".format(title, shardCount))
+    yield (page, [(title, anchor, headerForWikiList(title, [content.summary]) + index)])
 
 #-----------------------------------------------------------------------
 def thisScriptNameAndRev():
@@ -1310,18 +3913,181 @@ def publishContentToWiki(wikiName, page, lines, comment=None):
             .format(scriptName=scriptName, scriptRev=scriptRev)
             )
 
-    result = saveWikiPage(wikiName, page, comment, "\n".join(lines))
+    result = saveWikiPageLines(wikiName, page, comment, lines)
     print(result)
 
+#-----------------------------------------------------------------------
+def publishRenderedPages(wikiName, outputDir):
+    """Publish pages rendered into ``outputDir`` that changed since they were
+    last published.
+
+    Pages are listed in the ``manifest.json`` file written by :class:`DirectoryWikiBackend`.
+    The SHA-1 of published pages is recorded in ``published.json`` so that
+    unchanged pages are skipped by subsequent calls.
+    """
+    with open(os.path.join(outputDir, 'manifest.json')) as fileContents:
+        manifest = json.load(fileContents)
+    publishedFilePath = os.path.join(outputDir, 'published.json')
+    published = {}
+    if os.path.exists(publishedFilePath):
+        with open(publishedFilePath) as fileContents:
+            published = json.load(fileContents)
+
+    changed = [page for page in sorted(manifest)
+               if published.get(page) != manifest[page]['sha1']]
+    print("\nPublishing {0} changed page(s) out of {1}".format(len(changed), len(manifest)))
+    try:
+        for page in changed:
+            with codecs.open(os.path.join(outputDir, manifest[page]['file']), 'r', 'utf-8') as fileContents:
+                publishContentToWiki(wikiName, page, [fileContents.read()])
+            published[page] = manifest[page]['sha1']
+    finally:
+        # Pages published before a failure are recorded as well
+        if changed:
+            save(publishedFilePath, published)
+    return changed
+
+#===========================================================================
+class BackgroundTask(object):
+    """Call ``callable_`` in a daemon thread.
+
+    :meth:`result` waits for the call to complete and returns its result,
+    or raises the exception it raised. Failures are also reported as soon
+    as they happen, so that errors of concurrent tasks are not hidden by
+    the first one being raised.
+    """
+    #-----------------------------------------------------------------------
+    def __init__(self, name, callable_):
+        self.name = name
+        self._result = None
+        self._excInfo = None
+        self._thread = threading.Thread(target=self._run, args=(callable_,), name=name)
+        self._thread.daemon = True
+        self._thread.start()
+
+    #-----------------------------------------------------------------------
+    def _run(self, callable_):
+        try:
+            self._result = callable_()
+        except:
+            self._excInfo = sys.exc_info()
+            print("\nBackground {0} failed: {1}".format(self.name, self._excInfo[1]))
+
+    #-----------------------------------------------------------------------
+    def done(self):
+        return not self._thread.is_alive()
+
+    #-----------------------------------------------------------------------
+    def result(self):
+        self._thread.join()
+        if self._excInfo is not None:
+            raise self._excInfo[0], self._excInfo[1], self._excInfo[2]
+        return self._result
+
+#-----------------------------------------------------------------------
+def createStage(name, callable_, dependencies=[]):
+    """Return a stage that can be executed using :func:`runStages`.
+
+    ``callable_`` is called with a dictionnary mapping the name of every
+    completed stage to its result. It is guaranteed that all stages listed
+    in ``dependencies`` are completed.
+    """
+    return (name, list(dependencies), callable_)
+
+#-----------------------------------------------------------------------
+def runStages(stages, maxWorkers=4):
+    """Execute ``stages`` honoring their dependencies.
+
+    Stages that do not depend on each other are executed concurrently using
+    at most ``maxWorkers`` threads. This is intended for I/O bound stages
+    (git synchronization, wiki queries, ...).
+
+    :returns: Tuple ``(results, timings)`` where ``results`` maps stage names to
+      their result and ``timings`` maps stage names to ``(start, duration)``
+      expressed in seconds relative to the start of the execution.
+    """
+    names = [name for (name, dependencies, callable_) in stages]
+    for (name, dependencies, callable_) in stages:
+        if names.count(name) > 1:
+            raise RuntimeError, "Stage '{0}' is defined more than once".format(name)
+        for dependency in dependencies:
+            if dependency not in names:
+                raise RuntimeError, "Stage '{0}' depends on unknown stage '{1}'".format(name, dependency)
+
+    results = {}
+    timings = {}
+    pending = list(stages)
+    running = set()
+    failures = []
+    done = Queue.Queue()
+    origin = time.time()
+
+    #-----------------------------------------------------------------------
+    def _run(name, callable_):
+        start = time.time()
+        try:
+            result = callable_(dict(results))
+            done.put((name, result, None, start, time.time()))
+        except:
+            done.put((name, None, sys.exc_info(), start, time.time()))
+
+    while pending or running:
+        if not failures:
+            for stage in list(pending):
+                (name, dependencies, callable_) = stage
+                if len(running) >= maxWorkers:
+                    break
+                if [dependency for dependency in dependencies if dependency not in results]:
+                    continue
+                pending.remove(stage)
+                running.add(name)
+                thread = threading.Thread(target=_run, args=(name, callable_), name=name)
+                thread.daemon = True
+                thread.start()
+        if not running:
+            if failures:
+                break
+            raise RuntimeError, "Stages {0} have circular dependencies".format(
+                ", ".join(["'{0}'".format(name) for (name, dependencies, callable_) in pending]))
+        (name, result, excInfo, start, end) = done.get()
+        running.remove(name)
+        timings[name] = (start - origin, end - start)
+        if excInfo is not None:
+            print("\nStage '{0}' failed".format(name))
+            failures.append(excInfo)
+            continue
+        results[name] = result
+
+    if failures:
+        raise failures[0][0], failures[0][1], failures[0][2]
+
+    return (results, timings)
+
+#-----------------------------------------------------------------------
+def printStageTimings(timings):
+    """Print report of stage timings returned by :func:`runStages`.
+    """
+    print("\nStage timings:")
+    for name in sorted(timings, key=lambda name: timings[name][0]):
+        (start, duration) = timings[name]
+        print("  {0:<35} start {1:7.2f}s  duration {2:7.2f}s".format(name, start, duration))
+    if timings:
+        wallTime = max([start + duration for (start, duration) in timings.values()])
+        cumulatedTime = sum([duration for (start, duration) in timings.values()])
+        print("  {0:<35} {1:.2f}s (sum of stage durations: {2:.2f}s)".format(
+            "total", wallTime, cumulatedTime))
+
 #---------------------------------------------------------------------------
 def updateWiki(slicerBuildDir, landingPage,
-        wikiName='slicer', updateWiki=True, slicerVersion=None):
+        wikiName='slicer', updateWiki=True, slicerVersion=None, maxWorkers=4,
+        pageSizeBudget=WIKI_PAGE_SIZE_BUDGET, stagePrefix='', skipUnchangedPages=False):
 
-    try:
-        import mwclient
-    except ImportError:
-        runPip(['install', 'mwclient==0.6.5'], slicerBuildDir=slicerBuildDir)
-        import mwclient
+    if cacheEntry("wiki-{0}-backend".format(wikiName)) == 'mwclient':
+        try:
+            import mwclient
+        except ImportError:
+            runPip(['install', 'mwclient==0.6.5'], slicerBuildDir=slicerBuildDir)
+            import mwclient
 
     # Update python path to ensure 'SlicerWizard' module can be imported
     wizardPath = os.path.join(slicerBuildDir, 'bin', 'Python')
@@ -1331,88 +4097,180 @@ def updateWiki(slicerBuildDir, landingPage,
     if slicerVersion is None:
         slicerVersion = getSlicerVersion(slicerBuildDir)
 
-    # Clone repository hosting package metadata
-    cloneRepository(SLICER_PACKAGES_METADATA_GIT_URL, getPackagesMetadataTopLevelDirectory())
-    modulesMetadata = mergeMetadataFiles('slicer-modules-metadata_{0}'.format(
-        getSlicerReleaseIdentifier(slicerVersion)))
+    #-----------------------------------------------------------------------
+    def _syncPackagesMetadata(results):
+        # Clone repository hosting package metadata
+        cloneRepository(SLICER_PACKAGES_METADATA_GIT_URL, getPackagesMetadataTopLevelDirectory())
 
-    # Module -> Wiki links
-    moduleLinks = getModuleLinks(wikiName, modulesMetadata, slicerVersion)
+    #-----------------------------------------------------------------------
+    def _mergeModulesMetadata(results):
+        return mergeMetadataFiles('slicer-modules-metadata_{0}'.format(
+            getSlicerReleaseIdentifier(slicerVersion)))
 
-    # Module -> Categories
-    moduleCategories = getModuleCategories(modulesMetadata)
+    #-----------------------------------------------------------------------
+    def _mergeExtensionModules(results):
+        return mergeMetadataFiles('slicer-extension-modules_{0}'.format(
+            getSlicerReleaseIdentifier(slicerVersion)))
 
-    # Category[Category[...]] -> Modules
-    print("\nCollecting module 'categories with sub-categories'")
-    categoryModules = getCategoryItems(moduleCategories)
+    #-----------------------------------------------------------------------
+    def _getModuleLinks(results):
+        # Module -> Wiki links
+        return getModuleLinks(wikiName, results['modules-metadata'], slicerVersion)
 
-    # Module -> Contributors
-    moduleContributors = getModuleContributors(modulesMetadata)
+    #-----------------------------------------------------------------------
+    def _getModuleCategories(results):
+        # Module -> Categories
+        moduleCategories = getModuleCategories(results['modules-metadata'])
 
-    # Module: Collect contributing organizations and individuals
-    print("\nCollecting module 'contributing organizations and individuals'")
-    (organizationModules, individualModules,
-     moduleOrganizations, individualOrganizationsForModules) = \
-            getContributingOrganizationsAndIndividuals(moduleContributors)
-
-    # Module -> Extension
-    moduleExtensions = getModuleExtensions(getExtensionModules(slicerVersion))
-
-    # Module -> Type
-    moduleTypes = getModuleTypes(getExtensionModules(slicerVersion))
-
-    # Type -> Modules
-    typeModules = {}
-    for name in moduleTypes:
-        moduleType = moduleTypes[name]
-        if moduleType not in typeModules:
-            typeModules[moduleType] = []
-        if name in moduleLinks:
-            typeModules[moduleType].append(name)
-
-    # Extension -> Modules
-    extensionModules = {}
-    for name in moduleExtensions:
-        if name == 'builtin':
-            pass
-        moduleExtension = moduleExtensions[name]
-        if moduleExtension not in extensionModules:
-            extensionModules[moduleExtension] = []
-        if name in moduleLinks:
-            extensionModules[moduleExtension].append(name)
-
-    # Clone extension index
-    extensionsIndexBranch = 'master'
-    if isSlicerReleaseVersion(slicerVersion):
-        extensionsIndexBranch = getSlicerMajorMinorVersion(slicerVersion)
-    repo = cloneRepository(SLICER_EXTENSIONS_INDEX_GIT_URL,
-                           getExtensionsIndexTopLevelDirectory(),
-                           branch=extensionsIndexBranch)
+        # Category[Category[...]] -> Modules
+        print("\nCollecting module 'categories with sub-categories'")
+        categoryModules = getCategoryItems(moduleCategories)
+
+        return (moduleCategories, categoryModules)
+
+    #-----------------------------------------------------------------------
+    def _getModuleContributors(results):
+        # Module -> Contributors
+        moduleContributors = getModuleContributors(results['modules-metadata'])
+
+        # Module: Collect contributing organizations and individuals
+        print("\nCollecting module 'contributing organizations and individuals'")
+        return getContributingOrganizationsAndIndividuals(moduleContributors,
+            indexName='modules-{0}'.format(getSlicerReleaseIdentifier(slicerVersion)))
+
+    #-----------------------------------------------------------------------
+    def _getModuleExtensionsAndTypes(results):
+        extensionModulesMetadata = results['extension-modules']
+        moduleLinks = results['module-links']
+
+        # Module -> Extension
+        moduleExtensions = getModuleExtensions(extensionModulesMetadata)
+
+        # Module -> Type
+        moduleTypes = getModuleTypes(extensionModulesMetadata)
+
+        # Type -> Modules
+        typeModules = {}
+        for name in moduleTypes:
+            moduleType = moduleTypes[name]
+            if moduleType not in typeModules:
+                typeModules[moduleType] = []
+            if name in moduleLinks:
+                typeModules[moduleType].append(name)
+
+        # Extension -> Modules
+        extensionModules = {}
+        for name in moduleExtensions:
+            if name == 'builtin':
+                pass
+            moduleExtension = moduleExtensions[name]
+            if moduleExtension not in extensionModules:
+                extensionModules[moduleExtension] = []
+            if name in moduleLinks:
+                extensionModules[moduleExtension].append(name)
+
+        return (moduleExtensions, moduleTypes, typeModules, extensionModules)
+
+    #-----------------------------------------------------------------------
+    def _syncExtensionsIndex(results):
+        # Clone extension index
+        cloneRepository(SLICER_EXTENSIONS_INDEX_GIT_URL,
+                        getExtensionsIndexTopLevelDirectory(),
+                        branch=getExtensionsIndexBranch(slicerVersion))
 
-    # Extension -> Description files
-    SLICER_EXTENSIONS_SKIP = ['boost', 'Eigen']
-    extensionDescFiles = \
-        getDescriptionFiles(getExtensionsIndexTopLevelDirectory(), SLICER_EXTENSIONS_SKIP)
+    #-----------------------------------------------------------------------
+    def _getDescriptionFiles(results):
+        # Extension -> Description files
+        SLICER_EXTENSIONS_SKIP = ['boost', 'Eigen']
+        updateExtensionDescriptionRecords(getExtensionsIndexTopLevelDirectory(),
+                                          getExtensionsIndexBranch(slicerVersion))
+        return getDescriptionFiles(getExtensionsIndexTopLevelDirectory(), SLICER_EXTENSIONS_SKIP)
+
+    #-----------------------------------------------------------------------
+    def _getExtensionLinks(results):
+        # Extension -> Wiki links
+        return generateItemWikiLinks('Extensions', wikiName,
+            getExtensionHomepages(results['extension-descriptions']), slicerVersion)
+
+    #-----------------------------------------------------------------------
+    def _getExtensionCategories(results):
+        # Extension -> Categories
+        extensionCategories = getExtensionCategories(results['extension-descriptions'])
 
-    # Extension -> Wiki links
-    extensionLinks = \
-        generateItemWikiLinks('Extensions', wikiName, getExtensionHomepages(extensionDescFiles), slicerVersion)
+        # Category[Category[...]] -> Extensions
+        print("\nCollecting module 'categories with sub-categories'")
+        categoryExtensions = getCategoryItems(extensionCategories)
 
-    # Extension -> Categories
-    extensionCategories = getExtensionCategories(extensionDescFiles)
+        return (extensionCategories, categoryExtensions)
 
-    # Category[Category[...]] -> Extensions
-    print("\nCollecting module 'categories with sub-categories'")
-    categoryExtensions = getCategoryItems(extensionCategories)
+    #-----------------------------------------------------------------------
+    def _getExtensionContributors(results):
+        # Extension -> Contributors
+        extensionContributors = getExtensionContributors(results['extension-descriptions'])
 
-    # Extension -> Contributors
-    extensionContributors = getExtensionContributors(extensionDescFiles)
+        # Extension: Collect contributing organizations and individuals
+        print("\nCollecting extension 'contributing organizations and individuals'")
+        return getContributingOrganizationsAndIndividuals(extensionContributors,
+            indexName='extensions-{0}'.format(getSlicerReleaseIdentifier(slicerVersion)))
 
-    # Extension: Collect contributing organizations and individuals
-    print("\nCollecting extension 'contributing organizations and individuals'")
+    #-----------------------------------------------------------------------
+    def _updateModuleLinks(results):
+        moduleLinks = results['module-links']
+        (moduleExtensions, moduleTypes, typeModules, extensionModules) = \
+            results['module-extensions-and-types']
+        extensionLinks = results['extension-links']
+
+        def _updateModuleLink(name, moduleLink):
+            if name in moduleExtensions:
+                extensionName = moduleExtensions[name]
+                if extensionName in extensionLinks:
+                    extensionItem = extensionLinks[extensionName]
+                    if moduleLinks[name]['type'] == WIKI_LINK_OFF:
+
+                        moduleLink["wikilink"] = \
+                            _generateWikiLink(extensionItem['type'],
+                                                            'Extensions',
+                                                            extensionName,
+                                                            prettifiedName(name),
+                                                            extensionItem['url'],
+                                                            slicerVersion)
+            return moduleLink
+
+        return {k:_updateModuleLink(k, v) for (k,v) in moduleLinks.iteritems()}
+
+    # The module and extension pipelines are independent until module links
+    # are cross-referenced with extension links.
+    stages = [
+        createStage('packages-metadata-sync', _syncPackagesMetadata),
+        createStage('modules-metadata', _mergeModulesMetadata, ['packages-metadata-sync']),
+        createStage('extension-modules', _mergeExtensionModules, ['packages-metadata-sync']),
+        createStage('module-links', _getModuleLinks, ['modules-metadata']),
+        createStage('module-categories', _getModuleCategories, ['modules-metadata']),
+        createStage('module-contributors', _getModuleContributors, ['modules-metadata']),
+        createStage('module-extensions-and-types', _getModuleExtensionsAndTypes,
+                    ['extension-modules', 'module-links']),
+        createStage('extensions-index-sync', _syncExtensionsIndex),
+        createStage('extension-descriptions', _getDescriptionFiles, ['extensions-index-sync']),
+        createStage('extension-links', _getExtensionLinks, ['extension-descriptions']),
+        createStage('extension-categories', _getExtensionCategories, ['extension-descriptions']),
+        createStage('extension-contributors', _getExtensionContributors, ['extension-descriptions']),
+        createStage('module-links-update', _updateModuleLinks,
+                    ['module-links', 'module-extensions-and-types', 'extension-links']),
+        ]
+
+    (results, timings) = runStages(stages, maxWorkers=maxWorkers)
+    recordProfileStageTimings(timings, prefix=stagePrefix)
+
+    moduleLinks = results['module-links-update']
+    (moduleCategories, categoryModules) = results['module-categories']
+    (organizationModules, individualModules,
+     moduleOrganizations, individualOrganizationsForModules) = results['module-contributors']
+    (moduleExtensions, moduleTypes, typeModules, extensionModules) = \
+        results['module-extensions-and-types']
+    extensionLinks = results['extension-links']
+    (extensionCategories, categoryExtensions) = results['extension-categories']
     (organizationExtensions, individualExtensions,
-     extensionOrganizations, individualOrganizationsForExtensions) = \
-            getContributingOrganizationsAndIndividuals(extensionContributors)
+     extensionOrganizations, individualOrganizationsForExtensions) = results['extension-contributors']
 
     # Individual -> Organizations
     individualOrganizations = _merge(dict(individualOrganizationsForExtensions), individualOrganizationsForModules)
@@ -1449,25 +4307,6 @@ def updateWiki(slicerBuildDir, landingPage,
 
     withSectionToc = True
 
-    #-----------------------------------------------------------------------
-    def _updateModuleLink(name, moduleLink):
-        if name in moduleExtensions:
-            extensionName = moduleExtensions[name]
-            if extensionName in extensionLinks:
-                extensionItem = extensionLinks[extensionName]
-                if moduleLinks[name]['type'] == WIKI_LINK_OFF:
-
-                    moduleLink["wikilink"] = \
-                        _generateWikiLink(extensionItem['type'],
-                                                        'Extensions',
-                                                        extensionName,
-                                                        prettify(name),
-                                                        extensionItem['url'],
-                                                        slicerVersion)
-        return moduleLink
-
-    moduleLinks = {k:_updateModuleLink(k, v) for (k,v) in moduleLinks.iteritems()}
-
     #-----------------------------------------------------------------------
     def _excludeModule(name):
         categories = moduleCategories[name]
@@ -1485,25 +4324,57 @@ def updateWiki(slicerBuildDir, landingPage,
         {k:v for (k,v) in moduleLinks.iteritems() if not _excludeModule(k)}
 
     # Cache dictionnaries so that they can be re-used from the link renderer
-    setCacheEntry("extensionLinks", extensionLinks)
-    setCacheEntry("moduleExtensions", moduleExtensions)
-    setCacheEntry("moduleTypes", moduleTypes)
-    setCacheEntry("individualOrganizations", individualOrganizations)
-
-    moduleLinksRenderer = (headerForWikiList, moduleLinkAsListItem, footerForWikiList)
+    datasets = {
+        "extensionLinks": extensionLinks,
+        "moduleExtensions": moduleExtensions,
+        "moduleTypes": moduleTypes,
+        "individualOrganizations": individualOrganizations
+        }
+    datasetsChanged = False
+    for (name, dataset) in datasets.iteritems():
+        try:
+            datasetsChanged |= cacheEntry(name, namespace='datasets') != dataset
+        except KeyError:
+            datasetsChanged = True
+        setCacheEntry(name, dataset, namespace='datasets')
+
+    # Render each list item once, sections only concatenate the fragments.
+    # Fragments rendered by a previous run are kept if the dictionnaries
+    # they depend on did not change.
+    if datasetsChanged:
+        clearCache('fragments')
+    prerenderListItems(moduleLinks, moduleLinkAsListItem)
+    prerenderListItems(extensionLinks, linkAsWikiListItem)
+
+    moduleLinksRenderer = (headerForWikiList, cachedListItemRenderer(moduleLinkAsListItem), footerForWikiList)
+    extensionLinksRenderer = (headerForWikiList, cachedListItemRenderer(linkAsWikiListItem), footerForWikiList)
 
     slicerReleaseIdentifier = getSlicerReleaseIdentifier(slicerVersion)
 
+    def _publishPage(page, lines):
+        if updateWiki and skipUnchangedPages:
+            content = renderWikiText(lines)
+            digest = hashlib.sha1(content.encode('utf-8') if isinstance(content, unicode) else content).hexdigest()
+            published = cacheNamespace('published')
+            if (wikiName, page) in published and published.get((wikiName, page)) == digest:
+                incrementProfileCounter('wiki-pages-unchanged')
+                return
+            publishContentToWiki(wikiName, page, [content])
+            published.set((wikiName, page), digest)
+        elif updateWiki:
+            publishContentToWiki(wikiName, page, lines)
+        else:
+            # Render the page even if it is not published
+            for line in lines:
+                pass
+
     def _publishSection(section):
-        sections = [section]
-        content = []
-        if withSectionToc:
-            sections.append(createRawSection("__NOTOC__"))
-            content.extend(generateWikiToc(sections))
-        content.extend(generateWikiSections(sections))
-        subPage = "{0}/{1}".format(page, convertTitleToWikiAnchor(section[0]))
-        if updateWiki:
-            publishContentToWiki(wikiName, subPage, content)
+        subPage = "{0}/{1}".format(page, wikiAnchor(section[0]))
+        # Oversized sections are split into several pages
+        for (shardPage, sections) in generateWikiSectionShards(subPage, section, pageSizeBudget):
+            if withSectionToc:
+                sections.append(createRawSection("__NOTOC__"))
+            _publishPage(shardPage, generateWikiPage(sections, withToc=withSectionToc))
         return "* {}".format(wikiPageToWikiLink(subPage, section[0]))
 
     # Wiki pages names
@@ -1556,20 +4427,24 @@ def updateWiki(slicerBuildDir, landingPage,
     # Working extensions
     section = itemByCategoryToWiki('Extensions', extensionLinks,
               categoryAvailableExtensions,
+              linksRenderer=extensionLinksRenderer,
               withToc=withSectionToc)
     sections.append(createRawTocEntry(_publishSection(section)))
 
-    section = itemByNameToWiki('Extensions', availableExtensionLinks)
+    section = itemByNameToWiki('Extensions', availableExtensionLinks,
+              linksRenderer=extensionLinksRenderer)
     sections.append(createRawTocEntry(_publishSection(section)))
 
     section = itemByPropertyToWiki('Extensions', extensionLinks,
               "contributing organization", organizationAvailableExtensions,
+              linksRenderer=extensionLinksRenderer,
               withToc=withSectionToc)
     sections.append(createRawTocEntry(_publishSection(section)))
 
     section = itemByPropertyToWiki('Extensions', extensionLinks,
               "contributing individual", individualAvailableExtensions,
               tocEntryRenderer=individualEntryAsWikiListItem,
+              linksRenderer=extensionLinksRenderer,
               withToc=withSectionToc)
     sections.append(createRawTocEntry(_publishSection(section)))
 
@@ -1578,15 +4453,11 @@ def updateWiki(slicerBuildDir, landingPage,
     brokenLink = wikiPageToWikiLink(brokenPage, "List of extensions known to be broken")
     sections.append(createRawTocEntry("<br><small>{0}</small>".format(brokenLink)))
 
-    content = generateWikiSections(sections)
-    if updateWiki:
-        publishContentToWiki(wikiName, page, content)
+    _publishPage(page, generateWikiSections(sections))
 
     # Generate toc subpage
     if withSectionToc:
-        toc = generateWikiToc(sections)
-        if updateWiki:
-            publishContentToWiki(wikiName, tocSubPage, toc)
+        _publishPage(tocSubPage, generateWikiToc(sections))
 
     # Broken extensions
     sections = []
@@ -1597,41 +4468,313 @@ def updateWiki(slicerBuildDir, landingPage,
 
     sections.append(itemByCategoryToWiki('Broken extensions', extensionLinks,
                     categoryBrokenExtensions,
+                    linksRenderer=extensionLinksRenderer,
                     withToc=withSectionToc))
 
-    sections.append(itemByNameToWiki('Broken extensions', brokenExtensionLinks))
+    sections.append(itemByNameToWiki('Broken extensions', brokenExtensionLinks,
+                    linksRenderer=extensionLinksRenderer))
 
     sections.append(itemByPropertyToWiki('Broken extensions', extensionLinks,
                     "contributing organization", organizationBrokenExtensions,
+                    linksRenderer=extensionLinksRenderer,
                     withToc=withSectionToc))
 
     sections.append(itemByPropertyToWiki('Broken extensions', extensionLinks,
                     "contributing individual", individualBrokenExtensions,
                     tocEntryRenderer=individualEntryAsWikiListItem,
+                    linksRenderer=extensionLinksRenderer,
                     withToc=withSectionToc))
 
-    content = []
-    if withSectionToc:
-        content.extend(generateWikiToc(sections))
-    content.extend(generateWikiSections(sections))
+    _publishPage(brokenPage, generateWikiPage(sections, withToc=withSectionToc))
 
     if updateWiki:
-        publishContentToWiki(wikiName, brokenPage, content)
+        flushWiki(wikiName)
+
+    printStageTimings(timings)
+
+#---------------------------------------------------------------------------
+def getDocumentationPrefixes(slicerVersions):
+    """Return the prefixes of the module and extension documentation pages
+    of all ``slicerVersions``.
+    """
+    prefixes = []
+    for slicerVersion in slicerVersions:
+        for what in ['Modules', 'Extensions']:
+            prefix = "Documentation/{0}/{1}/".format(getSlicerReleaseIdentifier(slicerVersion), what)
+            if prefix not in prefixes:
+                prefixes.append(prefix)
+    return prefixes
+
+#---------------------------------------------------------------------------
+def updateWikiForVersions(slicerBuildDir, landingPage, slicerVersions=None,
+        wikiName='slicer', **kwargs):
+    """Update the listings of all ``slicerVersions`` in one process.
+
+    The wiki session, the repository syncs, the parsed description files and
+    the existence of the documentation pages of all versions are shared
+    between the versions. If ``slicerVersions`` is empty, the version is
+    autodiscovered running Slicer build directory.
+
+    Other keyword arguments are passed to :func:`updateWiki`.
+    """
+    if not slicerVersions:
+        slicerVersions = [getSlicerVersion(slicerBuildDir)]
+
+    # Repositories are synchronized while the wiki is queried below. Only the
+    # ExtensionsIndex branch of the first version can be checked out early.
+    syncs = [
+        syncRepositoryInBackground(SLICER_PACKAGES_METADATA_GIT_URL,
+                                   getPackagesMetadataTopLevelDirectory()),
+        syncRepositoryInBackground(SLICER_EXTENSIONS_INDEX_GIT_URL,
+                                   getExtensionsIndexTopLevelDirectory(),
+                                   branch=getExtensionsIndexBranch(slicerVersions[0]))
+        ]
+
+    try:
+        if persistentCacheEnabled():
+            validatePersistentCache(wikiName)
+        if not persistentCacheEnabled() or not __m.persistent_cache:
+            # One query per release and item type instead of one per item
+            prefetchWikiPageExistence(wikiName, getDocumentationPrefixes(slicerVersions))
+
+        for slicerVersion in slicerVersions:
+            print("\nUpdating listing of '{0}'".format(slicerVersion))
+            updateWiki(slicerBuildDir, landingPage, wikiName=wikiName,
+                slicerVersion=slicerVersion,
+                stagePrefix='' if len(slicerVersions) == 1 else slicerVersion + '/',
+                **kwargs)
+    finally:
+        flushPersistentCache()
+        # Syncs not consumed, for example if an error occurred before the
+        # repositories were needed
+        discardRepositorySyncs(syncs)
+
+#---------------------------------------------------------------------------
+def getRemoteHeads(repoDir):
+    """Return a dictionnary mapping the refs of the ``origin`` remote of the
+    clone ``repoDir`` to their SHA-1. Objects are not fetched.
+    """
+    incrementProfileCounter('git-operations')
+    heads = {}
+    for line in git.Repo(repoDir).git.ls_remote('origin').splitlines():
+        (sha, ref) = line.split('\t', 1)
+        heads[ref] = sha
+    return heads
+
+#---------------------------------------------------------------------------
+def getRecentWikiChanges(wikiName, since, prefixes):
+    """Return ``(titles, timestamp)`` where ``titles`` are the sorted and
+    normalized titles of pages starting with one of ``prefixes`` created,
+    deleted or moved since ``since`` and ``timestamp`` is the current wiki time.
+
+    ``titles`` is None if the changes are unknown. Return None if the wiki
+    backend does not implement ``changedPages``.
+    """
+    wiki = connectToWikiByName(wikiName)
+    if not hasattr(wiki, 'changedPages'):
+        return None
+    # mwclient connections can not be shared between threads
+    with __m.wiki_lock, profileTimer('wiki-recent-changes'):
+        (titles, timestamp) = wiki.changedPages(since)
+    if titles is None:
+        return (None, timestamp)
+    prefixes = [_normalizeWikiTitle(prefix) for prefix in prefixes]
+    titles = [_normalizeWikiTitle(title) for title in titles]
+    return (sorted(set([title for title in titles
+                        if any(title.startswith(prefix) for prefix in prefixes)])), timestamp)
+
+#---------------------------------------------------------------------------
+def startStatusServer(port, getStatus):
+    """Serve the dictionnary returned by ``getStatus`` as json on
+    ``http://localhost:<port>/status`` from a daemon thread.
+    """
+    #=======================================================================
+    class _StatusHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+        #-------------------------------------------------------------------
+        def do_GET(self):
+            if self.path.rstrip('/') not in ['', '/status']:
+                self.send_error(404)
+                return
+            body = json.dumps(getStatus(), sort_keys=True, indent=4)
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        #-------------------------------------------------------------------
+        def log_message(self, format, *args):
+            pass
+
+    server = BaseHTTPServer.HTTPServer(('', port), _StatusHandler)
+    thread = threading.Thread(target=server.serve_forever, name='status-server')
+    thread.daemon = True
+    thread.start()
+    print("\nServing status on http://localhost:{0}/status".format(server.server_port))
+    return server
+
+#---------------------------------------------------------------------------
+def _utcTimestamp(seconds=None):
+    return time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(seconds))
+
+#---------------------------------------------------------------------------
+def watchWiki(slicerBuildDir, landingPage, slicerVersions=None, wikiName='slicer',
+        interval=300, statusPort=None, **kwargs):
+    """Update the listings of ``slicerVersions`` and keep them up-to-date.
+
+    Every ``interval`` seconds, the slicer-packages-metadata and ExtensionsIndex
+    remotes are polled using ``git ls-remote`` and the wiki is asked for the
+    documentation pages created, deleted or moved since the last poll. If anything changed, the
+    listings are regenerated reusing the state kept in memory (merged metadata,
+    parsed descriptions, page existence and rendered fragments) and only the
+    pages whose content changed are published.
+
+    If ``statusPort`` is set, the state and the timings of the last run are
+    served as json. See :func:`startStatusServer`
+
+    This function never returns. Other keyword arguments are passed to
+    :func:`updateWiki`.
+    """
+    if not slicerVersions:
+        slicerVersions = [getSlicerVersion(slicerBuildDir)]
+    prefixes = getDocumentationPrefixes(slicerVersions)
+    repoDirs = [getPackagesMetadataTopLevelDirectory(), getExtensionsIndexTopLevelDirectory()]
+
+    statusLock = threading.Lock()
+    status = {
+        'state': 'starting', 'versions': slicerVersions, 'interval': interval,
+        'runs': 0, 'lastPoll': None, 'lastRun': None, 'lastPollError': None
+        }
+
+    def _getStatus():
+        with statusLock:
+            return json.loads(json.dumps(status))
+
+    def _setStatus(**values):
+        with statusLock:
+            status.update(values)
+
+    if statusPort is not None:
+        startStatusServer(statusPort, _getStatus)
+
+    def _heads():
+        return {repoDir: getRemoteHeads(repoDir) if os.path.isdir(repoDir) else None
+                for repoDir in repoDirs}
+
+    def _run(changes):
+        _setStatus(state='running')
+        clearProfile()
+        start = time.time()
+        error = None
+        try:
+            updateWikiForVersions(slicerBuildDir, landingPage, slicerVersions,
+                wikiName=wikiName, skipUnchangedPages=True, **kwargs)
+        except Exception as e:
+            traceback.print_exc()
+            error = str(e)
+        report = getProfileReport()
+        with statusLock:
+            status['state'] = 'idle'
+            status['runs'] += 1
+            status['lastRun'] = {
+                'start': _utcTimestamp(start), 'seconds': time.time() - start,
+                'changes': changes, 'error': error,
+                'timers': report['timers'], 'stages': report['stages'],
+                'counters': report['counters']}
+
+    # Changes are listed relatively to the wiki time
+    since = (getRecentWikiChanges(wikiName, None, prefixes) or (None, None))[1]
+    heads = _heads()
+    _run(['initial run'])
+    heads = {repoDir: heads[repoDir] if heads[repoDir] is not None else getRemoteHeads(repoDir)
+             for repoDir in repoDirs}
+
+    while True:
+        time.sleep(interval)
+        pollStart = _utcTimestamp()
+        changes = []
+        try:
+            currentHeads = _heads()
+            for repoDir in repoDirs:
+                if currentHeads[repoDir] != heads[repoDir]:
+                    changes.append("remote of '{0}' changed".format(repoDir))
+            result = getRecentWikiChanges(wikiName, since, prefixes)
+        except Exception as e:
+            traceback.print_exc()
+            _setStatus(lastPoll=pollStart, lastPollError=str(e))
+            continue
+        _setStatus(lastPoll=pollStart, lastPollError=None)
+        remoteChanged = currentHeads != heads
+        heads = currentHeads
+        if result is not None:
+            (titles, since) = result
+            if titles is None:
+                changes.append("too many documentation pages changed")
+                clearCache('existence')
+            elif titles:
+                changes.append("{0} documentation page(s) changed".format(len(titles)))
+                # Only the existence of pages below the changed prefixes is queried again
+                for title in titles:
+                    cacheNamespace('existence').remove(_wikiTitlePrefix(title))
+        if not changes:
+            continue
+        print("\n{0}: {1}".format(pollStart, ", ".join(changes)))
+        if remoteChanged:
+            clearRepositorySyncs()
+        _run(changes)
+
+#---------------------------------------------------------------------------
+def _setWikiCacheEntries(args):
+    setCacheEntry("wiki-slicer-password", args.slicer_wiki_password)
+    if args.wiki_username:
+        setCacheEntry("wiki-slicer-username", args.wiki_username)
+    if args.wiki_host:
+        setCacheEntry("wiki-slicer-host", args.wiki_host)
+    if args.wiki_path:
+        setCacheEntry("wiki-slicer-path", args.wiki_path)
+    if args.wiki_backend:
+        setCacheEntry("wiki-slicer-backend", args.wiki_backend)
+    setCacheEntry("wiki-slicer-session", not args.no_wiki_session)
 
 #---------------------------------------------------------------------------
 def _updateWiki(args):
-    if args.cache_wiki_query:
+    _setWikiCacheEntries(args)
+    if args.output_dir:
+        setCacheEntry("wiki-slicer-backend", "directory")
+        setCacheEntry("wiki-slicer-output-dir", os.path.abspath(args.output_dir))
+        setCacheEntry("wiki-slicer-existence-index",
+            args.existence_index if args.existence_index else getPersistentCacheFilePath())
+    elif args.cache_wiki_query:
         loadPersistentCache()
-    setCacheEntry("wiki-slicer-password", args.slicer_wiki_password)
-    updateWiki(args.slicer_build_dir,
-        args.landing_page,
-        updateWiki=not args.no_wiki_update,
-        slicerVersion=args.slicer_version)
+    setRenderingProfilingEnabled(args.profile_rendering is not None)
+    with _profiledCommand(args, 'update-wiki'):
+        kwargs = dict(
+            slicerVersions=args.slicer_version,
+            updateWiki=not args.no_wiki_update,
+            maxWorkers=args.jobs,
+            pageSizeBudget=args.page_size_budget)
+        if args.watch is not None:
+            watchWiki(args.slicer_build_dir, args.landing_page,
+                interval=args.watch, statusPort=args.status_port, **kwargs)
+        else:
+            updateWikiForVersions(args.slicer_build_dir, args.landing_page, **kwargs)
+    if args.profile_rendering:
+        saveRenderingProfile(args.profile_rendering)
+
+#---------------------------------------------------------------------------
+def _publishRenderedPages(args):
+    _setWikiCacheEntries(args)
+    with _profiledCommand(args, 'publish-rendered-pages'):
+        publishRenderedPages('slicer', args.output_dir)
 
 #---------------------------------------------------------------------------
 setCacheEntry("wiki-slicer-username", "UpdateBot")
 setCacheEntry("wiki-slicer-host", "www.slicer.org")
 setCacheEntry("wiki-slicer-path", "/w/")
+setCacheEntry("wiki-slicer-backend", "mwclient")
+setCacheEntry("wiki-slicer-session", True)
+setCacheEntry("slicer-launch-timeout", 3600)
+setCacheEntry("metadata-gzip-threshold", None)
 
 #---------------------------------------------------------------------------
 if __name__ == '__main__':
@@ -1647,15 +4790,69 @@ if __name__ == '__main__':
             sys.exit(2)
 
     #-----------------------------------------------------------------------
-    def _add_common_args(parser, withBuildDir=True):
+    def _add_common_args(parser, withBuildDir=True, multipleVersions=False):
         if withBuildDir:
             parser.add_argument('slicer_build_dir',
                 help='path to slicer inner build directory')
 
         parser.add_argument('--slicer-version', dest='slicer_version', default=None,
+            action='append' if multipleVersions else 'store',
             help='slicer version to consider. By default, the slicer version '
             'is autodiscovered running Slicer build directory. '
-            'For example: \"Slicer 4.4-Nightly\", \"Slicer 4.4\"')
+            'For example: \"Slicer 4.4-Nightly\", \"Slicer 4.4\"' +
+            ('. Can be specified multiple times to process several versions '
+             'in one run.' if multipleVersions else ''))
+
+    #-----------------------------------------------------------------------
+    def _add_timeout_args(parser):
+        parser.add_argument('--timeout', dest='timeout', type=float, default=cacheEntry("slicer-launch-timeout"),
+            help='time in seconds after which a Slicer process and its children are killed. '
+            'Output of all processes is logged into {0} (default: {1})'.format(
+                getSubprocessLogFilePath(), cacheEntry("slicer-launch-timeout")))
+
+    #-----------------------------------------------------------------------
+    def _add_wiki_args(parser):
+        parser.add_argument('--wiki-host', dest='wiki_host', default=None,
+            help='wiki host (default: {0}). For example, \"localhost:8080\" to use the '
+            'stand-in started with slicer_wiki_local_server.py'.format(cacheEntry("wiki-slicer-host")))
+
+        parser.add_argument('--wiki-path', dest='wiki_path', default=None,
+            help='wiki script path (default: {0})'.format(cacheEntry("wiki-slicer-path")))
+
+        parser.add_argument('--wiki-username', dest='wiki_username', default=None,
+            help='wiki username (default: {0})'.format(cacheEntry("wiki-slicer-username")))
+
+        parser.add_argument('--wiki-backend', dest='wiki_backend', default=None,
+            choices=sorted(WIKI_BACKENDS.keys()),
+            help='wiki backend (default: {0})'.format(cacheEntry("wiki-slicer-backend")))
+
+        parser.add_argument('--no-wiki-session', dest='no_wiki_session', action='store_true',
+            help='always login instead of reusing the session saved by a previous run '
+            '(default: sessions are saved in files only readable by the current user in {0})'.format(
+                getWikiSessionDirectory()))
+
+    #-----------------------------------------------------------------------
+    def _add_profile_args(parser):
+        parser.add_argument('--profile', dest='profile', default=None, metavar='FILE',
+            help='save timings of each step, counts of wiki API calls, git operations '
+            'and subprocess launches, and cache statistics as a json file')
+        parser.add_argument('--cache-max-entries', dest='cache_max_entries', action='append',
+            default=None, type=_cacheMaxEntries, metavar='NAMESPACE=COUNT',
+            help='keep at most COUNT entries in the in-process cache NAMESPACE, evicting the '
+            'least recently used ones. Can be specified multiple times. '
+            'Namespaces: {0}'.format(', '.join(BOUNDED_CACHE_NAMESPACES)))
+
+    #-----------------------------------------------------------------------
+    def _cacheMaxEntries(value):
+        try:
+            (namespace, maxEntries) = value.split('=')
+            maxEntries = int(maxEntries)
+        except ValueError:
+            raise argparse.ArgumentTypeError("expected NAMESPACE=COUNT, got '{0}'".format(value))
+        if namespace not in BOUNDED_CACHE_NAMESPACES or maxEntries < 1:
+            raise argparse.ArgumentTypeError("invalid cache namespace or size '{0}'. "
+                "Namespaces: {1}".format(value, ', '.join(BOUNDED_CACHE_NAMESPACES)))
+        return (namespace, maxEntries)
 
     parser = VerboseErrorParser(description='generate and publish Slicer extensions and modules list on the Slicer wiki')
     commands = parser.add_subparsers()
@@ -1664,19 +4861,51 @@ if __name__ == '__main__':
     wiki_parser = commands.add_parser(
         'update-wiki', help = 'update Slicer wiki')
 
-    _add_common_args(wiki_parser)
+    _add_common_args(wiki_parser, multipleVersions=True)
 
-    wiki_parser.add_argument('slicer_wiki_password',
-        help='slicer wiki password')
+    wiki_parser.add_argument('slicer_wiki_password', nargs='?', default=None,
+        help='slicer wiki password (not needed with --output-dir or if a wiki session saved '
+        'by a previous run can be reused). Also needed with --no-wiki-update, the wiki is '
+        'queried to check which pages exist.')
+
+    _add_wiki_args(wiki_parser)
 
     wiki_parser.add_argument('--cache-wiki-query', dest='cache_wiki_query',
         action='store_true',
-        help='cache result of wiki query (for debugging)')
+        help='cache result of wiki query. Cached results of pages created, deleted or moved '
+        'since the previous run are discarded.')
 
     wiki_parser.add_argument('--no-wiki-update', dest='no_wiki_update',
         action='store_true',
         help='disable wiki update')
 
+    wiki_parser.add_argument('--output-dir', dest='output_dir', default=None,
+        help='write rendered pages and their manifest into this directory instead of '
+        'updating the wiki. The wiki is not contacted, page existence is looked up in '
+        'the existence index. See publish-rendered-pages command.')
+
+    wiki_parser.add_argument('--existence-index', dest='existence_index', default=None,
+        help='json file mapping wiki page names to their existence used with --output-dir. '
+        'It is updated by runs using --cache-wiki-query (default: {0})'.format(getPersistentCacheFilePath()))
+
+    wiki_parser.add_argument('--jobs', dest='jobs', type=int, default=4,
+        help='maximum number of pipeline stages executed concurrently (default: 4)')
+    wiki_parser.add_argument('--page-size-budget', dest='page_size_budget', type=int, default=WIKI_PAGE_SIZE_BUDGET,
+        help='size in bytes above which listing sections are split into several pages. '
+        'Set to 0 to disable (default: {0})'.format(WIKI_PAGE_SIZE_BUDGET))
+
+    wiki_parser.add_argument('--watch', dest='watch', type=float, default=None, metavar='SECONDS',
+        help='keep running and poll the repositories and the wiki every SECONDS. Listings are '
+        'regenerated when something changed and only modified pages are published')
+    wiki_parser.add_argument('--status-port', dest='status_port', type=int, default=None,
+        help='with --watch, serve the state and the timings of the last run as json on '
+        'http://localhost:<port>/status')
+
+    _add_profile_args(wiki_parser)
+
+    wiki_parser.add_argument('--profile-rendering', dest='profile_rendering', default=None, metavar='FILE',
+        help='save cProfile statistics of the wiki page rendering (see pstats module)')
+
     testLandingPage = 'User:UpdateBot/Issue-2843-Consolidated-Extension-List'
     landingPage = 'Documentation'
     wiki_parser.add_argument('--test-wiki-update', dest='test_wiki_update',
@@ -1686,14 +4915,55 @@ if __name__ == '__main__':
 
     wiki_parser.set_defaults(action=_updateWiki)
 
+    #--
+    publish_rendered_parser = commands.add_parser(
+        'publish-rendered-pages', help = 'publish pages rendered using update-wiki --output-dir '
+        'that changed since last publication')
+
+    publish_rendered_parser.add_argument('output_dir',
+        help='directory where pages were rendered')
+
+    publish_rendered_parser.add_argument('slicer_wiki_password',
+        help='slicer wiki password')
+
+    _add_wiki_args(publish_rendered_parser)
+
+    _add_profile_args(publish_rendered_parser)
+
+    publish_rendered_parser.set_defaults(action=_publishRenderedPages)
+
     #--
     save_loaded_parser = commands.add_parser(
         'save-loaded-modules-metadata', help = 'save metadata of all Slicer modules (should be used in running Slice instance)')
 
     _add_common_args(save_loaded_parser, withBuildDir=False)
 
+    save_loaded_parser.add_argument('--output-file', dest='output_file', default=None,
+        help='file where metadata are saved (default: metadata file associated with the Slicer version '
+        'in the packages metadata directory)')
+
     save_loaded_parser.set_defaults(action=_saveLoadedModulesMetadata)
 
+    #--
+    save_performance_parser = commands.add_parser(
+        'save-modules-performance', help = 'load Slicer modules one at a time and save their load time and memory '
+        'measurements (should be used in running Slice instance)')
+
+    _add_common_args(save_performance_parser, withBuildDir=False)
+
+    save_performance_parser.add_argument('--output-file', dest='output_file', default=None,
+        help='file where measurements are saved (default: performance file associated with the Slicer '
+        'version in the packages metadata directory)')
+
+    save_performance_parser.add_argument('--module-paths', dest='module_paths', nargs='+', default=[],
+        help='directories containing the modules to load and measure')
+
+    save_performance_parser.add_argument('--launch-time', dest='launch_time', type=float, default=None,
+        help='time at which Slicer was launched, in seconds since the epoch. Required to report the '
+        'startup wall time.')
+
+    save_performance_parser.set_defaults(action=_saveModulesPerformance)
+
     #--
     saveAll_parser = commands.add_parser(
         'publish-extension-module-metadata', help = 'publish metadata of all Slicer modules')
@@ -1707,8 +4977,93 @@ if __name__ == '__main__':
         action='store_true',
         help='disable github update')
 
+    saveAll_parser.add_argument('--shards', dest='shards', type=int, default=1,
+        help='number of Slicer instances started concurrently, each one loading a subset of '
+        'the extensions. When greater than 1, extensions failing to load are isolated by '
+        'bisection and reported instead of aborting (default: 1)')
+
+    saveAll_parser.add_argument('--gzip-threshold', dest='gzip_threshold', type=int, default=None,
+        metavar='BYTES',
+        help='also save a gzip compressed copy of the metadata files larger than BYTES')
+
+    _add_timeout_args(saveAll_parser)
+
+    _add_profile_args(saveAll_parser)
+
     saveAll_parser.set_defaults(action=_saveAllExtensionsModulesMetadata)
 
+    #--
+    collect_parser = commands.add_parser(
+        'publish-collected-metadata', help = 'publish in a single commit the metadata files '
+        'saved on each platform by publish-extension-module-metadata --no-github-update')
+
+    collect_parser.add_argument('directories', nargs='+',
+        help='directories containing the metadata files of each platform')
+
+    collect_parser.add_argument('--no-github-update', dest='no_github_update',
+        action='store_true',
+        help='disable github update')
+
+    collect_parser.add_argument('--gzip-threshold', dest='gzip_threshold', type=int, default=None,
+        metavar='BYTES',
+        help='also save a gzip compressed copy of the metadata files larger than BYTES')
+
+    _add_profile_args(collect_parser)
+
+    collect_parser.set_defaults(action=_publishCollectedMetadataFiles)
+
+    #--
+    startup_parser = commands.add_parser(
+        'benchmark-startup', help = 'measure Slicer startup time with and without extensions '
+        'and publish the results')
+
+    _add_common_args(startup_parser)
+
+    startup_parser.add_argument('slicer_extension_index_build_dir',
+        help='path to slicer extension index top-level build directory')
+
+    startup_parser.add_argument('--repeat', dest='repeat', type=int, default=5,
+        help='number of times Slicer is started for each configuration (default: 5)')
+
+    startup_parser.add_argument('--each-extension', dest='each_extension',
+        action='store_true',
+        help='also measure the startup time with each extension loaded alone')
+
+    _add_timeout_args(startup_parser)
+
+    startup_parser.add_argument('--no-github-update', dest='no_github_update',
+        action='store_true',
+        help='disable github update')
+
+    _add_profile_args(startup_parser)
+
+    startup_parser.set_defaults(action=_benchmarkSlicerStartup)
+
+    #--
+    compare_startup_parser = commands.add_parser(
+        'compare-startup-benchmarks', help = 'compare the latest startup benchmark with the '
+        'previous ones and report extensions whose load cost increased')
+
+    _add_common_args(compare_startup_parser, withBuildDir=False)
+
+    compare_startup_parser.add_argument('--system', dest='system', default=None,
+        help='platform to consider (default: {0})'.format(platform.system()))
+
+    compare_startup_parser.add_argument('--history', dest='history', type=int, default=7,
+        help='number of previous benchmarks to compare with (default: 7)')
+
+    compare_startup_parser.add_argument('--threshold', dest='threshold', type=float, default=0.5,
+        help='relative increase of the load cost reported as regression (default: 0.5)')
+
+    compare_startup_parser.add_argument('--minimum-increase', dest='minimum_increase', type=float, default=0.25,
+        help='increase of the load cost in seconds below which no regression is reported (default: 0.25)')
+
+    compare_startup_parser.add_argument('--no-github-update', dest='no_github_update',
+        action='store_true',
+        help='compare files already available locally instead of updating the repository')
+
+    compare_startup_parser.set_defaults(action=_compareStartupBenchmarks)
+
     args = parser.parse_args()
 
     if 'slicer_extension_index_build_dir' in args:
@@ -1722,4 +5077,19 @@ if __name__ == '__main__':
         if args.test_wiki_update:
             args.landing_page = testLandingPage
 
+    # Without password, mwclient would only fail when the wiki is first
+    # queried. Page existence is queried even with --no-wiki-update.
+    if (args.action == _updateWiki and args.slicer_wiki_password is None
+            and not args.output_dir
+            and (args.wiki_backend or cacheEntry("wiki-slicer-backend")) == 'mwclient'):
+        username = args.wiki_username or cacheEntry("wiki-slicer-username")
+        host = args.wiki_host or cacheEntry("wiki-slicer-host")
+        path = args.wiki_path or cacheEntry("wiki-slicer-path")
+        if args.no_wiki_session or not hasValidWikiSession(username, host, path):
+            parser.error("slicer_wiki_password is required: no reusable wiki session "
+                         "for '{0}' on '{1}{2}'".format(username, host, path))
+
+    for (namespace, maxEntries) in getattr(args, 'cache_max_entries', None) or []:
+        setCacheMaxEntries(namespace, maxEntries)
+
     args.action(args)
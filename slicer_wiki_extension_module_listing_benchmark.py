@@ -0,0 +1,479 @@
+#!/usr/bin/env python
+
+"""Benchmark the listing pipeline implemented in ``slicer_wiki_extension_module_listing.py``
+using synthetic ExtensionsIndex, extension build trees and metadata files.
+
+Data are generated for each scale (1x corresponds to the size of the ExtensionsIndex
+at the time of writing) and results are saved as a json file so that they can be
+compared with the results of a previous run.
+"""
+
+import codecs
+import glob
+import json
+import os
+import platform
+import random
+import shutil
+import stat
+import sys
+import tempfile
+import time
+
+import slicer_wiki_extension_module_listing as listing
+
+#---------------------------------------------------------------------------
+EXTENSIONS_AT_SCALE_1 = 150
+BUILTIN_MODULES = 120
+SLICER_MAJOR_MINOR_VERSION = '4.9'
+SLICER_VERSION = 'Slicer {0}.0-2018-01-01'.format(SLICER_MAJOR_MINOR_VERSION)
+
+# Number of rendered sections sorting and anchoring the same names
+NAME_NORMALIZATION_SECTIONS = 10
+
+# Size of the synthetic contributor set and number of modules sharing
+# the same contributors string on average
+CONTRIBUTOR_BENCHMARK_MODULES = 10000
+MODULES_PER_CONTRIBUTORS_STRING = 25
+
+ORGANIZATIONS = [
+    'Kitware', 'BWH', 'Isomics', 'Queen\'s University', 'SPL', 'NA-MIC',
+    'UNC', 'University of Iowa', 'Perk Lab', 'Harvard Medical School',
+    'GE', 'Robarts Research Institute', 'NCIGT', 'Stanford', 'MIT']
+
+FIRST_NAMES = [
+    'Andras', 'Andrey', 'Csaba', 'Jean-Christophe', 'Steve', 'Ron', 'Nicole',
+    'Sonia', 'Christian', 'Tamas', 'Matthew', 'Jim', 'Alex', 'Julien', 'Hans']
+
+LAST_NAMES = [
+    'Lasso', 'Fedorov', 'Pinter', 'Fillion-Robin', 'Pieper', 'Kikinis',
+    'Aucoin', 'Pujol', 'Ungi', 'Holden', 'Miller', 'Yarmarkovich', 'Finet',
+    'Johnson', 'Smith', 'Lee', 'Chen', 'Garcia', 'Martin', 'Nguyen']
+
+CATEGORIES = [
+    'Segmentation', 'Registration', 'Quantification', 'Diffusion',
+    'Diffusion.Tractography', 'Diffusion.Import and Export', 'Filtering',
+    'Filtering.Denoising', 'IGT', 'Informatics', 'Surface Models',
+    'Converters', 'Wizards', 'Developer Tools', 'Utilities', 'Legacy']
+
+MODULE_TYPES = ['cli', 'loadable', 'scripted']
+
+#---------------------------------------------------------------------------
+def _randomIndividual(rand):
+    # Favor a small set of prolific contributors
+    index = int(rand.paretovariate(1.2)) % (len(FIRST_NAMES) * len(LAST_NAMES))
+    return '{0} {1}'.format(FIRST_NAMES[index % len(FIRST_NAMES)],
+                            LAST_NAMES[index // len(FIRST_NAMES) % len(LAST_NAMES)])
+
+#---------------------------------------------------------------------------
+def generateContributors(rand):
+    """Return a contributors string formatted like the ones found in
+    extension description files and module metadata::
+
+        Jane Doe (Kitware), John Smith, Ann Lee (BWH)
+    """
+    contributors = []
+    for orgIdx in range(rand.randint(1, 3)):
+        individuals = [_randomIndividual(rand) for idx in range(rand.randint(1, 3))]
+        individuals = ", ".join(individuals)
+        if rand.random() < 0.8:
+            contributors.append("{0} ({1})".format(individuals, rand.choice(ORGANIZATIONS)))
+        else:
+            contributors.append(individuals)
+    return ", ".join(contributors)
+
+#---------------------------------------------------------------------------
+def extensionName(idx):
+    return 'SyntheticExtension{0:05d}'.format(idx)
+
+#---------------------------------------------------------------------------
+def moduleName(extensionIdx, moduleIdx):
+    return 'Synthetic{0:05d}Module{1}'.format(extensionIdx, moduleIdx)
+
+#---------------------------------------------------------------------------
+def builtinModuleName(idx):
+    return 'Builtin{0:04d}'.format(idx)
+
+#---------------------------------------------------------------------------
+def _extensionModules(rand, extensionIdx):
+    """Return list of ``(moduleName, moduleType)`` for a synthetic extension.
+    """
+    return [(moduleName(extensionIdx, moduleIdx), rand.choice(MODULE_TYPES))
+            for moduleIdx in range(rand.randint(1, 6))]
+
+#---------------------------------------------------------------------------
+def _touch(filePath, executable=False, contents=''):
+    with open(filePath, 'w') as fileContents:
+        fileContents.write(contents)
+    if executable:
+        os.chmod(filePath, os.stat(filePath).st_mode | stat.S_IXUSR)
+
+#---------------------------------------------------------------------------
+def _createModuleFiles(basePath, modules):
+    for (name, moduleType) in modules:
+        subdir = {
+            'cli': 'cli-modules',
+            'loadable': 'qt-loadable-modules',
+            'scripted': 'qt-scripted-modules'
+            }[moduleType]
+        moduleDir = os.path.join(basePath, 'lib', 'Slicer-{0}'.format(SLICER_MAJOR_MINOR_VERSION), subdir)
+        if not os.path.isdir(moduleDir):
+            os.makedirs(moduleDir)
+        if moduleType == 'cli':
+            _touch(os.path.join(moduleDir, listing._e(name)), executable=True)
+            _touch(os.path.join(moduleDir, name + '.xml'))
+        elif moduleType == 'loadable':
+            _touch(os.path.join(moduleDir, 'libqSlicer{0}Module.so'.format(name)))
+        else:
+            _touch(os.path.join(moduleDir, name + '.py'))
+            _touch(os.path.join(moduleDir, name + '.pyc'))
+
+#---------------------------------------------------------------------------
+def generateExtensionsIndex(outputDir, extensionCount, seed=0):
+    """Generate ``extensionCount`` description files into ``outputDir``.
+    """
+    rand = random.Random(seed)
+    if not os.path.exists(outputDir):
+        os.makedirs(outputDir)
+    for idx in range(extensionCount):
+        name = extensionName(idx)
+        lines = [
+            '# This is a synthetic description file',
+            'scm git',
+            'scmurl git://github.com/Slicer/{0}.git'.format(name),
+            'scmrevision master',
+            'depends NA',
+            'build_subdirectory .',
+            'homepage {0}'.format(
+                'http://www.slicer.org/slicerWiki/index.php/Documentation/Nightly/Extensions/{0}'.format(name)
+                if rand.random() < 0.9 else ''),
+            'contributors {0}'.format(generateContributors(rand)),
+            'category {0}'.format(rand.choice(CATEGORIES)),
+            'description Synthetic extension {0}'.format(idx),
+            'enabled 1'
+            ]
+        with codecs.open(os.path.join(outputDir, name + '.s4ext'), 'w', 'utf-8') as fileContents:
+            fileContents.write('\n'.join(lines) + '\n')
+
+#---------------------------------------------------------------------------
+def generateBuildTrees(slicerBuildDir, slicerExtensionsIndexBuildDir, extensionCount, seed=0):
+    """Generate a fake Slicer build tree with built-in modules and one fake
+    build tree per extension with cli, loadable and scripted modules.
+    """
+    rand = random.Random(seed)
+    _createModuleFiles(slicerBuildDir,
+        [(builtinModuleName(idx), rand.choice(MODULE_TYPES)) for idx in range(BUILTIN_MODULES)])
+    for idx in range(extensionCount):
+        extensionBuildDir = os.path.join(slicerExtensionsIndexBuildDir, extensionName(idx) + '-build')
+        innerBuildDir = os.path.join(extensionBuildDir, 'inner-build')
+        os.makedirs(innerBuildDir)
+        _createModuleFiles(innerBuildDir, _extensionModules(rand, idx))
+        _touch(os.path.join(extensionBuildDir, extensionName(idx) + '.s4ext'))
+
+#---------------------------------------------------------------------------
+def generateMetadataFiles(metadataDir, extensionCount, seed=0):
+    """Generate ``slicer-modules-metadata`` and ``slicer-extension-modules`` files
+    for Linux, Darwin and Windows into ``metadataDir``.
+
+    Each platform misses a few extensions so that merging the files is
+    not a no-op.
+    """
+    if not os.path.exists(metadataDir):
+        os.makedirs(metadataDir)
+    releaseIdentifier = listing.getSlicerReleaseIdentifier(SLICER_VERSION)
+    for system in ['Linux', 'Darwin', 'Windows']:
+        rand = random.Random(seed)
+        systemRand = random.Random(system)
+        modulesMetadata = {}
+        extensionModules = {'builtin': {moduleType: [] for moduleType in MODULE_TYPES}}
+        for idx in range(BUILTIN_MODULES):
+            name = builtinModuleName(idx)
+            moduleType = rand.choice(MODULE_TYPES)
+            extensionModules['builtin'][moduleType].append(name)
+            modulesMetadata[name] = {
+                'contributors': [generateContributors(rand)],
+                'categories': [rand.choice(CATEGORIES)]}
+        for idx in range(extensionCount):
+            modules = _extensionModules(rand, idx)
+            metadata = [(name, moduleType, generateContributors(rand), rand.choice(CATEGORIES))
+                        for (name, moduleType) in modules]
+            if systemRand.random() < 0.05:
+                continue
+            extensionModules[extensionName(idx)] = {moduleType: [] for moduleType in MODULE_TYPES}
+            for (name, moduleType, contributors, category) in metadata:
+                extensionModules[extensionName(idx)][moduleType].append(name)
+                modulesMetadata[name] = {'contributors': [contributors], 'categories': [category]}
+        listing.save(listing.outputFilePath(metadataDir, 'slicer-modules-metadata',
+            system=system, slicerVersion=SLICER_VERSION), modulesMetadata)
+        listing.save(listing.outputFilePath(metadataDir, 'slicer-extension-modules',
+            system=system, slicerVersion=SLICER_VERSION), extensionModules)
+    return releaseIdentifier
+
+#---------------------------------------------------------------------------
+def _timeit(function, repeat):
+    """Return the best wall time of ``repeat`` calls to ``function`` and
+    the result of the last call.
+    """
+    best = None
+    result = None
+    for idx in range(repeat):
+        start = time.time()
+        result = function()
+        elapsed = time.time() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return (best, result)
+
+#---------------------------------------------------------------------------
+def runBenchmarkAtScale(workDir, scale, repeat=3):
+    """Generate synthetic data corresponding to ``scale`` and return a dictionnary
+    of benchmark names and associated best wall time in seconds.
+    """
+    extensionCount = EXTENSIONS_AT_SCALE_1 * scale
+    scaleDir = os.path.join(workDir, 'scale-{0}'.format(scale))
+    if os.path.exists(scaleDir):
+        shutil.rmtree(scaleDir)
+
+    print("\nGenerating synthetic data for {0} extensions into '{1}'".format(extensionCount, scaleDir))
+    extensionsIndexDir = os.path.join(scaleDir, 'ExtensionsIndex')
+    slicerBuildDir = os.path.join(scaleDir, 'Slicer-build')
+    slicerExtensionsIndexBuildDir = os.path.join(scaleDir, 'ExtensionsIndex-build')
+    generateExtensionsIndex(extensionsIndexDir, extensionCount)
+    generateBuildTrees(slicerBuildDir, slicerExtensionsIndexBuildDir, extensionCount)
+
+    # Functions reading metadata files expect them in the temporary directory
+    tempfile.tempdir = scaleDir
+    releaseIdentifier = generateMetadataFiles(listing.getPackagesMetadataDataDirectory(), extensionCount)
+
+    results = {}
+
+    def _run(name, function):
+        (seconds, result) = _timeit(function, repeat)
+        results[name] = seconds
+        return result
+
+    _run('getDescriptionFiles',
+         lambda: listing.getDescriptionFiles(extensionsIndexDir))
+
+    _run('getExtensionModulesFromBuildDirs',
+         lambda: listing.getExtensionModulesFromBuildDirs(
+            slicerBuildDir, slicerExtensionsIndexBuildDir, SLICER_MAJOR_MINOR_VERSION))
+
+    # Merged metadata are memoized in the 'datasets' namespace, clear it so
+    # that each call reads and merges the files
+    def _mergeMetadataFiles():
+        listing.clearCache('datasets')
+        return listing.mergeMetadataFiles('slicer-modules-metadata_{0}'.format(releaseIdentifier))
+
+    modulesMetadata = _run('mergeMetadataFiles', _mergeMetadataFiles)
+    extensionModules = listing.mergeMetadataFiles('slicer-extension-modules_{0}'.format(releaseIdentifier))
+
+    moduleContributors = listing.getModuleContributors(modulesMetadata)
+
+    # Parsed contributors are memoized in the 'contributors' namespace
+    def _getContributingOrganizationsAndIndividuals():
+        listing.clearCache('contributors')
+        return listing.getContributingOrganizationsAndIndividuals(moduleContributors)
+
+    (organizationModules, individualModules, moduleOrganizations, individualOrganizations) = \
+        _run('getContributingOrganizationsAndIndividuals', _getContributingOrganizationsAndIndividuals)
+
+    # Renderers
+    moduleLinks = {name: listing._createLinkItem(
+                        listing.WIKI_LINK_INTERNAL, 'Modules', name, listing.prettify(name),
+                        slicerVersion=SLICER_VERSION)
+                   for name in modulesMetadata}
+    extensionLinks = {name: listing._createLinkItem(
+                        listing.WIKI_LINK_INTERNAL, 'Extensions', name, listing.prettify(name),
+                        slicerVersion=SLICER_VERSION)
+                      for name in extensionModules if name != 'builtin'}
+    listing.setCacheEntry("extensionLinks", extensionLinks, namespace='datasets')
+    listing.setCacheEntry("moduleExtensions", listing.getModuleExtensions(extensionModules), namespace='datasets')
+    listing.setCacheEntry("moduleTypes", listing.getModuleTypes(extensionModules), namespace='datasets')
+    listing.setCacheEntry("individualOrganizations", individualOrganizations, namespace='datasets')
+    moduleLinksRenderer = (listing.headerForWikiList, listing.moduleLinkAsListItem, listing.footerForWikiList)
+    categoryModules = listing.getCategoryItems(listing.getModuleCategories(modulesMetadata))
+
+    # Section content is rendered while it is written
+    def _render(section):
+        return listing.renderWikiText(listing.generateWikiPage([section], withToc=True))
+
+    _run('itemByCategoryToWiki',
+         lambda: _render(listing.itemByCategoryToWiki('Modules', moduleLinks, categoryModules,
+            linksRenderer=moduleLinksRenderer, withToc=True)))
+
+    _run('itemByNameToWiki',
+         lambda: _render(listing.itemByNameToWiki('Modules', moduleLinks, linksRenderer=moduleLinksRenderer)))
+
+    _run('itemByPropertyToWiki',
+         lambda: _render(listing.itemByPropertyToWiki('Modules', moduleLinks,
+            "contributing individual", individualModules,
+            tocEntryRenderer=listing.individualEntryAsWikiListItem,
+            linksRenderer=moduleLinksRenderer, withToc=True)))
+
+    # Name normalization: each rendered section sorts and anchors the same names
+    names = list(modulesMetadata) + list(extensionLinks) + list(individualModules)
+
+    def _normalizeUncached():
+        for section in range(NAME_NORMALIZATION_SECTIONS):
+            sorted(names, key=lambda s: listing.prettify(s.lower()))
+            [listing.convertTitleToWikiAnchor(name) for name in names]
+
+    def _normalizeWithTable():
+        listing.clearCache('names')
+        for section in range(NAME_NORMALIZATION_SECTIONS):
+            listing.sortPrettifiedKeys(names)
+            [listing.wikiAnchor(name) for name in names]
+
+    _run('nameNormalization (uncached)', _normalizeUncached)
+    _run('nameNormalization (table)', _normalizeWithTable)
+
+    return results
+
+#---------------------------------------------------------------------------
+def generateModuleContributors(moduleCount, seed=0):
+    """Return a dictionnary mapping ``moduleCount`` synthetic module names to
+    their contributors. Like in the module metadata, contributors strings are
+    shared by many modules, a few of them by hundreds.
+    """
+    rand = random.Random(seed)
+    strings = [generateContributors(rand)
+               for idx in range(max(1, moduleCount // MODULES_PER_CONTRIBUTORS_STRING))]
+    return {'SyntheticModule{0:06d}'.format(idx):
+                [strings[int(rand.paretovariate(1.0)) % len(strings)]]
+            for idx in range(moduleCount)}
+
+#---------------------------------------------------------------------------
+def runContributorBenchmark(moduleCount=CONTRIBUTOR_BENCHMARK_MODULES, repeat=3):
+    """Return a dictionnary of benchmark names and associated best wall time
+    in seconds for the contributors parsing of ``moduleCount`` modules.
+    """
+    print("\nGenerating synthetic contributors for {0} modules".format(moduleCount))
+    moduleContributors = generateModuleContributors(moduleCount)
+    changedModule = sorted(moduleContributors)[0]
+    changedContributors = [moduleContributors[changedModule], ['Jane Doe (Kitware)']]
+
+    results = {}
+
+    def _run(name, function):
+        (seconds, result) = _timeit(function, repeat)
+        results[name] = seconds
+        return result
+
+    def _parse(memoized):
+        listing.clearCache('contributors')
+        for (name, contributors) in moduleContributors.iteritems():
+            if not memoized:
+                listing.clearCache('contributors')
+            listing.parseContributors(name, contributors)
+
+    def _buildIndex():
+        listing.clearCache('contributors')
+        listing.getContributingOrganizationsAndIndividuals(moduleContributors)
+
+    index = listing.ContributorIndex()
+    index.update(moduleContributors)
+
+    def _updateOneItem():
+        changedContributors.reverse()
+        moduleContributors[changedModule] = changedContributors[0]
+        index.update(moduleContributors)
+        return index.maps()
+
+    _run('parseContributors (not memoized)', lambda: _parse(memoized=False))
+    _run('parseContributors (memoized)', lambda: _parse(memoized=True))
+    _run('index build', _buildIndex)
+    _run('index update (one item changed)', _updateOneItem)
+
+    return results
+
+#---------------------------------------------------------------------------
+def _scaleSortKey(scale):
+    # Scale independent results are listed last
+    return (0, int(scale)) if scale.isdigit() else (1, scale)
+
+#---------------------------------------------------------------------------
+def _scaleLabel(scale):
+    return '{0}x'.format(scale) if scale.isdigit() else scale
+
+#---------------------------------------------------------------------------
+def getPreviousResultsFile(resultsDir, currentFile):
+    files = sorted([filePath for filePath in
+                    glob.glob(os.path.join(resultsDir, 'listing-benchmark_{0}_*.json'.format(platform.system())))
+                    if os.path.abspath(filePath) != os.path.abspath(currentFile)])
+    return files[-1] if files else None
+
+#---------------------------------------------------------------------------
+def compareResults(previous, current, threshold=0.2):
+    """Print the relative change between ``previous`` and ``current`` results
+    and return the list of ``(scale, benchmark)`` slower by more than ``threshold``.
+    """
+    regressions = []
+    print("\nComparison with previous results:")
+    for scale in sorted(current, key=_scaleSortKey):
+        if scale not in previous:
+            continue
+        for name in sorted(current[scale]):
+            if name not in previous[scale] or not previous[scale][name]:
+                continue
+            change = current[scale][name] / previous[scale][name] - 1.0
+            flag = ""
+            if change > threshold:
+                flag = "  <-- regression"
+                regressions.append((scale, name))
+            print("  {0:>5} {1:<45} {2:9.4f}s -> {3:9.4f}s ({4:+.0%}){5}".format(
+                _scaleLabel(scale), name, previous[scale][name], current[scale][name], change, flag))
+    return regressions
+
+#---------------------------------------------------------------------------
+def printResults(results):
+    print("\nResults:")
+    for scale in sorted(results, key=_scaleSortKey):
+        for name in sorted(results[scale]):
+            print("  {0:>5} {1:<45} {2:9.4f}s".format(_scaleLabel(scale), name, results[scale][name]))
+
+#---------------------------------------------------------------------------
+if __name__ == '__main__':
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--scales', dest='scales', type=int, nargs='+', default=[1, 10, 100],
+        help='scales to benchmark. Scale 1 corresponds to {0} extensions (default: 1 10 100)'.format(
+            EXTENSIONS_AT_SCALE_1))
+    parser.add_argument('--repeat', dest='repeat', type=int, default=3,
+        help='number of times each function is timed, the best time is reported (default: 3)')
+    parser.add_argument('--work-dir', dest='work_dir', default=None,
+        help='directory where synthetic data are generated (default: new temporary directory)')
+    parser.add_argument('--results-dir', dest='results_dir', default='.',
+        help='directory where results are saved and looked up for comparison (default: .)')
+    parser.add_argument('--threshold', dest='threshold', type=float, default=0.2,
+        help='relative slowdown reported as regression (default: 0.2)')
+    parser.add_argument('--contributor-modules', dest='contributor_modules', type=int,
+        default=CONTRIBUTOR_BENCHMARK_MODULES,
+        help='number of modules of the synthetic contributor set, 0 disables the '
+        'contributors benchmark (default: {0})'.format(CONTRIBUTOR_BENCHMARK_MODULES))
+    args = parser.parse_args()
+
+    workDir = args.work_dir
+    if workDir is None:
+        workDir = tempfile.mkdtemp(prefix='slicer-listing-benchmark-')
+    workDir = os.path.abspath(workDir)
+
+    results = {}
+    for scale in args.scales:
+        results[str(scale)] = runBenchmarkAtScale(workDir, scale, repeat=args.repeat)
+
+    if args.contributor_modules > 0:
+        results['contributors'] = runContributorBenchmark(args.contributor_modules, repeat=args.repeat)
+
+    printResults(results)
+
+    resultsFile = listing.save(
+        listing.outputFilePath(args.results_dir, 'listing-benchmark', withDate=True), results)
+
+    previousResultsFile = getPreviousResultsFile(args.results_dir, resultsFile)
+    if previousResultsFile is not None:
+        with open(previousResultsFile) as fileContents:
+            regressions = compareResults(json.load(fileContents), results, args.threshold)
+        if regressions:
+            sys.exit(1)
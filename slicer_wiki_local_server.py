@@ -0,0 +1,522 @@
+#!/usr/bin/env python
+
+"""Local stand-in for the MediaWiki API of the Slicer wiki.
+
+It implements the subset of the API used by ``slicer_wiki_extension_module_listing.py``
+through :mod:`mwclient` (login, siteinfo, page existence, ``allpages``,
+``recentchanges``, ``logevents``, revisions, edit, delete and move) so that the ``update-wiki`` command can be exercised and benchmarked
+without network access or credentials::
+
+    python slicer_wiki_local_server.py --port 8080 --latency 0.05 &
+    python slicer_wiki_extension_module_listing.py update-wiki /path/to/Slicer-build \\
+        password --wiki-host localhost:8080
+
+Pages are kept in memory. They can be seeded from (and saved back to) a json
+file mapping page titles to wikitext.
+"""
+
+import BaseHTTPServer
+import SocketServer
+import json
+import random
+import signal
+import sys
+import threading
+import time
+import urlparse
+
+#---------------------------------------------------------------------------
+MEDIAWIKI_VERSION = 'MediaWiki 1.27.1'
+
+NAMESPACES = {
+    -2: u'Media', -1: u'Special', 0: u'', 1: u'Talk', 2: u'User', 3: u'User talk',
+    4: u'Project', 5: u'Project talk', 6: u'File', 7: u'File talk', 8: u'MediaWiki',
+    9: u'MediaWiki talk', 10: u'Template', 11: u'Template talk', 12: u'Help',
+    13: u'Help talk', 14: u'Category', 15: u'Category talk'}
+
+USER_RIGHTS = ['read', 'edit', 'createpage', 'writeapi', 'bot', 'apihighlimits']
+
+#---------------------------------------------------------------------------
+def timestamp(seconds=None):
+    return time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(seconds))
+
+#===========================================================================
+class Wiki(object):
+    """In-memory wiki state shared by all request handlers.
+    """
+    #-----------------------------------------------------------------------
+    def __init__(self, pages=None, latency=0.0, latencyJitter=0.0, rateLimit=None, retryAfter=1):
+        self.lock = threading.Lock()
+        self.pages = {}
+        self.revisionCount = 0
+        self.changes = []
+        self.logEvents = []
+        for title, text in (pages or {}).iteritems():
+            self.setPage(title, text)
+        # Seeded pages are not reported as recent changes
+        self.changes = []
+        self.logEvents = []
+        self.sessions = {}
+        self.latency = latency
+        self.latencyJitter = latencyJitter
+        self.rateLimit = rateLimit
+        self.retryAfter = retryAfter
+        self.requestTimes = []
+        self.stats = {'requests': 0, 'rate-limited': 0, 'edits': 0}
+
+    #-----------------------------------------------------------------------
+    @staticmethod
+    def normalizeTitle(title):
+        title = title.strip().replace('_', ' ')
+        if title.startswith(':'):
+            title = title[1:]
+        return title[:1].upper() + title[1:]
+
+    #-----------------------------------------------------------------------
+    def setPage(self, title, text):
+        title = self.normalizeTitle(title)
+        self.revisionCount += 1
+        page = self.pages.setdefault(title, {'pageid': len(self.pages) + 1, 'revisions': []})
+        page['revisions'].append({
+            'revid': self.revisionCount,
+            'timestamp': timestamp(),
+            '*': text})
+        self.changes.append({
+            'type': 'new' if len(page['revisions']) == 1 else 'edit',
+            'ns': 0, 'title': title, 'rcid': len(self.changes) + 1,
+            'revid': self.revisionCount, 'timestamp': page['revisions'][-1]['timestamp']})
+        if len(page['revisions']) == 1:
+            self.logEvent('create', title)
+        return page
+
+    #-----------------------------------------------------------------------
+    def deletePage(self, title):
+        title = self.normalizeTitle(title)
+        del self.pages[title]
+        self.logEvent('delete', title)
+
+    #-----------------------------------------------------------------------
+    def movePage(self, title, target):
+        title = self.normalizeTitle(title)
+        target = self.normalizeTitle(target)
+        self.pages[target] = self.pages.pop(title)
+        self.logEvent('move', title, {'target_ns': 0, 'target_title': target})
+
+    #-----------------------------------------------------------------------
+    def logEvent(self, type_, title, params={}):
+        """Record a log event. Deletions and moves are also reported as
+        recent changes of type ``log``.
+        """
+        event = {'logid': len(self.logEvents) + 1, 'type': type_, 'action': type_,
+                 'ns': 0, 'title': title, 'timestamp': timestamp(), 'params': dict(params)}
+        self.logEvents.append(event)
+        if type_ != 'create':
+            self.changes.append({
+                'type': 'log', 'ns': 0, 'title': title, 'rcid': len(self.changes) + 1,
+                'revid': 0, 'timestamp': event['timestamp']})
+
+    #-----------------------------------------------------------------------
+    def isRateLimited(self):
+        """Return True if more than ``rateLimit`` requests were received
+        during the last second.
+        """
+        if not self.rateLimit:
+            return False
+        now = time.time()
+        with self.lock:
+            self.requestTimes = [t for t in self.requestTimes if now - t < 1.0]
+            if len(self.requestTimes) >= self.rateLimit:
+                self.stats['rate-limited'] += 1
+                return True
+            self.requestTimes.append(now)
+        return False
+
+    #-----------------------------------------------------------------------
+    def simulateLatency(self):
+        delay = self.latency
+        if self.latencyJitter:
+            delay += random.uniform(0, self.latencyJitter)
+        if delay > 0:
+            time.sleep(delay)
+
+#===========================================================================
+class APIError(Exception):
+    #-----------------------------------------------------------------------
+    def __init__(self, code, info):
+        Exception.__init__(self, code, info)
+        self.code = code
+        self.info = info
+
+#===========================================================================
+class RequestHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+
+    protocol_version = 'HTTP/1.1'
+
+    # Send headers and body at once, it avoids delayed acknowledgment
+    # stalls on persistent connections.
+    wbufsize = -1
+
+    #-----------------------------------------------------------------------
+    @property
+    def wiki(self):
+        return self.server.wiki
+
+    #-----------------------------------------------------------------------
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            BaseHTTPServer.BaseHTTPRequestHandler.log_message(self, format, *args)
+
+    #-----------------------------------------------------------------------
+    def do_GET(self):
+        self._handle(urlparse.urlparse(self.path).query)
+
+    #-----------------------------------------------------------------------
+    def do_HEAD(self):
+        self._send(200, '')
+
+    #-----------------------------------------------------------------------
+    def do_POST(self):
+        length = int(self.headers.getheader('Content-Length') or 0)
+        self._handle(self.rfile.read(length))
+
+    #-----------------------------------------------------------------------
+    def _send(self, status, body, headers={}):
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in headers.iteritems():
+            self.send_header(name, value)
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+    #-----------------------------------------------------------------------
+    def _session(self):
+        cookies = self.headers.getheader('Cookie') or ''
+        for cookie in cookies.split(';'):
+            if '=' not in cookie:
+                continue
+            (name, value) = cookie.strip().split('=', 1)
+            if name == 'localwiki_session' and value in self.wiki.sessions:
+                return (value, self.wiki.sessions[value])
+        return (None, None)
+
+    #-----------------------------------------------------------------------
+    def _handle(self, data):
+        self.wiki.stats['requests'] += 1
+        self.wiki.simulateLatency()
+        if self.wiki.isRateLimited():
+            # Mimic the response sent by MediaWiki when 'maxlag' is exceeded.
+            self._send(503, json.dumps({'error': {'code': 'maxlag', 'info': 'Rate limited'}}),
+                {'Retry-After': str(self.wiki.retryAfter), 'X-Database-Lag': '5'})
+            return
+        params = dict(urlparse.parse_qsl(data, keep_blank_values=True))
+        params = {k: v.decode('utf-8') for (k, v) in params.iteritems()}
+        headers = {}
+        try:
+            action = params.get('action')
+            if action == 'login':
+                result = self._login(params, headers)
+            elif action == 'query':
+                result = self._query(params)
+            elif action == 'edit':
+                result = self._edit(params)
+            elif action == 'delete':
+                result = self._delete(params)
+            elif action == 'move':
+                result = self._move(params)
+            else:
+                raise APIError('unknown_action', "Unrecognized value for parameter 'action': {0}".format(action))
+        except APIError, e:
+            result = {'error': {'code': e.code, 'info': e.info}}
+        self._send(200, json.dumps(result), headers)
+
+    #-----------------------------------------------------------------------
+    def _login(self, params, headers):
+        (sessionId, session) = self._session()
+        if session is None:
+            sessionId = '%032x' % random.getrandbits(128)
+            session = self.wiki.sessions[sessionId] = {
+                'user': None, 'logintoken': '%032x' % random.getrandbits(128),
+                'edittoken': '%032x+\\' % random.getrandbits(128)}
+            headers['Set-Cookie'] = 'localwiki_session={0}; path=/; HttpOnly'.format(sessionId)
+        if params.get('lgtoken') != session['logintoken']:
+            return {'login': {'result': 'NeedToken', 'token': session['logintoken'],
+                              'cookieprefix': 'localwiki', 'sessionid': sessionId}}
+        if not params.get('lgname') or not params.get('lgpassword'):
+            return {'login': {'result': 'WrongPass'}}
+        session['user'] = params['lgname']
+        return {'login': {'result': 'Success', 'lgusername': session['user'],
+                          'lgtoken': session['logintoken'], 'cookieprefix': 'localwiki',
+                          'sessionid': sessionId}}
+
+    #-----------------------------------------------------------------------
+    def _userinfo(self):
+        (sessionId, session) = self._session()
+        if session is None or session['user'] is None:
+            return {'id': 0, 'name': self.client_address[0], 'anon': '',
+                    'groups': ['*'], 'rights': ['read']}
+        return {'id': 1, 'name': session['user'], 'groups': ['*', 'user', 'bot'],
+                'rights': USER_RIGHTS}
+
+    #-----------------------------------------------------------------------
+    def _query(self, params):
+        query = {}
+        result = {'query': query}
+        meta = params.get('meta', '').split('|')
+        if 'siteinfo' in meta:
+            query['general'] = {
+                'sitename': 'Slicer Wiki (local)', 'generator': MEDIAWIKI_VERSION,
+                'writeapi': '', 'case': 'first-letter', 'time': timestamp()}
+            query['namespaces'] = {str(id_): {'id': id_, '*': name}
+                                   for (id_, name) in NAMESPACES.iteritems()}
+        if 'userinfo' in meta:
+            query['userinfo'] = self._userinfo()
+        if 'titles' in params:
+            query['pages'] = self._pagesInfo(params, params['titles'].split('|'))
+        if 'allpages' in params.get('list', '').split('|'):
+            (titles, continueFrom) = self._allpages(params, 'ap')
+            query['allpages'] = [
+                {'pageid': self.wiki.pages[title]['pageid'], 'ns': 0, 'title': title}
+                for title in titles]
+            if continueFrom:
+                result['query-continue'] = {'allpages': {'apcontinue': continueFrom}}
+        if 'recentchanges' in params.get('list', '').split('|'):
+            (changes, continueFrom) = self._recentchanges(params)
+            query['recentchanges'] = changes
+            if continueFrom:
+                result['query-continue'] = {'recentchanges': {'rccontinue': continueFrom}}
+        if 'logevents' in params.get('list', '').split('|'):
+            (events, continueFrom) = self._logevents(params)
+            query['logevents'] = events
+            if continueFrom:
+                result.setdefault('query-continue', {})['logevents'] = {'lecontinue': continueFrom}
+        if params.get('generator') == 'allpages':
+            (titles, continueFrom) = self._allpages(params, 'gap')
+            query['pages'] = self._pagesInfo(params, titles)
+            if continueFrom:
+                result['query-continue'] = {'allpages': {'gapcontinue': continueFrom}}
+        return result
+
+    #-----------------------------------------------------------------------
+    def _pagesInfo(self, params, titles):
+        pages = {}
+        props = params.get('prop', '').split('|')
+        (sessionId, session) = self._session()
+        for idx, title in enumerate(titles):
+            title = self.wiki.normalizeTitle(title)
+            info = {'title': title, 'ns': 0}
+            page = self.wiki.pages.get(title)
+            if page is None:
+                info['missing'] = ''
+                key = str(-(idx + 1))
+            else:
+                key = str(page['pageid'])
+                last = page['revisions'][-1]
+                info.update({'pageid': page['pageid'], 'lastrevid': last['revid'],
+                             'touched': last['timestamp'], 'length': len(last['*'])})
+                if 'revisions' in props:
+                    limit = int(params.get('rvlimit', 1))
+                    rvprop = params.get('rvprop', 'ids|timestamp').split('|')
+                    info['revisions'] = [
+                        {k: v for (k, v) in rev.iteritems()
+                         if k == 'revid' or (k == '*' and 'content' in rvprop) or k in rvprop}
+                        for rev in reversed(page['revisions'][-limit:])]
+            if 'info' in props:
+                info['protection'] = []
+                if params.get('intoken') == 'edit' and session is not None:
+                    info['edittoken'] = session['edittoken']
+                    info['starttimestamp'] = timestamp()
+            pages[key] = info
+        return pages
+
+    #-----------------------------------------------------------------------
+    def _allpages(self, params, prefix):
+        """Return titles matching ``allpages`` parameters starting with ``prefix``
+        and the title to continue from (or None).
+        """
+        titlePrefix = self.wiki.normalizeTitle(params[prefix + 'prefix']) if params.get(prefix + 'prefix') else ''
+        start = params.get(prefix + 'continue', params.get(prefix + 'from', ''))
+        limit = params.get(prefix + 'limit', '10')
+        limit = 5000 if limit == 'max' else int(limit)
+        titles = sorted([title for title in self.wiki.pages
+                         if title.startswith(titlePrefix) and title >= start])
+        return (titles[:limit], titles[limit] if len(titles) > limit else None)
+
+    #-----------------------------------------------------------------------
+    def _recentchanges(self, params):
+        """Return changes matching ``recentchanges`` parameters and the
+        change id to continue from (or None).
+        """
+        newer = params.get('rcdir', 'older') == 'newer'
+        start = params.get('rcstart')
+        limit = params.get('rclimit', '10')
+        limit = 5000 if limit == 'max' else int(limit)
+        with self.wiki.lock:
+            changes = list(self.wiki.changes)
+        if params.get('rctype'):
+            changes = [change for change in changes if change['type'] in params['rctype'].split('|')]
+        (changes, continueFrom) = self._selectEvents(changes, 'rcid', start, newer, limit,
+                                                     params.get('rccontinue'))
+        rcprop = params.get('rcprop', 'title|timestamp|ids').split('|')
+        selected = [{k: v for (k, v) in change.iteritems()
+                     if k in ['type', 'ns'] or k in rcprop or (k in ['rcid', 'revid'] and 'ids' in rcprop)}
+                    for change in changes]
+        return (selected, continueFrom)
+
+    #-----------------------------------------------------------------------
+    def _logevents(self, params):
+        """Return log events matching ``logevents`` parameters and the
+        log id to continue from (or None).
+        """
+        newer = params.get('ledir', 'older') == 'newer'
+        limit = params.get('lelimit', '10')
+        limit = 5000 if limit == 'max' else int(limit)
+        with self.wiki.lock:
+            events = list(self.wiki.logEvents)
+        if params.get('letype'):
+            events = [event for event in events if event['type'] == params['letype']]
+        (events, continueFrom) = self._selectEvents(events, 'logid', params.get('lestart'), newer, limit,
+                                                    params.get('lecontinue'))
+        leprop = params.get('leprop', 'ids|title|type|timestamp|details').split('|')
+        selected = [{k: v for (k, v) in event.iteritems()
+                     if k in ['ns'] or k in leprop or (k == 'logid' and 'ids' in leprop)
+                     or (k == 'action' and 'type' in leprop) or (k == 'params' and 'details' in leprop)}
+                    for event in events]
+        return (selected, continueFrom)
+
+    #-----------------------------------------------------------------------
+    @staticmethod
+    def _selectEvents(events, idKey, start, newer, limit, continueFrom):
+        """Return at most ``limit`` events starting at timestamp ``start``
+        sorted by date and the id of the event to continue from (or None).
+        """
+        if start:
+            events = [event for event in events
+                      if (event['timestamp'] >= start if newer else event['timestamp'] <= start)]
+        if not newer:
+            events.reverse()
+        if continueFrom:
+            id_ = int(continueFrom)
+            events = [event for event in events
+                      if (event[idKey] >= id_ if newer else event[idKey] <= id_)]
+        return (events[:limit], str(events[limit][idKey]) if len(events) > limit else None)
+
+    #-----------------------------------------------------------------------
+    def _checkEditToken(self, params):
+        (sessionId, session) = self._session()
+        if session is None or session['user'] is None:
+            raise APIError('permissiondenied', 'You must be logged in to edit pages')
+        if params.get('token') != session['edittoken']:
+            raise APIError('badtoken', 'Invalid token')
+
+    #-----------------------------------------------------------------------
+    def _delete(self, params):
+        self._checkEditToken(params)
+        title = self.wiki.normalizeTitle(params['title'])
+        with self.wiki.lock:
+            if title not in self.wiki.pages:
+                raise APIError('missingtitle', "The page you specified doesn't exist")
+            self.wiki.deletePage(title)
+        return {'delete': {'title': title, 'reason': params.get('reason', '')}}
+
+    #-----------------------------------------------------------------------
+    def _move(self, params):
+        self._checkEditToken(params)
+        title = self.wiki.normalizeTitle(params['from'])
+        target = self.wiki.normalizeTitle(params['to'])
+        with self.wiki.lock:
+            if title not in self.wiki.pages:
+                raise APIError('missingtitle', "The page you specified doesn't exist")
+            if target in self.wiki.pages:
+                raise APIError('articleexists', 'A page of that name already exists')
+            self.wiki.movePage(title, target)
+        return {'move': {'from': title, 'to': target, 'reason': params.get('reason', '')}}
+
+    #-----------------------------------------------------------------------
+    def _edit(self, params):
+        self._checkEditToken(params)
+        title = self.wiki.normalizeTitle(params['title'])
+        text = params.get('text', u'')
+        with self.wiki.lock:
+            page = self.wiki.pages.get(title)
+            if page is not None and page['revisions'][-1]['*'] == text:
+                return {'edit': {'result': 'Success', 'pageid': page['pageid'],
+                                 'title': title, 'nochange': ''}}
+            oldRevId = page['revisions'][-1]['revid'] if page else 0
+            page = self.wiki.setPage(title, text)
+            self.wiki.stats['edits'] += 1
+        last = page['revisions'][-1]
+        edit = {'result': 'Success', 'pageid': page['pageid'], 'title': title,
+                'oldrevid': oldRevId, 'newrevid': last['revid'], 'newtimestamp': last['timestamp']}
+        if not oldRevId:
+            edit['new'] = ''
+        return {'edit': edit}
+
+#===========================================================================
+class Server(SocketServer.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    #-----------------------------------------------------------------------
+    def __init__(self, address, wiki, verbose=False):
+        BaseHTTPServer.HTTPServer.__init__(self, address, RequestHandler)
+        self.wiki = wiki
+        self.verbose = verbose
+
+#---------------------------------------------------------------------------
+def savePages(wiki, filePath):
+    with open(filePath, 'w') as fileContents:
+        fileContents.write(json.dumps(
+            {title: page['revisions'][-1]['*'] for (title, page) in wiki.pages.iteritems()},
+            sort_keys=True, indent=4))
+    print("\nSaved {0} page(s) into '{1}'".format(len(wiki.pages), filePath))
+
+#---------------------------------------------------------------------------
+if __name__ == '__main__':
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description='local stand-in for the Slicer wiki API')
+    parser.add_argument('--host', dest='host', default='localhost',
+        help='interface to listen on (default: localhost)')
+    parser.add_argument('--port', dest='port', type=int, default=8080,
+        help='port to listen on (default: 8080)')
+    parser.add_argument('--pages', dest='pages', default=None,
+        help='json file mapping page titles to wikitext used to seed the wiki. '
+        'Pages are saved back into the file on exit.')
+    parser.add_argument('--latency', dest='latency', type=float, default=0.0,
+        help='delay in seconds added to each request (default: 0)')
+    parser.add_argument('--latency-jitter', dest='latency_jitter', type=float, default=0.0,
+        help='maximum random delay in seconds added to the latency (default: 0)')
+    parser.add_argument('--rate-limit', dest='rate_limit', type=int, default=None,
+        help='maximum number of requests per second. Extra requests are answered with '
+        'a 503 status and a Retry-After header (default: unlimited)')
+    parser.add_argument('--retry-after', dest='retry_after', type=int, default=1,
+        help='value of the Retry-After header sent to rate limited requests (default: 1)')
+    parser.add_argument('--verbose', dest='verbose', action='store_true',
+        help='log each request')
+    args = parser.parse_args()
+
+    pages = {}
+    if args.pages:
+        try:
+            with open(args.pages) as fileContents:
+                pages = json.load(fileContents)
+        except IOError:
+            pass
+
+    wiki = Wiki(pages, latency=args.latency, latencyJitter=args.latency_jitter,
+                rateLimit=args.rate_limit, retryAfter=args.retry_after)
+    server = Server((args.host, args.port), wiki, verbose=args.verbose)
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    print("Serving wiki API on http://{0}:{1}/w/api.php".format(args.host, args.port))
+    sys.stdout.flush()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print("\n{0}".format(json.dumps(wiki.stats, sort_keys=True)))
+        if args.pages:
+            savePages(wiki, args.pages)